@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Async driver benchmark
+======================
+
+Compares the two ways tool handlers can run database calls:
+
+  * `threads` - SQLServerManager (pyodbc) offloaded to the db_executor worker threads
+  * `async`   - AsyncSQLServerManager (aioodbc) awaited on the event loop
+
+For each concurrency level the same query is issued by that many concurrent
+"tool calls" for several rounds; the benchmark reports throughput, latency
+percentiles and the peak number of live threads in the process.
+
+aioodbc runs each pyodbc call on the event loop's default executor, so the
+async path still uses threads while a statement is running; the thread
+column shows how many.
+
+Requires a reachable SQL Server configured through the usual DB_* variables
+(or .env) and the async extra: pip install mcp-sqlserver-filesystem[async]
+
+Usage:
+  python benchmarks/bench_async_driver.py [--concurrency 1,10,100] [--rounds 5]
+      [--query "SELECT TOP (100) * FROM sys.objects"]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mcp_sqlserver_filesystem.async_database import AsyncSQLServerManager  # noqa: E402
+from mcp_sqlserver_filesystem.database import db_manager  # noqa: E402
+from mcp_sqlserver_filesystem.executor import db_executor  # noqa: E402
+
+
+async def _sample_threads(peak: list, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        peak[0] = max(peak[0], threading.active_count())
+        await asyncio.sleep(0.005)
+
+
+async def run_level(call, concurrency: int, rounds: int):
+    """Return (calls per second, latencies in ms, peak thread count)."""
+    latencies = []
+
+    async def one_call():
+        start = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    peak = [threading.active_count()]
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_threads(peak, stop))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(one_call() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+    return concurrency * rounds / elapsed, latencies, peak[0]
+
+
+def _percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def main_async(args) -> None:
+    if not db_manager.wait_until_initialized():
+        sys.exit(f"Database is not available: {db_manager.get_connection_error()}")
+    async_manager = AsyncSQLServerManager(db_manager)
+
+    paths = {
+        "threads": lambda: db_executor.run(db_manager.execute_query, args.query, None, args.max_rows),
+        "async": lambda: async_manager.execute_query(args.query, None, args.max_rows),
+    }
+    # Warm up both pools so connection setup is not measured
+    for call in paths.values():
+        await call()
+
+    print(f"{'path':>8} {'calls':>6} {'calls/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'threads':>8}")
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        for name, call in paths.items():
+            throughput, latencies, threads = await run_level(call, concurrency, args.rounds)
+            print(f"{name:>8} {concurrency:>6} {throughput:>10.1f} {statistics.median(latencies):>9.1f} "
+                  f"{_percentile(latencies, 0.95):>9.1f} {threads:>8}")
+
+    await async_manager.close()
+    db_manager.close()
+    db_executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark thread offload vs. the asyncio database driver")
+    parser.add_argument("--concurrency", default="1,10,100", help="Comma separated numbers of concurrent calls")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per concurrency level")
+    parser.add_argument("--query", default="SELECT TOP (100) * FROM sys.objects", help="Query each call runs")
+    parser.add_argument("--max-rows", type=int, default=100, help="Rows fetched per call")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Directory walk benchmark
+========================
+
+Walks a generated tree with `DirectoryWalker` at several worker counts and
+compares against the previous `Path.rglob` + per-entry `resolve()`/`stat()`
+listing:
+
+  * `rglob`      - the old list_directory(recursive=True) loop
+  * `workers=N`  - DirectoryWalker with N listing threads (1 = sequential)
+
+Local disks answer directory listings from cache in microseconds, so
+`--latency-ms` adds a sleep to every directory listing to mimic the round
+trip of an SMB/NFS share, which is where parallel listing pays off. Every
+walker run is checked to produce the same entries in the same order.
+
+Usage:
+  python benchmarks/bench_directory_walk.py [--dirs 1000] [--files 100]
+      [--workers 1,4,8,16] [--latency-ms 0,2] [--root /path/to/existing/tree]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mcp_sqlserver_filesystem.walker import DirectoryWalker  # noqa: E402
+
+
+def build_tree(root: Path, dirs: int, files: int) -> int:
+    """Create ``dirs`` directories (nested three levels deep) with ``files`` files each."""
+    count = 0
+    for d in range(dirs):
+        directory = root / f"a{d % 10:02d}" / f"b{d % 100:03d}" / f"c{d:05d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for f in range(files):
+            (directory / f"file{f:04d}.txt").write_bytes(b"x" * (f % 64))
+        count += files
+    return count + sum(1 for _ in root.rglob("*") if _.is_dir())
+
+
+def old_listing(root: Path) -> int:
+    count = 0
+    for item in root.rglob("*"):
+        item.resolve()
+        item.stat()
+        item.is_dir()
+        item.is_file()
+        count += 1
+    return count
+
+
+def walk(root: Path, workers: int):
+    directory_walker = DirectoryWalker(workers=workers)
+    try:
+        entries = []
+        for entry, relative in directory_walker.walk(str(root)):
+            entry.stat(follow_symlinks=False)
+            entries.append(relative)
+        return entries
+    finally:
+        directory_walker.shutdown()
+
+
+def with_latency(latency: float):
+    """Patch os.scandir so every directory listing waits ``latency`` seconds first."""
+    real_scandir = os.scandir
+
+    def slow_scandir(path="."):
+        time.sleep(latency)
+        return real_scandir(path)
+
+    os.scandir = slow_scandir
+    return lambda: setattr(os, "scandir", real_scandir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parallel directory walker")
+    parser.add_argument("--dirs", type=int, default=1000, help="Directories in the generated tree")
+    parser.add_argument("--files", type=int, default=100, help="Files per directory")
+    parser.add_argument("--workers", default="1,4,8,16", help="Comma separated worker counts")
+    parser.add_argument("--latency-ms", default="0,2", help="Comma separated simulated per-listing latencies")
+    parser.add_argument("--root", help="Walk an existing tree instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-walk-") as tmp:
+        if args.root:
+            root = Path(args.root)
+            print(f"Tree: {root}")
+        else:
+            root = Path(tmp)
+            start = time.perf_counter()
+            entries = build_tree(root, args.dirs, args.files)
+            print(f"Generated {entries:,} entries in {time.perf_counter() - start:.1f}s under {root}")
+
+        print(f"{'latency':>8} {'method':>11} {'entries':>9} {'seconds':>9} {'entries/s':>11}")
+        for latency_ms in (float(x) for x in args.latency_ms.split(",")):
+            restore = with_latency(latency_ms / 1000) if latency_ms else (lambda: None)
+            try:
+                if latency_ms == 0:
+                    start = time.perf_counter()
+                    count = old_listing(root)
+                    elapsed = time.perf_counter() - start
+                    print(f"{latency_ms:>6.1f}ms {'rglob':>11} {count:>9,} {elapsed:>9.2f} {count / elapsed:>11,.0f}")
+                reference = None
+                for workers in (int(w) for w in args.workers.split(",")):
+                    start = time.perf_counter()
+                    entries = walk(root, workers)
+                    elapsed = time.perf_counter() - start
+                    if reference is None:
+                        reference = entries
+                    elif entries != reference:
+                        sys.exit(f"workers={workers} produced a different listing")
+                    print(f"{latency_ms:>6.1f}ms {'workers=' + str(workers):>11} {len(entries):>9,} "
+                          f"{elapsed:>9.2f} {len(entries) / elapsed:>11,.0f}")
+            finally:
+                restore()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SQL validator microbenchmark
+============================
+
+Measures the cost per query of the SQL security check at several query sizes:
+
+  * `legacy`  - the previous per-keyword `re.search` loop plus six injection regexes
+  * `cold`    - SQLValidator on a query text it has not seen before (one full scan)
+  * `warm`    - SQLValidator on a repeated query text (memoized verdict)
+
+Queries are synthetic SELECTs with string literals, comments and bracketed
+identifiers; all of them pass validation, so every check scans the full text.
+
+Usage:
+  python benchmarks/bench_sql_validator.py [--sizes 100,1000,10000,100000] [--runs 200]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from mcp_sqlserver_filesystem.validator import SQLValidator  # noqa: E402
+
+BLOCKED_KEYWORDS = [
+    "DROP", "TRUNCATE", "ALTER", "CREATE", "EXEC", "EXECUTE", "GRANT", "REVOKE",
+    "SHUTDOWN", "XP_CMDSHELL", "SP_CONFIGURE", "OPENROWSET", "BACKUP", "RESTORE",
+]
+MAX_QUERY_LENGTH = 1_000_000
+
+
+def legacy_validate(query: str) -> None:
+    """The validator as it was before SQLValidator, kept for comparison."""
+    query_upper = query.upper()
+    for keyword in BLOCKED_KEYWORDS:
+        if re.search(r'\b' + re.escape(keyword) + r'\b', query_upper):
+            raise ValueError(f"Blocked SQL keyword detected: {keyword}")
+    injection_patterns = [
+        r";\s*(DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC|EXECUTE)",
+        r"UNION\s+SELECT",
+        r"--\s*$",
+        r"/\*.*\*/",
+        r"'\s*(OR|AND)\s*'",
+        r"'\s*=\s*'",
+    ]
+    for pattern in injection_patterns:
+        if re.search(pattern, query_upper, re.MULTILINE):
+            raise ValueError(f"Potential SQL injection detected: {pattern}")
+
+
+def make_query(size: int, variant: int = 0) -> str:
+    """Build a passing SELECT of roughly ``size`` characters."""
+    parts = [f"SELECT o.[OrderId], o.[CustomerName], o.Total -- variant {variant}\nFROM dbo.Orders o\nWHERE 1 = 1"]
+    length = len(parts[0])
+    i = 0
+    while length < size:
+        clause = (f"\n  AND (o.Status = N'shipped {i}' OR o.Region IN ('north', 'south', 'o''brien'))"
+                  f" AND o.Amount > {i}.5")
+        parts.append(clause)
+        length += len(clause)
+        i += 1
+    return "".join(parts)
+
+
+def _per_call(func, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQL security validator")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="Comma separated query sizes in characters")
+    parser.add_argument("--runs", type=int, default=200, help="Checks per measurement")
+    args = parser.parse_args()
+
+    print(f"{'size':>8} {'legacy':>12} {'cold':>12} {'warm':>12} {'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        runs = max(5, min(args.runs, args.runs * 1000 // max(size, 1000)))
+        # Distinct texts for the legacy and cold runs so nothing is memoized
+        queries = [make_query(size, variant) for variant in range(runs)]
+
+        legacy = _per_call(legacy_validate, queries)
+
+        validator = SQLValidator(BLOCKED_KEYWORDS, MAX_QUERY_LENGTH, cache_size=runs * 2)
+        cold = _per_call(validator.check, queries)
+        warm = _per_call(validator.check, [queries[0]] * runs)
+
+        print(f"{len(queries[0]):>8} {legacy * 1e6:>9.1f} us {cold * 1e6:>9.1f} us "
+              f"{warm * 1e6:>9.1f} us {legacy / cold:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
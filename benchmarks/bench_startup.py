@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Startup time benchmark
+======================
+
+Measures how long `python -m mcp_sqlserver_filesystem` takes to become useful:
+
+  * `version`    - process start to exit for the lightweight version command
+  * `handshake`  - process start to the MCP `initialize` response on stdout
+
+The server is pointed at an unreachable SQL Server (override with
+BENCH_DB_SERVER) to show that the handshake does not wait for the database.
+
+Usage:
+  python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+INITIALIZE_REQUEST = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05",
+        "capabilities": {},
+        "clientInfo": {"name": "bench-startup", "version": "0"},
+    },
+}
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(SRC_DIR) + os.pathsep + env.get("PYTHONPATH", "")
+    # Unroutable address: connecting would block for the full connection timeout
+    env["DB_SERVER"] = os.getenv("BENCH_DB_SERVER", "10.255.255.1")
+    env.setdefault("DB_CONNECTION_TIMEOUT", "30")
+    return env
+
+
+def time_version() -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "mcp_sqlserver_filesystem", "version"],
+        env=_env(), check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def time_handshake() -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "mcp_sqlserver_filesystem"],
+        env=_env(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    try:
+        proc.stdin.write((json.dumps(INITIALIZE_REQUEST) + "\n").encode())
+        proc.stdin.flush()
+        while True:
+            line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError("server exited before answering initialize")
+            message = json.loads(line)
+            if message.get("id") == 1:
+                if "error" in message:
+                    raise RuntimeError(f"initialize failed: {message['error']}")
+                return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _report(name: str, samples: list) -> None:
+    print(f"{name:<10} min {min(samples) * 1000:8.1f} ms   "
+          f"median {statistics.median(samples) * 1000:8.1f} ms   "
+          f"max {max(samples) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MCP server startup time")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs per measurement")
+    args = parser.parse_args()
+
+    _report("version", [time_version() for _ in range(args.runs)])
+    _report("handshake", [time_handshake() for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,12 @@ __author__ = "PJ"
 __email__ = "peng.it@qq.com"
 __license__ = "MIT"
 
-# 导出主要组件
-from .server import main
+# 导出主要组件 (延迟导入, 避免 `version` 等命令加载服务器及数据库依赖)
+def __getattr__(name):
+    if name == "main":
+        from .server import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["main", "__version__", "__author__", "__email__", "__license__"]
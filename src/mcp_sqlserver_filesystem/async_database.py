@@ -0,0 +1,234 @@
+"""Asyncio SQL Server operations for MCP server (optional aioodbc driver)."""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .cache import is_cacheable_query
+from .config import config
+from .database import (
+    _TABLE_SCHEMA_QUERY,
+    DatabaseConnectionError,
+    QueryTimeoutError,
+    SQLServerManager,
+    _is_timeout_error,
+    _text,
+)
+from .executor import OperationCancelledError, db_executor
+from .results import QueryResult
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSQLServerManager:
+    """Coroutine counterpart of SQLServerManager on SQLAlchemy's asyncio engine.
+
+    Uses the ``mssql+aioodbc`` dialect (``pip install
+    mcp-sqlserver-filesystem[async]``) and exposes ``execute_query``,
+    ``execute_non_query`` and ``get_table_schema`` as coroutines, so tool
+    handlers await them directly instead of occupying a db_executor worker.
+    Availability, SQL validation, auto-parameterization and the result
+    cache are shared with the thread-based ``manager`` for the same
+    connection profile; read replica routing is not applied here.
+    """
+
+    def __init__(self, manager: SQLServerManager):
+        self._manager = manager
+        self.db_config = manager.db_config
+        self.name = manager.name
+        self._engine: Optional["AsyncEngine"] = None
+        # Event loop the engine was created on; its connections can only be closed there
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_engine(self) -> "AsyncEngine":
+        if self._engine is not None:
+            return self._engine
+        try:
+            import aioodbc  # noqa: F401
+            from sqlalchemy import event
+            from sqlalchemy.ext.asyncio import create_async_engine
+        except ImportError as e:
+            raise DatabaseConnectionError(
+                f"Async database driver is not installed ({e}); "
+                "install it with: pip install mcp-sqlserver-filesystem[async]"
+            ) from e
+
+        sqlalchemy_url = f"mssql+aioodbc:///?odbc_connect={self.db_config.connection_string}"
+        engine = create_async_engine(
+            sqlalchemy_url,
+            pool_size=self.db_config.pool_size,
+            max_overflow=self.db_config.max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=self.db_config.pool_recycle,
+            echo=config.server.debug,
+        )
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        self._engine = engine
+        self._loop = asyncio.get_running_loop()
+        logger.info(f"Async database engine created ({self.name})")
+        return engine
+
+    @staticmethod
+    def _driver_cursor(cursor):
+        # SQLAlchemy's adapted cursor wraps an aioodbc cursor, which wraps pyodbc's
+        return getattr(getattr(cursor, '_cursor', None), '_impl', None)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        """Apply the command timeout and remember the cursor so the call can be cancelled."""
+        timeout = conn.get_execution_options().get('query_timeout', self.db_config.command_timeout)
+        driver_connection = getattr(conn.connection.dbapi_connection, 'driver_connection', None)
+        # aioodbc only exposes a read-only timeout property; set it on the pyodbc connection
+        SQLServerManager._set_driver_timeout(getattr(driver_connection, '_conn', None) or driver_connection, timeout)
+        conn.info['active_cursor'] = self._driver_cursor(cursor)
+
+    async def _run(self, operation, timeout: Optional[int]):
+        """Run ``operation(conn)`` on a pooled async connection.
+
+        Cancelling the awaiting task cancels the statement on the server;
+        driver timeouts are reported as QueryTimeoutError.
+        """
+        if not self._manager.is_available():
+            raise DatabaseConnectionError(f"Database is not available: {self._manager.get_connection_error()}")
+
+        engine = self._get_engine()
+        async with engine.connect() as conn:
+            if timeout is not None:
+                conn = await conn.execution_options(query_timeout=timeout)
+            try:
+                return await operation(conn)
+            except asyncio.CancelledError:
+                cursor = conn.info.pop('active_cursor', None)
+                if cursor is not None:
+                    try:
+                        cursor.cancel()
+                        logger.info("Statement cancelled on the server at the caller's request")
+                    except Exception as e:
+                        logger.debug(f"Could not cancel statement: {e}")
+                raise
+            except Exception as e:
+                if _is_timeout_error(e):
+                    limit = timeout if timeout is not None else self.db_config.command_timeout
+                    logger.warning(f"Statement exceeded the command timeout of {limit}s and was cancelled")
+                    raise QueryTimeoutError(f"Statement exceeded the command timeout of {limit}s") from e
+                raise
+            finally:
+                conn.info.pop('active_cursor', None)
+
+    async def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                            max_rows: Optional[int] = None, timeout: Optional[int] = None) -> QueryResult:
+        """Execute a SELECT query and return results (see SQLServerManager.execute_query)."""
+        manager = self._manager
+        manager._validate_sql_query(query)
+
+        cache_key = None
+        if manager._result_cache is not None and is_cacheable_query(query):
+            cache_key = manager._result_cache.make_key(query, parameters, max_rows)
+            cached = manager._result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Query served from result cache, returned {cached.row_count} rows")
+                return cached
+
+        if config.security.enable_query_logging:
+            if config.security.log_sensitive_data:
+                logger.info(f"Executing query (async): {query} with parameters: {parameters}")
+            else:
+                logger.info(f"Executing query (async): {query}")
+
+        statement, bound, fallback = manager._prepare_statement(query, parameters)
+
+        if max_rows is not None and max_rows < 0:
+            raise ValueError("max_rows must not be negative")
+
+        async def read(conn, *args) -> QueryResult:
+            if max_rows is None:
+                result = await conn.execute(*args)
+                return QueryResult(result.keys(), result.fetchall())
+            # One extra row tells whether the result was cut off
+            result = await conn.stream(*args)
+            try:
+                rows = await result.fetchmany(max_rows + 1)
+                has_more = len(rows) > max_rows
+                return QueryResult(result.keys(), rows[:max_rows], has_more)
+            finally:
+                await result.close()
+
+        async def fetch(conn) -> QueryResult:
+            try:
+                return await read(conn, statement, bound)
+            except (asyncio.CancelledError, OperationCancelledError):
+                raise
+            except Exception as e:
+                if fallback is None or _is_timeout_error(e):
+                    raise
+                logger.debug(f"Parameterized query failed, re-running with literals: {e}")
+                await conn.rollback()
+                if manager._statement_cache is not None:
+                    manager._statement_cache.record_fallback()
+                return await read(conn, *fallback)
+
+        query_result = await self._run(fetch, timeout)
+        logger.info(f"Query executed successfully, returned {query_result.row_count} rows")
+        if cache_key is not None:
+            manager._result_cache.put(cache_key, query, query_result)
+        return query_result
+
+    async def execute_non_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                                timeout: Optional[int] = None) -> int:
+        """Execute an INSERT, UPDATE, or DELETE query and return affected rows count."""
+        self._manager._validate_sql_query(query)
+
+        if config.security.enable_query_logging:
+            if config.security.log_sensitive_data:
+                logger.info(f"Executing non-query (async): {query} with parameters: {parameters}")
+            else:
+                logger.info(f"Executing non-query (async): {query}")
+
+        async def execute(conn) -> int:
+            result = await conn.execute(_text(query), parameters or {})
+            await conn.commit()
+            return result.rowcount
+
+        affected_rows = await self._run(execute, timeout)
+        self._manager._invalidate_cached_results(query)
+        logger.info(f"Non-query executed successfully, affected {affected_rows} rows")
+        return affected_rows
+
+    async def get_table_schema(self, table_name: str, schema_name: str = "dbo") -> Dict[str, Any]:
+        """Get table schema information.
+
+        With the schema catalog enabled the lookup is served by the manager's
+        (thread-based) catalog; otherwise INFORMATION_SCHEMA is queried here.
+        """
+        if self._manager._catalog is not None:
+            return await db_executor.run(self._manager.get_table_schema, table_name, schema_name)
+        result = await self.execute_query(_TABLE_SCHEMA_QUERY, {
+            'table_name': table_name,
+            'schema_name': schema_name,
+        })
+        return {
+            'table_name': table_name,
+            'schema_name': schema_name,
+            'columns': result.to_dicts(),
+        }
+
+    def checked_out(self) -> int:
+        """Connections of the async engine currently in use."""
+        engine = self._engine
+        return engine.sync_engine.pool.checkedout() if engine is not None else 0
+
+    async def close(self) -> None:
+        """Dispose the async engine and its connections."""
+        if self._engine is not None:
+            engine, self._engine = self._engine, None
+            await engine.dispose()
+            logger.info(f"Async database engine closed ({self.name})")
+
+    def close_from_thread(self, timeout: float = 30.0) -> None:
+        """Dispose the async engine from a thread other than its event loop's."""
+        loop = self._loop
+        if self._engine is None or loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout)
@@ -0,0 +1,286 @@
+"""Query result and statement caches for MCP server."""
+
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, Optional, Set, Tuple
+
+from .results import QueryResult
+from .sqltext import single_query_tokens, tokenize
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL_PATTERN = re.compile(r"N?'(?:[^']|'')*'", re.IGNORECASE)
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_IDENTIFIER_PATTERN = re.compile(r"\[([^\]]+)\]|\"([^\"]+)\"|([A-Za-z_#@][\w#@$]*)")
+
+_NAME = r"(?:\[[^\]]+\]|\"[^\"]+\"|[\w#@$]+)"
+_QUALIFIED_NAME = rf"{_NAME}(?:\s*\.\s*{_NAME})*"
+_WRITE_TARGET_PATTERN = re.compile(
+    rf"\b(?:UPDATE|INSERT(?:\s+INTO)?|DELETE(?:\s+FROM)?|MERGE(?:\s+INTO)?|TRUNCATE\s+TABLE|FROM|JOIN)\s+({_QUALIFIED_NAME})",
+    re.IGNORECASE,
+)
+_PLAIN_DML_PATTERN = re.compile(r"^\s*(?:WITH\b.*?\)\s*)?(INSERT|UPDATE|DELETE|MERGE|TRUNCATE)\b", re.IGNORECASE | re.DOTALL)
+# Functions whose result changes from call to call
+_NONDETERMINISTIC_FUNCTIONS = frozenset((
+    'GETDATE', 'GETUTCDATE', 'SYSDATETIME', 'SYSUTCDATETIME', 'SYSDATETIMEOFFSET', 'CURRENT_TIMESTAMP',
+    'NEWID', 'NEWSEQUENTIALID', 'RAND', 'CRYPT_GEN_RANDOM',
+))
+
+
+def normalize_sql(query: str) -> str:
+    """Cache key text: tokens joined by single spaces, without trailing semicolons.
+
+    String literals, quoted identifiers and comments are kept verbatim and a
+    line comment keeps its terminating newline, so only whitespace between
+    tokens is normalized and two queries that differ in meaning never share
+    a key.
+    """
+    tokens = tokenize(query, comments=True)
+    while tokens and tokens[-1].value == ';':
+        tokens.pop()
+    return ' '.join(token.value + '\n' if token.value.startswith('--') else token.value for token in tokens)
+
+
+def _code_only(query: str) -> str:
+    """Blank out string literals and comments so keywords inside them are ignored."""
+    return _STRING_LITERAL_PATTERN.sub("''", _COMMENT_PATTERN.sub(' ', query))
+
+
+def _last_name_part(qualified_name: str) -> str:
+    parts = [next(p for p in m.groups() if p) for m in _IDENTIFIER_PATTERN.finditer(qualified_name)]
+    return parts[-1].lower() if parts else qualified_name.lower()
+
+
+def is_cacheable_query(query: str) -> bool:
+    """Return True for a single, plain, deterministic SELECT statement.
+
+    Anything that is not exactly one query (see ``single_query_tokens``),
+    such as ``SELECT 1 DROP TABLE t`` or a CTE feeding DELETE, is rejected,
+    since serving it from the cache would skip its side effects.
+    """
+    tokens = single_query_tokens(query)
+    if tokens is None:
+        return False
+    for token in tokens:
+        if token.kind == 'word' and token.upper in _NONDETERMINISTIC_FUNCTIONS:
+            return False
+        if token.kind == 'variable' and token.value.startswith('@@'):
+            return False
+    return True
+
+
+def referenced_names(query: str) -> FrozenSet[str]:
+    """Every identifier a read query mentions, lowercased and unqualified.
+
+    This deliberately over-approximates the referenced tables so that a write
+    to any table named in the query invalidates its cached result.
+    """
+    code = _code_only(query)
+    return frozenset(
+        next(p for p in m.groups() if p).lower() for m in _IDENTIFIER_PATTERN.finditer(code)
+    )
+
+
+def written_tables(statement: str) -> Optional[Set[str]]:
+    """Tables a data-modifying statement may change.
+
+    Returns None when the statement is not a recognizable INSERT/UPDATE/DELETE/
+    MERGE/TRUNCATE (DDL, EXEC, batches...), meaning any cached result may be stale.
+    """
+    code = _code_only(statement)
+    if ';' in code.strip().rstrip(';') or not _PLAIN_DML_PATTERN.match(code):
+        return None
+    tables = {_last_name_part(m.group(1)) for m in _WRITE_TARGET_PATTERN.finditer(code)}
+    return tables or None
+
+
+def _estimate_size(result: QueryResult) -> int:
+    """Rough memory footprint of a result in bytes."""
+    size = sys.getsizeof(result.rows) + sum(sys.getsizeof(c) for c in result.columns)
+    for row in result.rows:
+        size += sys.getsizeof(row)
+        for value in row:
+            size += sys.getsizeof(value)
+    return size
+
+
+class _CacheEntry:
+    __slots__ = ('result', 'names', 'size', 'expires_at')
+
+    def __init__(self, result: QueryResult, names: FrozenSet[str], size: int, expires_at: float):
+        self.result = result
+        self.names = names
+        self.size = size
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    """LRU cache of read query results with TTL, byte budget and table invalidation."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._by_name: Dict[str, Set[Hashable]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(query: str, parameters: Optional[Dict[str, Any]], *extra: Hashable) -> Tuple[Hashable, ...]:
+        """Cache key from normalized SQL text, parameters and call options."""
+        params = tuple(sorted((k, repr(v)) for k, v in (parameters or {}).items()))
+        return (normalize_sql(query), params) + extra
+
+    def get(self, key: Hashable) -> Optional[QueryResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result
+
+    def put(self, key: Hashable, query: str, result: QueryResult) -> None:
+        size = _estimate_size(result)
+        if size > self.max_bytes:
+            logger.debug(f"Result too large to cache ({size} bytes)")
+            return
+        names = referenced_names(query)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(result, names, size, time.monotonic() + self.ttl)
+            self._bytes += size
+            for name in names:
+                self._by_name.setdefault(name, set()).add(key)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """Drop every entry whose query mentions one of ``tables``."""
+        with self._lock:
+            keys: Set[Hashable] = set()
+            for table in tables:
+                keys |= self._by_name.get(table.lower(), set())
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def invalidate_for_statement(self, statement: str) -> None:
+        """Invalidate whatever a successfully executed write statement may have changed."""
+        tables = written_tables(statement)
+        if tables is None:
+            self.clear()
+        else:
+            removed = self.invalidate_tables(tables)
+            if removed:
+                logger.debug(f"Invalidated {removed} cached results for tables {sorted(tables)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._by_name.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for name in entry.names:
+            keys = self._by_name.get(name)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_name[name]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+class StatementCache:
+    """LRU cache of compiled statement objects keyed by normalized SQL shape.
+
+    Reusing the same statement object lets SQLAlchemy reuse its compiled
+    form, and together with literal parameterization sends the server one
+    statement text per query shape so its cached plan is reused.
+    """
+
+    def __init__(self, factory: Callable[[str], Any], max_entries: int = 256):
+        self.factory = factory
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.parameterized = 0
+        self.lifted_literals = 0
+        self.fallbacks = 0
+
+    def get(self, sql: str) -> Any:
+        """Return the statement for ``sql``, creating and caching it on first use."""
+        key = normalize_sql(sql)
+        with self._lock:
+            statement = self._entries.get(key)
+            if statement is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return statement
+            self.misses += 1
+        statement = self.factory(sql)
+        with self._lock:
+            self._entries[key] = statement
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return statement
+
+    def record_parameterized(self, literal_count: int) -> None:
+        with self._lock:
+            self.parameterized += 1
+            self.lifted_literals += literal_count
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.fallbacks += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'reuse_ratio': self.hits / lookups if lookups else 0.0,
+                'parameterized': self.parameterized,
+                'lifted_literals': self.lifted_literals,
+                'fallbacks': self.fallbacks,
+            }
@@ -0,0 +1,400 @@
+"""In-memory schema catalog for MCP server."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .results import QueryResult
+from .sqltext import split_qualified_name
+
+logger = logging.getLogger(__name__)
+
+# One set-based load of every user table's columns, primary keys and descriptions
+CATALOG_COLUMNS_QUERY = """
+SELECT
+    t.object_id,
+    s.name AS schema_name,
+    t.name AS table_name,
+    t.modify_date,
+    c.column_id,
+    c.name AS column_name,
+    ty.name AS data_type,
+    c.is_nullable,
+    dc.definition AS column_default,
+    c.max_length,
+    c.precision,
+    c.scale,
+    CASE WHEN pk.column_id IS NOT NULL THEN 1 ELSE 0 END AS is_primary_key,
+    CAST(ep.value AS NVARCHAR(4000)) AS column_description
+FROM sys.tables t
+INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+INNER JOIN sys.columns c ON c.object_id = t.object_id
+INNER JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+LEFT JOIN sys.default_constraints dc
+    ON dc.parent_object_id = c.object_id AND dc.parent_column_id = c.column_id
+LEFT JOIN (
+    SELECT ic.object_id, ic.column_id
+    FROM sys.indexes i
+    INNER JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+    WHERE i.is_primary_key = 1
+) pk ON pk.object_id = c.object_id AND pk.column_id = c.column_id
+LEFT JOIN sys.extended_properties ep
+    ON ep.class = 1 AND ep.major_id = c.object_id AND ep.minor_id = c.column_id AND ep.name = 'MS_Description'
+{where}
+ORDER BY t.object_id, c.column_id
+"""
+
+# Cheap change detection: ALTER TABLE, index changes and renames bump modify_date;
+# sp_addextendedproperty/sp_updateextendedproperty do not, so the column
+# descriptions are compared by checksum
+CATALOG_VERSIONS_QUERY = """
+SELECT t.object_id, t.modify_date,
+    (SELECT CHECKSUM_AGG(BINARY_CHECKSUM(ep.minor_id, CAST(ep.value AS NVARCHAR(4000))))
+     FROM sys.extended_properties ep
+     WHERE ep.class = 1 AND ep.major_id = t.object_id AND ep.name = 'MS_Description')
+FROM sys.tables t
+"""
+
+_CHARACTER_TYPES = {'char', 'varchar', 'binary', 'varbinary'}
+_UNICODE_TYPES = {'nchar', 'nvarchar'}
+_NUMERIC_TYPES = {'tinyint', 'smallint', 'int', 'bigint', 'decimal', 'numeric',
+                  'float', 'real', 'money', 'smallmoney'}
+
+# Above this many changed tables a full reload is cheaper than an IN list
+_MAX_INCREMENTAL_TABLES = 200
+
+
+def _character_max_length(data_type: str, max_length: int) -> Optional[int]:
+    """Translate sys.columns.max_length (bytes) to INFORMATION_SCHEMA semantics."""
+    if data_type in _UNICODE_TYPES:
+        return -1 if max_length == -1 else max_length // 2
+    if data_type in _CHARACTER_TYPES:
+        return max_length
+    return None
+
+
+class TableInfo:
+    """Cached metadata of one table."""
+
+    __slots__ = ('object_id', 'schema_name', 'table_name', 'modify_date', 'columns', 'version')
+
+    def __init__(self, object_id: int, schema_name: str, table_name: str, modify_date: Any):
+        self.object_id = object_id
+        self.schema_name = schema_name
+        self.table_name = table_name
+        self.modify_date = modify_date
+        self.columns: List[Dict[str, Any]] = []
+        # (modify_date, description checksum) from CATALOG_VERSIONS_QUERY, None if unknown
+        self.version: Optional[Tuple[Any, Any]] = None
+
+
+class SchemaCatalog:
+    """Snapshot of table and column metadata across all schemas.
+
+    The whole catalog is loaded with one query and then served from memory.
+    At most every ``refresh_interval`` seconds (or right after DDL, see
+    ``mark_stale``) ``sys.tables.modify_date`` and a checksum of the column
+    descriptions are compared with the snapshot and only added, altered or
+    dropped tables are reloaded.
+    """
+
+    def __init__(self, run_query: Callable[[str], QueryResult], refresh_interval: float = 30.0):
+        self._run_query = run_query
+        self.refresh_interval = refresh_interval
+        self._tables: Dict[int, TableInfo] = {}
+        self._by_name: Dict[Tuple[str, str], TableInfo] = {}
+        # Lowercased names, for lookups that do not match a name exactly (None if ambiguous)
+        self._by_lower: Dict[Tuple[str, str], Optional[TableInfo]] = {}
+        self._loaded = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+
+    def mark_stale(self) -> None:
+        """Force a change check on the next access."""
+        self._checked_at = 0.0
+
+    def ensure_fresh(self) -> None:
+        """Load or refresh the snapshot if it may be out of date."""
+        if self._loaded and time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._loaded and time.monotonic() - self._checked_at < self.refresh_interval:
+                return
+            if not self._loaded:
+                self._full_load()
+            else:
+                self._refresh_changed()
+            self._checked_at = time.monotonic()
+
+    def get_table(self, table_name: str, schema_name: str = "dbo") -> Optional[TableInfo]:
+        """Look up a table by its exact name, else case-insensitively (like the
+        default collation) when only one table matches. Views are not cached."""
+        self.ensure_fresh()
+        info = self._by_name.get((schema_name, table_name))
+        if info is None:
+            info = self._by_lower.get((schema_name.lower(), table_name.lower()))
+        return info
+
+    def list_tables(self, schema_name: str = "dbo") -> List[str]:
+        """Return the names of all tables in a schema, sorted."""
+        self.ensure_fresh()
+        schema_key = schema_name.lower()
+        return sorted(
+            (info.table_name for info in self._tables.values() if info.schema_name.lower() == schema_key),
+            key=str.lower,
+        )
+
+    def iter_tables(self) -> Iterable[TableInfo]:
+        """Iterate over all cached tables."""
+        self.ensure_fresh()
+        return list(self._tables.values())
+
+    def _full_load(self) -> None:
+        start = time.perf_counter()
+        # Versions first: a table changed while loading is then reloaded by the next check
+        current = self._versions()
+        tables = self._load(None)
+        for object_id, info in tables.items():
+            info.version = current.get(object_id)
+        self._publish(tables)
+        self._loaded = True
+        self.full_loads += 1
+        logger.info(f"Schema catalog loaded: {len(tables)} tables in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    def _versions(self) -> Dict[int, Tuple[Any, Any]]:
+        result = self._run_query(CATALOG_VERSIONS_QUERY)
+        return {row[0]: (row[1], row[2]) for row in result.rows}
+
+    def _refresh_changed(self) -> None:
+        current = self._versions()
+        changed = [object_id for object_id, version in current.items()
+                   if object_id not in self._tables or self._tables[object_id].version != version]
+        dropped = [object_id for object_id in self._tables if object_id not in current]
+        if not changed and not dropped:
+            return
+
+        if len(changed) > _MAX_INCREMENTAL_TABLES:
+            self._full_load()
+            return
+
+        changed_ids = set(changed)
+        tables = {object_id: info for object_id, info in self._tables.items()
+                  if object_id in current and object_id not in changed_ids}
+        if changed:
+            loaded = self._load(changed)
+            for object_id, info in loaded.items():
+                info.version = current[object_id]
+            tables.update(loaded)
+        self._publish(tables)
+        self.incremental_refreshes += 1
+        logger.info(f"Schema catalog refreshed: {len(changed)} changed, {len(dropped)} dropped tables")
+
+    def _load(self, object_ids: Optional[List[int]]) -> Dict[int, TableInfo]:
+        where = ""
+        if object_ids is not None:
+            # object_ids come from sys.tables, so they are always integers
+            where = "WHERE t.object_id IN (" + ",".join(str(int(i)) for i in object_ids) + ")"
+        result = self._run_query(CATALOG_COLUMNS_QUERY.format(where=where))
+
+        tables: Dict[int, TableInfo] = {}
+        for (object_id, schema_name, table_name, modify_date, _column_id, column_name, data_type,
+             is_nullable, column_default, max_length, precision, scale, is_primary_key,
+             column_description) in result.rows:
+            info = tables.get(object_id)
+            if info is None:
+                info = tables[object_id] = TableInfo(object_id, schema_name, table_name, modify_date)
+            is_numeric = data_type in _NUMERIC_TYPES
+            info.columns.append({
+                'COLUMN_NAME': column_name,
+                'DATA_TYPE': data_type,
+                'IS_NULLABLE': 'YES' if is_nullable else 'NO',
+                'COLUMN_DEFAULT': column_default,
+                'CHARACTER_MAXIMUM_LENGTH': _character_max_length(data_type, max_length),
+                'NUMERIC_PRECISION': precision if is_numeric else None,
+                'NUMERIC_SCALE': scale if is_numeric else None,
+                'IS_PRIMARY_KEY': is_primary_key,
+                'COLUMN_DESCRIPTION': column_description or '',
+            })
+        return tables
+
+    def _publish(self, tables: Dict[int, TableInfo]) -> None:
+        # Readers never take the lock, so swap in complete dictionaries
+        by_name = {(info.schema_name, info.table_name): info for info in tables.values()}
+        by_lower: Dict[Tuple[str, str], Optional[TableInfo]] = {}
+        for info in tables.values():
+            key = (info.schema_name.lower(), info.table_name.lower())
+            # Names differing only by case (case-sensitive collation) are only found exactly
+            by_lower[key] = None if key in by_lower else info
+        self._tables = tables
+        self._by_name = by_name
+        self._by_lower = by_lower
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'tables': len(self._tables),
+            'full_loads': self.full_loads,
+            'incremental_refreshes': self.incremental_refreshes,
+        }
+
+
+# One batch describing many tables: the matching object ids are collected once,
+# then tables (with row estimates), columns, foreign keys and indexes come back
+# as four result sets in a single round trip.
+DESCRIBE_TABLES_BATCH = """
+SET NOCOUNT ON;
+DECLARE @objects TABLE (object_id INT PRIMARY KEY);
+INSERT INTO @objects (object_id)
+SELECT t.object_id
+FROM sys.tables t
+INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+WHERE {filter};
+
+SELECT t.object_id, s.name, t.name,
+    (SELECT SUM(p.rows) FROM sys.partitions p WHERE p.object_id = t.object_id AND p.index_id IN (0, 1))
+FROM @objects o
+INNER JOIN sys.tables t ON t.object_id = o.object_id
+INNER JOIN sys.schemas s ON s.schema_id = t.schema_id
+ORDER BY s.name, t.name;
+
+SELECT c.object_id, c.name, ty.name, c.max_length, c.precision, c.scale, c.is_nullable, c.is_identity,
+    dc.definition, CASE WHEN pk.column_id IS NOT NULL THEN 1 ELSE 0 END
+FROM @objects o
+INNER JOIN sys.columns c ON c.object_id = o.object_id
+INNER JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+LEFT JOIN sys.default_constraints dc
+    ON dc.parent_object_id = c.object_id AND dc.parent_column_id = c.column_id
+LEFT JOIN (
+    SELECT ic.object_id, ic.column_id
+    FROM sys.indexes i
+    INNER JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+    WHERE i.is_primary_key = 1
+) pk ON pk.object_id = c.object_id AND pk.column_id = c.column_id
+ORDER BY c.object_id, c.column_id;
+
+SELECT fk.parent_object_id, fk.name, pc.name, rs.name, rt.name, rc.name
+FROM @objects o
+INNER JOIN sys.foreign_keys fk ON fk.parent_object_id = o.object_id
+INNER JOIN sys.foreign_key_columns fkc ON fkc.constraint_object_id = fk.object_id
+INNER JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+INNER JOIN sys.tables rt ON rt.object_id = fkc.referenced_object_id
+INNER JOIN sys.schemas rs ON rs.schema_id = rt.schema_id
+INNER JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+ORDER BY fk.parent_object_id, fk.name, fkc.constraint_column_id;
+
+SELECT i.object_id, i.name, i.type_desc, i.is_unique, i.is_primary_key, c.name,
+    ic.is_descending_key, ic.is_included_column
+FROM @objects o
+INNER JOIN sys.indexes i ON i.object_id = o.object_id AND i.index_id > 0
+INNER JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+INNER JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+ORDER BY i.object_id, i.index_id, ic.is_included_column, ic.key_ordinal, ic.index_column_id;
+"""
+
+# Name patterns per describe batch (two parameters each, SQL Server allows 2100)
+_MAX_DESCRIBE_PATTERNS = 1000
+
+
+def format_column_type(data_type: str, max_length: int, precision: int, scale: int) -> str:
+    """Render a sys.columns type the way it is written in DDL, e.g. ``nvarchar(50)``."""
+    if data_type in _UNICODE_TYPES or data_type in _CHARACTER_TYPES:
+        length = _character_max_length(data_type, max_length)
+        return f"{data_type}({'max' if length == -1 else length})"
+    if data_type in ('decimal', 'numeric'):
+        return f"{data_type}({precision},{scale})"
+    if data_type in ('datetime2', 'datetimeoffset', 'time'):
+        return f"{data_type}({scale})"
+    return data_type
+
+
+def _like_pattern(pattern: str) -> str:
+    """Convert a ``*``/``?`` wildcard into a LIKE pattern (escape character ``\\``)."""
+    escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('[', '\\[')
+    return escaped.replace('*', '%').replace('?', '_')
+
+
+def _split_table_name(name: str, default_schema: str) -> Tuple[str, str]:
+    parts = split_qualified_name(name)
+    if len(parts) == 1:
+        return default_schema, parts[0]
+    # database.schema.table: the database part is the current database
+    return parts[-2], parts[-1]
+
+
+def build_describe_batches(tables: Optional[List[str]], schema_name: str = "dbo") -> List[Tuple[str, List[str]]]:
+    """Build the describe batch(es) and their pyodbc parameters.
+
+    ``tables`` holds table names, optionally schema-qualified, and may use
+    ``*``/``?`` wildcards. Without tables, every table of ``schema_name``
+    (itself a wildcard, ``*`` for all schemas) is described. Each name binds
+    two parameters, so long lists are split into several batches to stay
+    under SQL Server's limit of 2100 parameters per request.
+    """
+    patterns = [_split_table_name(t, schema_name) for t in tables] if tables else [(schema_name, '*')]
+    batches = []
+    for start in range(0, len(patterns), _MAX_DESCRIBE_PATTERNS):
+        conditions = []
+        params: List[str] = []
+        for schema_pattern, table_pattern in patterns[start:start + _MAX_DESCRIBE_PATTERNS]:
+            conditions.append("(s.name LIKE ? ESCAPE '\\' AND t.name LIKE ? ESCAPE '\\')")
+            params.extend([_like_pattern(schema_pattern), _like_pattern(table_pattern)])
+        batches.append((DESCRIBE_TABLES_BATCH.format(filter=" OR ".join(conditions)), params))
+    return batches
+
+
+def assemble_descriptions(tables: List[Sequence[Any]], columns: List[Sequence[Any]],
+                          foreign_keys: List[Sequence[Any]], indexes: List[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Group the four describe result sets into one dict per table."""
+    by_id: Dict[int, Dict[str, Any]] = {}
+    described = []
+    for object_id, schema_name, table_name, row_estimate in tables:
+        entry = {
+            'schema_name': schema_name,
+            'table_name': table_name,
+            'row_estimate': int(row_estimate or 0),
+            'columns': [],
+            'foreign_keys': [],
+            'indexes': [],
+        }
+        by_id[object_id] = entry
+        described.append(entry)
+
+    for (object_id, name, data_type, max_length, precision, scale, is_nullable, is_identity,
+         default, is_primary_key) in columns:
+        if object_id not in by_id:
+            # Table created between the statements of the batch
+            continue
+        by_id[object_id]['columns'].append({
+            'name': name,
+            'type': format_column_type(data_type, max_length, precision, scale),
+            'nullable': bool(is_nullable),
+            'identity': bool(is_identity),
+            'default': default,
+            'primary_key': bool(is_primary_key),
+        })
+
+    for object_id, fk_name, column, ref_schema, ref_table, ref_column in foreign_keys:
+        if object_id not in by_id:
+            continue
+        fks = by_id[object_id]['foreign_keys']
+        if not fks or fks[-1]['name'] != fk_name:
+            fks.append({'name': fk_name, 'columns': [], 'references': f"{ref_schema}.{ref_table}", 'referenced_columns': []})
+        fks[-1]['columns'].append(column)
+        fks[-1]['referenced_columns'].append(ref_column)
+
+    for (object_id, index_name, type_desc, is_unique, is_primary_key, column,
+         is_descending, is_included) in indexes:
+        if object_id not in by_id:
+            continue
+        idx = by_id[object_id]['indexes']
+        if not idx or idx[-1]['name'] != index_name:
+            idx.append({'name': index_name, 'type': type_desc, 'unique': bool(is_unique),
+                        'primary_key': bool(is_primary_key), 'columns': [], 'include': []})
+        if is_included:
+            idx[-1]['include'].append(column)
+        else:
+            idx[-1]['columns'].append(f"{column} DESC" if is_descending else column)
+
+    return described
@@ -25,6 +25,30 @@ class DatabaseConfig(BaseModel):
     command_timeout: int = Field(30, description="Command timeout in seconds")
     pool_size: int = Field(5, description="Connection pool size")
     max_overflow: int = Field(10, description="Maximum overflow connections")
+    pool_recycle: int = Field(3600, description="Seconds after which pooled connections are replaced")
+    pool_adaptive: bool = Field(False, description="Adapt the number of idle pooled connections to demand and skip pings on recently used ones")
+    pool_min_size: int = Field(1, description="Minimum idle connections kept by the adaptive pool")
+    pool_ping_skip_seconds: float = Field(30.0, description="Adaptive pool: connections used within this many seconds are not pinged on checkout")
+    health_check_interval: float = Field(30.0, description="Seconds between background connection health checks (0 = disabled)")
+    reconnect_max_backoff: float = Field(60.0, description="Maximum delay in seconds between reconnection attempts while the database is unhealthy")
+    circuit_failure_threshold: int = Field(3, description="Consecutive connection failures that open the circuit breaker")
+    circuit_reset_timeout: float = Field(30.0, description="Seconds the circuit breaker stays open before letting a trial call through")
+    read_replicas: List[str] = Field(default_factory=list, description="Readable secondary endpoints (host or host:port) that serve SELECT queries")
+    read_routing: str = Field("round_robin", description="How SELECT queries are spread over read replicas: round_robin or least_latency")
+    read_only_intent: bool = Field(False, description="Connect with ApplicationIntent=ReadOnly (set for read replica connections)")
+    async_driver: bool = Field(False, description="Run sql_query, sql_execute and get_table_schema on the asyncio engine (aioodbc) instead of worker threads")
+    profile_idle_timeout: float = Field(600.0, description="Seconds a named connection profile may stay unused before its pool is closed (0 = never)")
+    fetch_batch_size: int = Field(500, description="Rows fetched per round trip when streaming query results")
+    bulk_insert_batch_size: int = Field(1000, description="Rows sent per round trip by sql_bulk_insert")
+    affected_rows_limit: int = Field(100, description="Maximum affected rows kept in memory when returning DML details")
+    auto_parameterize: bool = Field(False, description="Lift literals in sql_query predicates into bound parameters for plan reuse")
+    statement_cache_size: int = Field(256, description="Compiled statements cached by query shape (0 = disabled)")
+    result_cache_enabled: bool = Field(False, description="Cache results of repeated read queries")
+    result_cache_max_entries: int = Field(256, description="Maximum number of cached query results")
+    result_cache_max_bytes: int = Field(64 * 1024 * 1024, description="Approximate memory budget of the result cache in bytes")
+    result_cache_ttl: float = Field(30.0, description="Seconds a cached query result stays valid")
+    schema_cache_enabled: bool = Field(True, description="Serve table and column metadata from an in-memory catalog")
+    schema_cache_refresh_interval: float = Field(30.0, description="Minimum seconds between catalog change checks")
 
     # 新增的连接参数
     trust_server_certificate: bool = Field(True, description="Trust server certificate (TrustServerCertificate)")
@@ -37,6 +61,38 @@ class DatabaseConfig(BaseModel):
         if not 1 <= v <= 65535:
             raise ValueError('Port must be between 1 and 65535')
         return v
+
+    @validator('read_replicas', pre=True)
+    def split_read_replicas(cls, v):
+        if isinstance(v, str):
+            return [endpoint.strip() for endpoint in v.split(',') if endpoint.strip()]
+        return v
+
+    @validator('read_routing')
+    def validate_read_routing(cls, v):
+        v = v.strip().lower()
+        if v not in ('round_robin', 'least_latency'):
+            raise ValueError('Read routing must be round_robin or least_latency')
+        return v
+
+    def replica_configs(self) -> List["DatabaseConfig"]:
+        """One read-only connection configuration per read replica endpoint.
+
+        Replicas share every other setting; caches stay with the primary.
+        """
+        configs = []
+        for endpoint in self.read_replicas:
+            host, _, port = endpoint.rpartition(':') if ':' in endpoint else (endpoint, '', '')
+            configs.append(self.model_copy(update={
+                'server': host,
+                'port': int(port) if port else self.port,
+                'read_replicas': [],
+                'read_only_intent': True,
+                'result_cache_enabled': False,
+                'schema_cache_enabled': False,
+                'statement_cache_size': 0,
+            }))
+        return configs
     
     @property
     def connection_string(self) -> str:
@@ -65,6 +121,8 @@ class DatabaseConfig(BaseModel):
             f"MultipleActiveResultSets={'yes' if self.multiple_active_result_sets else 'no'}",
             f"Application Name={self.application_name}",
         ]
+        if self.read_only_intent:
+            enhanced_params.append("ApplicationIntent=ReadOnly")
 
         # 合并所有参数
         all_params = base_params + enhanced_params
@@ -80,6 +138,11 @@ class FilesystemConfig(BaseModel):
     enable_write: bool = Field(True, description="Enable write operations")
     enable_delete: bool = Field(True, description="Enable delete operations")
     ignore_file_locks: bool = Field(True, description="Ignore file locks when reading/writing files")
+    line_index_stride: int = Field(1000, description="Lines between checkpoints of the line-offset index (0 = no index)")
+    line_index_min_size: int = Field(1024 * 1024, description="Files at least this large (bytes) get a line-offset index when read by line")
+    line_index_cache_bytes: int = Field(16 * 1024 * 1024, description="Memory budget of the line-offset index cache in bytes")
+    line_index_append_only: bool = Field(False, description="Treat growing files as append-only and extend their line index instead of rebuilding it")
+    walk_workers: int = Field(1, description="Threads listing subdirectories ahead of recursive directory walks; raise for UNC/network paths (0 or 1 = sequential)")
     
     @property
     def is_full_access_mode(self) -> bool:
@@ -143,6 +206,8 @@ class ServerConfig(BaseModel):
     debug: bool = Field(False, description="Enable debug mode")
     log_level: str = Field("INFO", description="Logging level")
     log_file: Optional[str] = Field(None, description="Log file path")
+    executor_max_pending: int = Field(100, description="Maximum tool calls waiting for a worker thread before new calls are rejected")
+    executor_queue_timeout: float = Field(60.0, description="Seconds a tool call may wait for a worker thread (0 = wait forever)")
     
     @validator('log_level')
     def validate_log_level(cls, v):
@@ -152,10 +217,47 @@ class ServerConfig(BaseModel):
         return v.upper()
 
 
+# Settings that name the server/database a profile connects to, and settings
+# that only make sense for that server (reset when a profile changes it)
+_CONNECTION_IDENTITY_FIELDS = frozenset(('server', 'port', 'database'))
+_SERVER_BOUND_FIELDS = frozenset(('read_replicas',))
+
+
+def load_database_profiles(base: DatabaseConfig) -> Dict[str, DatabaseConfig]:
+    """Load named connection profiles listed in DB_PROFILES (comma separated).
+
+    Each profile starts from the default DB_* settings and overrides any of
+    them with DB_<NAME>_<SETTING>, e.g. DB_REPORTING_SERVER or
+    DB_REPORTING_POOL_SIZE for a profile named ``reporting``. A profile that
+    points at another server or database does not inherit settings bound to
+    the default connection's server (its read replicas); set them per profile.
+    """
+    profiles: Dict[str, DatabaseConfig] = {}
+    names = [n.strip() for n in os.getenv('DB_PROFILES', '').split(',') if n.strip()]
+    for name in names:
+        key = name.lower()
+        if key == 'default':
+            raise ValueError("'default' is reserved for the DB_* connection and cannot be used in DB_PROFILES")
+        prefix = f"DB_{key.upper().replace('-', '_')}_"
+        values = base.model_dump()
+        overridden = set()
+        for field in DatabaseConfig.model_fields:
+            env_value = os.getenv(prefix + field.upper())
+            if env_value is not None:
+                values[field] = env_value
+                overridden.add(field)
+        if overridden & _CONNECTION_IDENTITY_FIELDS:
+            for field in _SERVER_BOUND_FIELDS - overridden:
+                values[field] = DatabaseConfig.model_fields[field].get_default(call_default_factory=True)
+        profiles[key] = DatabaseConfig(**values)
+    return profiles
+
+
 class Config(BaseModel):
     """Main configuration class."""
     
     database: DatabaseConfig
+    database_profiles: Dict[str, DatabaseConfig] = Field(default_factory=dict)
     filesystem: FilesystemConfig = Field(default_factory=FilesystemConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     server: ServerConfig = Field(default_factory=ServerConfig)
@@ -176,6 +278,29 @@ class Config(BaseModel):
             command_timeout=int(os.getenv('DB_COMMAND_TIMEOUT', '30')),
             pool_size=int(os.getenv('DB_POOL_SIZE', '5')),
             max_overflow=int(os.getenv('DB_MAX_OVERFLOW', '10')),
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', '3600')),
+            pool_adaptive=os.getenv('DB_POOL_ADAPTIVE', 'false').lower() == 'true',
+            pool_min_size=int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            pool_ping_skip_seconds=float(os.getenv('DB_POOL_PING_SKIP_SECONDS', '30')),
+            health_check_interval=float(os.getenv('DB_HEALTH_CHECK_INTERVAL', '30')),
+            reconnect_max_backoff=float(os.getenv('DB_RECONNECT_MAX_BACKOFF', '60')),
+            circuit_failure_threshold=int(os.getenv('DB_CIRCUIT_FAILURE_THRESHOLD', '3')),
+            circuit_reset_timeout=float(os.getenv('DB_CIRCUIT_RESET_TIMEOUT', '30')),
+            read_replicas=os.getenv('DB_READ_REPLICAS', ''),
+            read_routing=os.getenv('DB_READ_ROUTING', 'round_robin'),
+            async_driver=os.getenv('DB_ASYNC_DRIVER', 'false').lower() == 'true',
+            profile_idle_timeout=float(os.getenv('DB_PROFILE_IDLE_TIMEOUT', '600')),
+            fetch_batch_size=int(os.getenv('DB_FETCH_BATCH_SIZE', '500')),
+            bulk_insert_batch_size=int(os.getenv('DB_BULK_INSERT_BATCH_SIZE', '1000')),
+            affected_rows_limit=int(os.getenv('DB_AFFECTED_ROWS_LIMIT', '100')),
+            auto_parameterize=os.getenv('DB_AUTO_PARAMETERIZE', 'false').lower() == 'true',
+            statement_cache_size=int(os.getenv('DB_STATEMENT_CACHE_SIZE', '256')),
+            result_cache_enabled=os.getenv('DB_RESULT_CACHE_ENABLED', 'false').lower() == 'true',
+            result_cache_max_entries=int(os.getenv('DB_RESULT_CACHE_MAX_ENTRIES', '256')),
+            result_cache_max_bytes=int(os.getenv('DB_RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+            result_cache_ttl=float(os.getenv('DB_RESULT_CACHE_TTL', '30')),
+            schema_cache_enabled=os.getenv('DB_SCHEMA_CACHE_ENABLED', 'true').lower() == 'true',
+            schema_cache_refresh_interval=float(os.getenv('DB_SCHEMA_CACHE_REFRESH_INTERVAL', '30')),
 
             # 新增的连接参数
             trust_server_certificate=os.getenv('DB_TRUST_SERVER_CERTIFICATE', 'true').lower() == 'true',
@@ -195,6 +320,11 @@ class Config(BaseModel):
             enable_write=os.getenv('FS_ENABLE_WRITE', 'true').lower() == 'true',
             enable_delete=os.getenv('FS_ENABLE_DELETE', 'true').lower() == 'true',
             ignore_file_locks=os.getenv('FS_IGNORE_FILE_LOCKS', 'true').lower() == 'true',
+            line_index_stride=int(os.getenv('FS_LINE_INDEX_STRIDE', '1000')),
+            line_index_min_size=int(os.getenv('FS_LINE_INDEX_MIN_SIZE', str(1024 * 1024))),
+            line_index_cache_bytes=int(os.getenv('FS_LINE_INDEX_CACHE_BYTES', str(16 * 1024 * 1024))),
+            line_index_append_only=os.getenv('FS_LINE_INDEX_APPEND_ONLY', 'false').lower() == 'true',
+            walk_workers=int(os.getenv('FS_WALK_WORKERS', '1')),
         )
         
         # Security configuration - defaults to full access
@@ -210,10 +340,13 @@ class Config(BaseModel):
             debug=os.getenv('SERVER_DEBUG', 'false').lower() == 'true',
             log_level=os.getenv('SERVER_LOG_LEVEL', 'INFO'),
             log_file=os.getenv('SERVER_LOG_FILE'),
+            executor_max_pending=int(os.getenv('SERVER_EXECUTOR_MAX_PENDING', '100')),
+            executor_queue_timeout=float(os.getenv('SERVER_EXECUTOR_QUEUE_TIMEOUT', '60')),
         )
         
         return cls(
             database=db_config,
+            database_profiles=load_database_profiles(db_config),
             filesystem=fs_config,
             security=security_config,
             server=server_config,
@@ -1,19 +1,131 @@
 """SQL Server database operations for MCP server."""
 
 import logging
-import re
-from typing import Any, Dict, List, Optional, Tuple, Union
-import pyodbc
-from sqlalchemy import create_engine, text, MetaData, Table
-from sqlalchemy.engine import Engine
-from sqlalchemy.pool import QueuePool
-from contextlib import contextmanager
+import threading
+import time
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from contextlib import ExitStack, contextmanager
 
-from .config import config
+from .config import DatabaseConfig, config
+from .results import QueryResult
+from .cache import ResultCache, StatementCache, is_cacheable_query, written_tables
+from .catalog import SchemaCatalog, assemble_descriptions, build_describe_batches
+from .sqltext import add_output_clause, is_read_only_select, parameterize_literals
+from .validator import SQLValidator
+from .executor import OperationCancelledError, current_token
+from .pool import PoolMonitor
+from .health import CircuitBreaker, HealthChecker
+from .replicas import ReplicaRouter
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy import MetaData
 
 logger = logging.getLogger(__name__)
 
 
+def _text(query: str):
+    """Build a SQLAlchemy text clause; sqlalchemy is imported on first use only."""
+    from sqlalchemy import text
+    return text(query)
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote a possibly schema-qualified name: ``dbo.My Table`` -> ``[dbo].[My Table]``."""
+    parts = [p.strip() for p in name.split('.')]
+    if not parts or any(not p for p in parts):
+        raise ValueError(f"Invalid object name: {name!r}")
+    quoted = []
+    for part in parts:
+        if part.startswith('[') and part.endswith(']'):
+            part = part[1:-1].replace(']]', ']')
+        quoted.append('[' + part.replace(']', ']]') + ']')
+    return '.'.join(quoted)
+
+
+# SQL Server accepts at most 2100 parameters and 1000 row constructors per statement
+_MAX_STATEMENT_PARAMETERS = 2099
+_MAX_VALUES_ROWS = 1000
+
+
+def _is_output_clause_error(error: Exception) -> bool:
+    """Whether SQL Server refused a statement because of its OUTPUT clause."""
+    message = str(error)
+    # 334: target table has enabled triggers; other refusals name the OUTPUT clause
+    return '(334)' in message or 'OUTPUT clause' in message
+
+
+def _is_timeout_error(error: Exception) -> bool:
+    """Whether the driver aborted a statement because its query timeout expired."""
+    message = str(error)
+    return 'HYT00' in message or 'timeout expired' in message.lower()
+
+
+def _is_pool_timeout(error: Exception) -> bool:
+    """Whether no pooled connection became free within the pool timeout."""
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+    return isinstance(error, PoolTimeoutError)
+
+
+# ODBC SQLSTATEs of a broken or unreachable connection (08xxx) and a login timeout
+_CONNECTION_SQLSTATES = ('08S01', '08001', '08003', '08004', '08007', 'HYT01')
+_CONNECTION_MESSAGES = ('communication link failure', 'tcp provider', 'login timeout expired',
+                        'connection is busy', 'server has gone away')
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """Whether an error means the server or the connection is unusable, as
+    opposed to a problem with the statement itself."""
+    if getattr(error, 'connection_invalidated', False):
+        return True
+    from sqlalchemy.exc import DisconnectionError, InterfaceError
+    if isinstance(error, (DisconnectionError, InterfaceError)):
+        return True
+    message = str(error)
+    lowered = message.lower()
+    return any(state in message for state in _CONNECTION_SQLSTATES) or any(m in lowered for m in _CONNECTION_MESSAGES)
+
+
+def _is_cancellation(error: Exception) -> bool:
+    """Whether a statement failed because the calling tool request was cancelled."""
+    if isinstance(error, OperationCancelledError):
+        return True
+    token = current_token()
+    return (token is not None and token.cancelled) or 'HY008' in str(error)
+
+
+# Column metadata for get_table_schema when the schema catalog is not used
+_TABLE_SCHEMA_QUERY = """
+SELECT
+    c.COLUMN_NAME,
+    c.DATA_TYPE,
+    c.IS_NULLABLE,
+    c.COLUMN_DEFAULT,
+    c.CHARACTER_MAXIMUM_LENGTH,
+    c.NUMERIC_PRECISION,
+    c.NUMERIC_SCALE,
+    CASE WHEN pk.COLUMN_NAME IS NOT NULL THEN 1 ELSE 0 END AS IS_PRIMARY_KEY,
+    ISNULL(ep.value, '') AS COLUMN_DESCRIPTION
+FROM INFORMATION_SCHEMA.COLUMNS c
+LEFT JOIN (
+    SELECT ku.TABLE_CATALOG, ku.TABLE_SCHEMA, ku.TABLE_NAME, ku.COLUMN_NAME
+    FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS AS tc
+    INNER JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE AS ku
+        ON tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+        AND tc.CONSTRAINT_NAME = ku.CONSTRAINT_NAME
+) pk ON c.TABLE_CATALOG = pk.TABLE_CATALOG
+    AND c.TABLE_SCHEMA = pk.TABLE_SCHEMA
+    AND c.TABLE_NAME = pk.TABLE_NAME
+    AND c.COLUMN_NAME = pk.COLUMN_NAME
+LEFT JOIN sys.extended_properties ep ON ep.major_id = OBJECT_ID(c.TABLE_SCHEMA + '.' + c.TABLE_NAME)
+    AND ep.minor_id = c.ORDINAL_POSITION
+    AND ep.name = 'MS_Description'
+WHERE c.TABLE_NAME = :table_name AND c.TABLE_SCHEMA = :schema_name
+ORDER BY c.ORDINAL_POSITION
+"""
+
+
 class SQLSecurityError(Exception):
     """Raised when a SQL query fails security checks."""
     pass
@@ -24,64 +136,274 @@ class DatabaseConnectionError(Exception):
     pass
 
 
+class QueryTimeoutError(Exception):
+    """Raised when a statement exceeds its command timeout."""
+    pass
+
+
 class SQLServerManager:
     """Manages SQL Server connections and operations."""
 
-    def __init__(self):
-        self._engine: Optional[Engine] = None
-        self._metadata: Optional[MetaData] = None
+    def __init__(self, db_config: Optional[DatabaseConfig] = None, name: str = "default"):
+        # Connection profile this manager serves (DB_* settings by default)
+        self.db_config: DatabaseConfig = db_config or config.database
+        self.name = name
+        self._engine: Optional["Engine"] = None
+        self._metadata: Optional["MetaData"] = None
         self._is_available: bool = False
         self._connection_error: Optional[str] = None
-        self._initialize_engine()
-    
+        # The engine is built lazily: either in the background right after
+        # startup (start_background_init) or on first use.
+        self._init_lock = threading.Lock()
+        self._init_started = False
+        self._init_done = threading.Event()
+        # Engine replacement is serialized; readers take a reference to
+        # self._engine and keep using it even if it is swapped meanwhile
+        self._swap_lock = threading.Lock()
+        self._engine_swaps = 0
+        self._breaker = CircuitBreaker(
+            failure_threshold=self.db_config.circuit_failure_threshold,
+            reset_timeout=self.db_config.circuit_reset_timeout,
+        )
+        self._health: Optional[HealthChecker] = None
+        # Read-only SELECTs go to readable secondaries; this manager is the fallback
+        self._replicas: Optional[ReplicaRouter] = None
+        if self.db_config.read_replicas:
+            self._replicas = ReplicaRouter(
+                [SQLServerManager(replica_config, name=f"{name}-replica-{i + 1}")
+                 for i, replica_config in enumerate(self.db_config.replica_configs())],
+                strategy=self.db_config.read_routing,
+            )
+        self._result_cache: Optional[ResultCache] = None
+        if self.db_config.result_cache_enabled:
+            self._result_cache = ResultCache(
+                max_entries=self.db_config.result_cache_max_entries,
+                max_bytes=self.db_config.result_cache_max_bytes,
+                ttl=self.db_config.result_cache_ttl,
+            )
+        self._statement_cache: Optional[StatementCache] = None
+        if self.db_config.statement_cache_size > 0:
+            self._statement_cache = StatementCache(_text, max_entries=self.db_config.statement_cache_size)
+        self._pool_monitor = PoolMonitor(
+            pool_size=self.db_config.pool_size,
+            max_overflow=self.db_config.max_overflow,
+            adaptive=self.db_config.pool_adaptive,
+            min_size=self.db_config.pool_min_size,
+            ping_skip_seconds=self.db_config.pool_ping_skip_seconds,
+        )
+        self._validator: Optional[SQLValidator] = None
+        self._validator_signature: Optional[Tuple[Any, ...]] = None
+        self._catalog: Optional[SchemaCatalog] = None
+        if self.db_config.schema_cache_enabled:
+            self._catalog = SchemaCatalog(
+                self._run_internal_query,
+                refresh_interval=self.db_config.schema_cache_refresh_interval,
+            )
+
+    def start_background_init(self) -> None:
+        """Build the engine and test the connection on a background thread."""
+        with self._init_lock:
+            if self._init_started:
+                return
+            self._init_started = True
+        threading.Thread(target=self._run_initialization, name="db-init", daemon=True).start()
+        if self._replicas is not None:
+            self._replicas.start()
+
+    def wait_until_initialized(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first engine initialization has finished.
+
+        Initializes synchronously if nothing has started it yet. Returns
+        whether the database is available.
+        """
+        with self._init_lock:
+            run_here = not self._init_started
+            self._init_started = True
+        if run_here:
+            self._run_initialization()
+        else:
+            self._init_done.wait(timeout if timeout is not None else self.db_config.connection_timeout + 5)
+        return self._is_available
+
+    def is_initializing(self) -> bool:
+        """Check if the first engine initialization is still running."""
+        return self._init_started and not self._init_done.is_set()
+
+    def _run_initialization(self) -> None:
+        try:
+            self._initialize_engine()
+        finally:
+            self._init_done.set()
+            self._start_health_checks()
+
+    def _start_health_checks(self) -> None:
+        if self._health is not None or self.db_config.health_check_interval <= 0:
+            return
+        self._health = HealthChecker(
+            self._check_health,
+            interval=self.db_config.health_check_interval,
+            max_backoff=self.db_config.reconnect_max_backoff,
+        )
+        self._health.start(healthy=self._is_available)
+
     def _initialize_engine(self) -> None:
         """Initialize SQLAlchemy engine with connection pooling."""
-        try:
-            # Convert pyodbc connection string to SQLAlchemy format
-            connection_string = config.database.connection_string
-            sqlalchemy_url = f"mssql+pyodbc:///?odbc_connect={connection_string}"
-
-            self._engine = create_engine(
-                sqlalchemy_url,
-                poolclass=QueuePool,
-                pool_size=config.database.pool_size,
-                max_overflow=config.database.max_overflow,
-                pool_pre_ping=True,  # Validate connections before use
-                pool_recycle=3600,   # Recycle connections every hour
-                echo=config.server.debug,  # Log SQL queries in debug mode
-            )
+        self._replace_engine()
+
+    def _create_engine(self) -> "Engine":
+        # Deferred so that importing this module does not load sqlalchemy/pyodbc
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.pool import QueuePool
+
+        # Convert pyodbc connection string to SQLAlchemy format
+        connection_string = self.db_config.connection_string
+        sqlalchemy_url = f"mssql+pyodbc:///?odbc_connect={connection_string}"
+
+        engine = create_engine(
+            sqlalchemy_url,
+            poolclass=QueuePool,
+            pool_size=self.db_config.pool_size,
+            max_overflow=self.db_config.max_overflow,
+            # Connections are validated on checkout by the pool monitor instead
+            # of pool_pre_ping, so ping latency is measured and can be skipped
+            pool_recycle=self.db_config.pool_recycle,
+            echo=config.server.debug,  # Log SQL queries in debug mode
+        )
+
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        self._pool_monitor.attach(engine)
+        return engine
+
+    def _replace_engine(self) -> bool:
+        """Build and test a new engine, then swap it in atomically.
+
+        The current engine keeps serving until the new one has passed its
+        connection test; if it does not, the new engine is discarded and the
+        current one is left in place. A replaced engine is disposed once its
+        checked-out connections have been returned.
+        """
+        with self._swap_lock:
+            try:
+                from sqlalchemy import MetaData
+
+                candidate = self._create_engine()
+                error = self._probe(candidate)
+            except Exception as e:
+                candidate = None
+                error = str(e)
+
+            if error is not None:
+                if candidate is not None:
+                    candidate.dispose()
+                self._connection_error = error
+                if self._engine is None:
+                    self._is_available = False
+                    logger.warning(f"Failed to initialize database engine: {error} - Database features will be unavailable")
+                else:
+                    logger.warning(f"New database engine failed its connection test, keeping the current one: {error}")
+                return False
 
+            previous = self._engine
             self._metadata = MetaData()
+            self._engine = candidate
+            self._pool_monitor.activate(candidate)
+            self._is_available = True
+            self._connection_error = None
+            self._breaker.record_success()
+            if previous is not None:
+                self._engine_swaps += 1
+                self._retire_engine(previous)
+                if self._catalog is not None:
+                    self._catalog.mark_stale()
+            logger.info("Database engine initialized and connection test successful")
+            return True
 
-            # Test the connection to ensure it's working
-            if self.test_connection():
-                self._is_available = True
-                self._connection_error = None
-                logger.info("Database engine initialized and connection test successful")
-            else:
-                self._is_available = False
-                self._connection_error = "Connection test failed"
-                logger.warning("Database engine initialized but connection test failed")
+    def _retire_engine(self, engine: "Engine") -> None:
+        """Dispose a replaced engine after its in-flight connections are returned."""
+        drain_timeout = max(self.db_config.command_timeout, 30)
 
-        except Exception as e:
-            self._is_available = False
-            self._connection_error = str(e)
-            logger.warning(f"Failed to initialize database engine: {e} - Database features will be unavailable")
-            # Don't raise exception, just mark as unavailable
+        def drain():
+            deadline = time.monotonic() + drain_timeout
+            while engine.pool.checkedout() > 0 and time.monotonic() < deadline:
+                time.sleep(0.1)
+            busy = engine.pool.checkedout()
+            if busy:
+                logger.warning(f"Disposing replaced database engine with {busy} connection(s) still in use")
+            engine.dispose()
+            logger.info("Replaced database engine disposed")
 
-    def is_available(self) -> bool:
-        """Check if database is available for operations."""
-        return self._is_available
+        threading.Thread(target=drain, name="db-engine-drain", daemon=True).start()
+
+    def _check_health(self) -> bool:
+        """Health check run in the background: probe the current engine and
+        replace it once the circuit breaker has opened."""
+        engine = self._engine
+        error = self._probe(engine) if engine is not None else "Database engine not initialized"
+        if error is None:
+            if not self._is_available or self._breaker.state != 'closed':
+                logger.info("Database health check succeeded, database tools are available again")
+            self._breaker.record_success()
+            self._is_available = True
+            self._connection_error = None
+            return True
+
+        self._record_connection_failure(error)
+        if engine is None or self._breaker.state != 'closed':
+            return self._replace_engine()
+        return False
+
+    def _record_connection_failure(self, error: str) -> None:
+        self._connection_error = error
+        if self._breaker.record_failure(error):
+            logger.warning(f"Circuit breaker opened after repeated connection failures: {error}")
+            if self._health is not None:
+                self._health.wake()
+
+    def is_available(self, wait: bool = False) -> bool:
+        """Check if database is available for operations.
+
+        With ``wait=True`` a pending initialization is waited for (or run)
+        first, so the answer reflects a real connection attempt. The
+        database is also reported unavailable while the circuit breaker is
+        open after repeated connection failures.
+        """
+        if wait and not self._init_done.is_set():
+            self.wait_until_initialized()
+        return self._is_available and not self._breaker.is_open()
+
+    def is_engine_open(self) -> bool:
+        """Whether an engine (and its pool) currently exists."""
+        return self._engine is not None
 
     def get_connection_error(self) -> Optional[str]:
         """Get the last connection error message."""
         return self._connection_error
 
     def reconnect(self) -> bool:
-        """Attempt to reconnect to the database."""
+        """Build a fresh engine and swap it in if it can connect.
+
+        In-flight calls finish on the previous engine, which is disposed
+        afterwards; if the new engine cannot connect the previous one stays.
+        """
         logger.info("Attempting to reconnect to database...")
-        self._initialize_engine()
-        return self._is_available
+        with self._init_lock:
+            first_attempt = not self._init_started
+            self._init_started = True
+        if first_attempt:
+            self._run_initialization()
+            return self._is_available
+        return self._replace_engine()
+
+    def get_health_stats(self) -> Dict[str, Any]:
+        """Return circuit breaker state, health check counters and engine swaps."""
+        stats: Dict[str, Any] = {
+            'circuit': self._breaker.get_stats(),
+            'retry_in': self._breaker.retry_in(),
+            'engine_swaps': self._engine_swaps,
+        }
+        if self._health is not None:
+            stats['health_check'] = self._health.get_stats()
+        return stats
 
     def _validate_sql_query(self, query: str) -> None:
         """Validate SQL query for security issues."""
@@ -90,74 +412,170 @@ class SQLServerManager:
             logger.debug("SQL security validation skipped - full access mode enabled")
             return
 
-        # Check query length
-        if len(query) > config.security.max_query_length:
-            raise SQLSecurityError(f"Query exceeds maximum length of {config.security.max_query_length}")
-
-        # Convert to uppercase for keyword checking
-        query_upper = query.upper()
-
-        # Check for blocked keywords (only if any are configured)
-        if config.security.blocked_sql_keywords:
-            for keyword in config.security.blocked_sql_keywords:
-                if re.search(r'\b' + re.escape(keyword) + r'\b', query_upper):
-                    raise SQLSecurityError(f"Blocked SQL keyword detected: {keyword}")
-        else:
-            logger.debug("No blocked SQL keywords configured - allowing all SQL commands")
-
-        # Skip injection pattern checks if no keywords are blocked (full access mode)
-        if not config.security.blocked_sql_keywords:
-            logger.debug("SQL injection pattern checks skipped - full access mode")
-            return
-
-        # Check for common SQL injection patterns (only when security is enabled)
-        injection_patterns = [
-            r";\s*(DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC|EXECUTE)",
-            r"UNION\s+SELECT",
-            r"--\s*$",
-            r"/\*.*\*/",
-            r"'\s*(OR|AND)\s*'",
-            r"'\s*=\s*'",
-        ]
-
-        for pattern in injection_patterns:
-            if re.search(pattern, query_upper, re.MULTILINE):
-                raise SQLSecurityError(f"Potential SQL injection detected: {pattern}")
+        violation = self._get_validator().check(query)
+        if violation:
+            raise SQLSecurityError(violation)
 
         logger.debug("SQL query passed security validation")
+
+    def _get_validator(self) -> SQLValidator:
+        """Return the validator compiled from the current security settings."""
+        security = config.security
+        signature = (frozenset(security.blocked_sql_keywords), security.max_query_length)
+        if self._validator is None or self._validator_signature != signature:
+            self._validator = SQLValidator.from_config(security)
+            self._validator_signature = signature
+        return self._validator
     
     @contextmanager
-    def get_connection(self):
-        """Get a database connection with automatic cleanup."""
-        if not self._is_available:
+    def get_connection(self, timeout: Optional[int] = None):
+        """Get a database connection with automatic cleanup.
+
+        ``timeout`` overrides DB_COMMAND_TIMEOUT (seconds, 0 = no limit) for
+        every statement run on this connection.
+        """
+        if not self.is_available(wait=True):
             raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
 
-        if not self._engine:
+        engine = self._engine
+        if not engine:
             raise DatabaseConnectionError("Database engine not initialized")
+        if not self._breaker.allow_request():
+            raise DatabaseConnectionError(
+                f"Database is not available: {self._connection_error} "
+                f"(retrying in {self._breaker.retry_in():.0f}s)"
+            )
 
         connection = None
         try:
-            connection = self._engine.connect()
+            checkout_start = time.perf_counter()
+            connection = engine.connect()
+            self._pool_monitor.record_checkout(time.perf_counter() - checkout_start)
+            if timeout is not None:
+                connection = connection.execution_options(query_timeout=timeout)
             yield connection
         except Exception as e:
-            logger.error(f"Database connection error: {e}")
-            # Mark as unavailable if connection fails
-            self._is_available = False
-            self._connection_error = str(e)
-            if connection:
-                connection.rollback()
+            # A cancelled or timed-out statement says nothing about the server:
+            # clean the connection up for the pool and keep the database available
+            if _is_cancellation(e):
+                self._breaker.record_success()
+                logger.info("Statement cancelled on the server at the caller's request")
+                self._reset_connection(connection)
+                raise OperationCancelledError("Statement was cancelled") from e
+            if connection is not None and _is_timeout_error(e):
+                self._breaker.record_success()
+                limit = timeout if timeout is not None else self.db_config.command_timeout
+                logger.warning(f"Statement exceeded the command timeout of {limit}s and was cancelled")
+                self._reset_connection(connection)
+                raise QueryTimeoutError(f"Statement exceeded the command timeout of {limit}s") from e
+            if connection is None and _is_pool_timeout(e):
+                self._pool_monitor.record_pool_timeout()
+                self._breaker.record_success()
+            elif connection is None or _is_connection_error(e):
+                # Only a lost or unreachable server counts against the circuit
+                # breaker; statement errors leave the database available
+                logger.error(f"Database connection error: {e}")
+                self._record_connection_failure(str(e))
+            else:
+                self._breaker.record_success()
+            self._reset_connection(connection)
             raise
+        else:
+            self._breaker.record_success()
         finally:
             if connection:
                 connection.close()
     
-    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute a SELECT query and return results."""
-        if not self._is_available:
+    @contextmanager
+    def _read_connection(self, timeout: Optional[int] = None):
+        """Connection for a read-only query: a read replica if one can be
+        reached, otherwise this (primary) database."""
+        if self._replicas is None:
+            with self.get_connection(timeout) as conn:
+                yield conn
+            return
+
+        with ExitStack() as stack:
+            conn = None
+            for replica in self._replicas.candidates():
+                try:
+                    conn = stack.enter_context(replica.get_connection(timeout))
+                except OperationCancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Read replica {replica.name} unavailable, trying the next one: {e}")
+                    self._replicas.record_failure(replica)
+                    continue
+                self._replicas.record_routed(replica)
+                break
+            if conn is None:
+                self._replicas.record_fallback()
+                conn = stack.enter_context(self.get_connection(timeout))
+            yield conn
+
+    def _connection_for(self, read_only: bool, timeout: Optional[int] = None):
+        return self._read_connection(timeout) if read_only else self.get_connection(timeout)
+
+    def _reset_connection(self, connection) -> None:
+        """Roll back after an aborted statement; discard the connection if that fails."""
+        if connection is None:
+            return
+        try:
+            connection.rollback()
+        except Exception as e:
+            logger.debug(f"Rollback after aborted statement failed, discarding connection: {e}")
+            connection.invalidate()
+
+    def _statement_timeout(self, conn) -> int:
+        return conn.get_execution_options().get('query_timeout', self.db_config.command_timeout)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        """Apply the command timeout and make the statement cancellable by its tool call."""
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+            if hasattr(cursor, 'cancel'):
+                token.add_callback(cursor.cancel)
+        self._set_driver_timeout(cursor.connection, self._statement_timeout(conn))
+
+    @staticmethod
+    def _set_driver_timeout(dbapi_connection, timeout: int) -> None:
+        # pyodbc applies the connection's query timeout to each statement it executes
+        if getattr(dbapi_connection, 'timeout', timeout) != timeout:
+            dbapi_connection.timeout = timeout
+
+    def _raw_cursor(self, conn):
+        """DBAPI cursor with the same timeout and cancellation as SQLAlchemy executions."""
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+        cursor = conn.connection.cursor()
+        if token is not None:
+            token.add_callback(cursor.cancel)
+        self._set_driver_timeout(conn.connection.dbapi_connection, self._statement_timeout(conn))
+        return cursor
+
+    def execute_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                      max_rows: Optional[int] = None, timeout: Optional[int] = None) -> QueryResult:
+        """Execute a SELECT query and return results.
+
+        With ``max_rows`` set, rows are streamed and fetching stops once the
+        limit is reached; ``has_more`` reports whether further rows existed.
+        ``timeout`` overrides DB_COMMAND_TIMEOUT for this call.
+        """
+        if not self.is_available(wait=True):
             raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
 
         self._validate_sql_query(query)
 
+        cache_key = None
+        if self._result_cache is not None and is_cacheable_query(query):
+            cache_key = self._result_cache.make_key(query, parameters, max_rows)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Query served from result cache, returned {cached.row_count} rows")
+                return cached
+
         if config.security.enable_query_logging:
             if config.security.log_sensitive_data:
                 logger.info(f"Executing query: {query} with parameters: {parameters}")
@@ -165,24 +583,20 @@ class SQLServerManager:
                 logger.info(f"Executing query: {query}")
 
         try:
-            with self.get_connection() as conn:
-                result = conn.execute(text(query), parameters or {})
-                
-                # Convert result to list of dictionaries
-                columns = list(result.keys())
-                rows = []
-                for row in result:
-                    row_dict = {}
-                    for i, col_name in enumerate(columns):
-                        row_dict[col_name] = row[i]
-                    rows.append(row_dict)
-                
-                logger.info(f"Query executed successfully, returned {len(rows)} rows")
-                return {
-                    'columns': columns,
-                    'rows': rows,
-                    'row_count': len(rows)
-                }
+            read_only = is_read_only_select(query)
+            statement, bound, fallback = self._prepare_statement(query, parameters)
+            if max_rows is not None:
+                query_result = self._execute_query_limited(statement, bound, max_rows, fallback, timeout, read_only)
+            else:
+                with self._connection_for(read_only, timeout) as conn:
+                    result = self._execute_prepared(conn, statement, bound, fallback)
+                    query_result = QueryResult(result.keys(), result.fetchall())
+
+                logger.info(f"Query executed successfully, returned {query_result.row_count} rows")
+
+            if cache_key is not None:
+                self._result_cache.put(cache_key, query, query_result)
+            return query_result
                 
         except Exception as e:
             error_type = type(e).__name__
@@ -194,10 +608,145 @@ class SQLServerManager:
                 logger.error(f"Error details: {e.args}")
 
             raise e
+
+    def _prepare_statement(self, query: str, parameters: Optional[Dict[str, Any]]) -> Tuple[Any, Dict[str, Any], Optional[Tuple[Any, Dict[str, Any]]]]:
+        """Return ``(statement, parameters, fallback)`` for a read query.
+
+        With auto-parameterization on and no caller parameters, predicate
+        literals are lifted into bound parameters; ``fallback`` then holds the
+        original statement to run if the parameterized form is rejected.
+        Statements come from the shape-keyed statement cache when enabled.
+        """
+        if not parameters and self.db_config.auto_parameterize:
+            lifted = parameterize_literals(query)
+            if lifted is not None:
+                shape, bound = lifted
+                if self._statement_cache is not None:
+                    self._statement_cache.record_parameterized(len(bound))
+                return self._statement(shape), bound, (_text(query), {})
+        return self._statement(query), parameters or {}, None
+
+    def _statement(self, sql: str):
+        if self._statement_cache is None:
+            return _text(sql)
+        return self._statement_cache.get(sql)
+
+    def _execute_prepared(self, conn, statement, parameters: Dict[str, Any],
+                          fallback: Optional[Tuple[Any, Dict[str, Any]]] = None):
+        """Execute a prepared statement, re-running the literal form if parameterization broke it."""
+        if fallback is None:
+            return conn.execute(statement, parameters)
+        try:
+            return conn.execute(statement, parameters)
+        except Exception as e:
+            # A timed-out or cancelled statement would only run (and wait) a second time
+            if _is_timeout_error(e) or _is_cancellation(e):
+                raise
+            # e.g. a GROUP BY expression repeated in the select list no longer matches once parameterized
+            logger.debug(f"Parameterized query failed, re-running with literals: {e}")
+            conn.rollback()
+            if self._statement_cache is not None:
+                self._statement_cache.record_fallback()
+            return conn.execute(*fallback)
+
+    def _execute_query_limited(self, statement, parameters: Dict[str, Any], max_rows: int,
+                               fallback: Optional[Tuple[Any, Dict[str, Any]]] = None,
+                               timeout: Optional[int] = None, read_only: bool = False) -> QueryResult:
+        """Fetch at most ``max_rows`` rows, cancelling the statement afterwards."""
+        if max_rows < 0:
+            raise ValueError("max_rows must not be negative")
+
+        columns: List[str] = []
+        rows = []
+        has_more = False
+        # Ask for one extra row so we can tell whether the result was cut off
+        batch_size = min(self.db_config.fetch_batch_size, max_rows + 1)
+        for columns, batch in self._stream_batches(statement, parameters, batch_size, fallback, timeout, read_only):
+            remaining = max_rows - len(rows)
+            if len(batch) > remaining:
+                rows.extend(batch[:remaining])
+                has_more = True
+                break
+            rows.extend(batch)
+
+        logger.info(f"Query streamed successfully, returned {len(rows)} rows{' (truncated)' if has_more else ''}")
+        return QueryResult(columns, rows, has_more)
+
+    def iter_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                   batch_size: Optional[int] = None,
+                   timeout: Optional[int] = None) -> Iterator[Tuple[List[str], Sequence[Any]]]:
+        """Stream a query's results as ``(columns, rows)`` batches.
+
+        Rows are fetched ``batch_size`` at a time with ``fetchmany`` from the
+        pyodbc cursor, which reads SQL Server's forward-only result stream as
+        rows are requested (mssql+pyodbc has no server-side cursor mode); a
+        result without rows yields one empty batch. If the caller stops
+        iterating early (or closes the generator), the running statement is
+        cancelled on the server and the connection goes back to the pool. ``timeout``
+        overrides DB_COMMAND_TIMEOUT for this call.
+        """
+        if not self.is_available(wait=True):
+            raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
+
+        self._validate_sql_query(query)
+
+        if config.security.enable_query_logging:
+            if config.security.log_sensitive_data:
+                logger.info(f"Streaming query: {query} with parameters: {parameters}")
+            else:
+                logger.info(f"Streaming query: {query}")
+
+        return self._stream_batches(_text(query), parameters or {}, batch_size or self.db_config.fetch_batch_size,
+                                    timeout=timeout, read_only=is_read_only_select(query))
+
+    def _stream_batches(self, statement, parameters: Dict[str, Any], batch_size: int,
+                        fallback: Optional[Tuple[Any, Dict[str, Any]]] = None,
+                        timeout: Optional[int] = None,
+                        read_only: bool = False) -> Iterator[Tuple[List[str], Sequence[Any]]]:
+        with self._connection_for(read_only, timeout) as conn:
+            # No stream_results: mssql+pyodbc does not support server-side cursors, the
+            # default forward-only cursor already hands rows over as they are fetched
+            result = self._execute_prepared(conn, statement, parameters, fallback)
+            exhausted = False
+            try:
+                columns = list(result.keys()) if result.returns_rows else []
+                if not columns:
+                    exhausted = True
+                    return
+                yielded = False
+                while True:
+                    batch = result.fetchmany(batch_size)
+                    if not batch:
+                        exhausted = True
+                        if not yielded:
+                            # No rows: still report the columns (e.g. for a CSV header)
+                            yield columns, []
+                        return
+                    yielded = True
+                    yield columns, batch
+            finally:
+                if not exhausted:
+                    self._cancel_result(result)
+                result.close()
+
+    def _cancel_result(self, result) -> None:
+        """Cancel the statement behind a partially consumed result."""
+        cursor = getattr(result, 'cursor', None)
+        if cursor is None:
+            return
+        try:
+            cursor.cancel()
+            logger.debug("Cancelled remaining rows of streamed query")
+        except Exception as e:
+            logger.debug(f"Could not cancel streamed query: {e}")
     
-    def execute_non_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> int:
-        """Execute an INSERT, UPDATE, or DELETE query and return affected rows count."""
-        if not self._is_available:
+    def execute_non_query(self, query: str, parameters: Optional[Dict[str, Any]] = None,
+                          timeout: Optional[int] = None) -> int:
+        """Execute an INSERT, UPDATE, or DELETE query and return affected rows count.
+
+        ``timeout`` overrides DB_COMMAND_TIMEOUT for this call.
+        """
+        if not self.is_available(wait=True):
             raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
 
         self._validate_sql_query(query)
@@ -209,9 +758,10 @@ class SQLServerManager:
                 logger.info(f"Executing non-query: {query}")
 
         try:
-            with self.get_connection() as conn:
-                result = conn.execute(text(query), parameters or {})
+            with self.get_connection(timeout) as conn:
+                result = conn.execute(_text(query), parameters or {})
                 conn.commit()
+                self._invalidate_cached_results(query)
                 
                 affected_rows = result.rowcount
                 logger.info(f"Non-query executed successfully, affected {affected_rows} rows")
@@ -221,38 +771,122 @@ class SQLServerManager:
             logger.error(f"Non-query execution failed: {e}")
             raise
     
+    def execute_batch(self, statements: Sequence[Union[str, Dict[str, Any]]], transaction: str = "single",
+                      stop_on_error: bool = True) -> Dict[str, Any]:
+        """Run an ordered list of statements on one pooled connection.
+
+        ``statements`` holds SQL strings or ``{'query': ..., 'parameters': ...}``
+        dicts. With ``transaction="single"`` everything commits together and the
+        first failure rolls the whole batch back; with ``"per_statement"`` each
+        statement commits on its own and ``stop_on_error=False`` keeps going
+        after a failure. Returns per-statement row counts and timings.
+        """
+        if not self.is_available(wait=True):
+            raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
+        if transaction not in ("single", "per_statement"):
+            raise ValueError(f"Unknown transaction mode: {transaction}")
+
+        batch: List[Tuple[str, Dict[str, Any]]] = []
+        for item in statements:
+            if isinstance(item, str):
+                batch.append((item, {}))
+            else:
+                batch.append((item.get('query', ''), item.get('parameters') or {}))
+        if not batch:
+            raise ValueError("At least one statement is required")
+
+        # Reject the whole batch up front rather than failing half way through
+        for query, _ in batch:
+            self._validate_sql_query(query)
+
+        if config.security.enable_query_logging:
+            logger.info(f"Executing batch of {len(batch)} statements ({transaction})")
+
+        results: List[Dict[str, Any]] = []
+        error: Optional[str] = None
+        start = time.perf_counter()
+
+        with self.get_connection() as conn:
+            for index, (query, parameters) in enumerate(batch, 1):
+                if config.security.enable_query_logging and config.security.log_sensitive_data:
+                    logger.info(f"Batch statement {index}: {query} with parameters: {parameters}")
+                statement_start = time.perf_counter()
+                try:
+                    result = conn.execute(_text(query), parameters)
+                    rows_returned = len(result.fetchall()) if result.returns_rows else None
+                    if transaction == "per_statement":
+                        conn.commit()
+                        self._invalidate_cached_results(query)
+                    results.append({
+                        'index': index,
+                        'status': 'ok',
+                        'rowcount': result.rowcount,
+                        'rows_returned': rows_returned,
+                        'elapsed_ms': (time.perf_counter() - statement_start) * 1000,
+                    })
+                except Exception as e:
+                    if _is_cancellation(e):
+                        # Let get_connection clean up and report the abort for the whole batch
+                        raise
+                    conn.rollback()
+                    if _is_timeout_error(e):
+                        e = QueryTimeoutError(f"exceeded the command timeout of {self._statement_timeout(conn)}s")
+                    error = f"Statement {index} failed: {e}"
+                    logger.error(error)
+                    results.append({
+                        'index': index,
+                        'status': 'error',
+                        'error': str(e),
+                        'elapsed_ms': (time.perf_counter() - statement_start) * 1000,
+                    })
+                    if transaction == "single" or stop_on_error:
+                        break
+
+            if transaction == "single":
+                if error is None:
+                    conn.commit()
+                    for query, _ in batch:
+                        self._invalidate_cached_results(query)
+                else:
+                    for entry in results:
+                        if entry['status'] == 'ok':
+                            entry['status'] = 'rolled_back'
+
+        for index in range(len(results) + 1, len(batch) + 1):
+            results.append({'index': index, 'status': 'skipped'})
+
+        elapsed = time.perf_counter() - start
+        succeeded = sum(1 for entry in results if entry['status'] == 'ok')
+        logger.info(f"Batch finished: {succeeded}/{len(batch)} statements committed in {elapsed:.3f}s")
+        return {
+            'success': error is None,
+            'transaction': transaction,
+            'statements': len(batch),
+            'committed': succeeded,
+            'elapsed_seconds': elapsed,
+            'results': results,
+            'error': error,
+        }
+
     def get_table_schema(self, table_name: str, schema_name: str = "dbo") -> Dict[str, Any]:
         """Get table schema information."""
-        if not self._is_available:
+        if not self.is_available(wait=True):
             raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
-        query = """
-        SELECT
-            c.COLUMN_NAME,
-            c.DATA_TYPE,
-            c.IS_NULLABLE,
-            c.COLUMN_DEFAULT,
-            c.CHARACTER_MAXIMUM_LENGTH,
-            c.NUMERIC_PRECISION,
-            c.NUMERIC_SCALE,
-            CASE WHEN pk.COLUMN_NAME IS NOT NULL THEN 1 ELSE 0 END AS IS_PRIMARY_KEY,
-            ISNULL(ep.value, '') AS COLUMN_DESCRIPTION
-        FROM INFORMATION_SCHEMA.COLUMNS c
-        LEFT JOIN (
-            SELECT ku.TABLE_CATALOG, ku.TABLE_SCHEMA, ku.TABLE_NAME, ku.COLUMN_NAME
-            FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS AS tc
-            INNER JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE AS ku
-                ON tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
-                AND tc.CONSTRAINT_NAME = ku.CONSTRAINT_NAME
-        ) pk ON c.TABLE_CATALOG = pk.TABLE_CATALOG
-            AND c.TABLE_SCHEMA = pk.TABLE_SCHEMA
-            AND c.TABLE_NAME = pk.TABLE_NAME
-            AND c.COLUMN_NAME = pk.COLUMN_NAME
-        LEFT JOIN sys.extended_properties ep ON ep.major_id = OBJECT_ID(c.TABLE_SCHEMA + '.' + c.TABLE_NAME)
-            AND ep.minor_id = c.ORDINAL_POSITION
-            AND ep.name = 'MS_Description'
-        WHERE c.TABLE_NAME = :table_name AND c.TABLE_SCHEMA = :schema_name
-        ORDER BY c.ORDINAL_POSITION
-        """
+
+        if self._catalog is not None:
+            try:
+                table = self._catalog.get_table(table_name, schema_name)
+                if table is not None:
+                    return {
+                        'table_name': table_name,
+                        'schema_name': schema_name,
+                        'columns': list(table.columns)
+                    }
+                # Not a cached table (e.g. a view): INFORMATION_SCHEMA covers it
+            except Exception as e:
+                logger.warning(f"Schema catalog unavailable, falling back to INFORMATION_SCHEMA: {e}")
+
+        query = _TABLE_SCHEMA_QUERY
         
         try:
             result = self.execute_query(query, {
@@ -263,7 +897,7 @@ class SQLServerManager:
             return {
                 'table_name': table_name,
                 'schema_name': schema_name,
-                'columns': result['rows']
+                'columns': result.to_dicts()
             }
             
         except Exception as e:
@@ -272,9 +906,15 @@ class SQLServerManager:
     
     def get_database_tables(self, schema_name: str = "dbo") -> List[str]:
         """Get list of tables in the database."""
-        if not self._is_available:
+        if not self.is_available(wait=True):
             raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
 
+        if self._catalog is not None:
+            try:
+                return self._catalog.list_tables(schema_name)
+            except Exception as e:
+                logger.warning(f"Schema catalog unavailable, falling back to INFORMATION_SCHEMA: {e}")
+
         query = """
         SELECT TABLE_NAME
         FROM INFORMATION_SCHEMA.TABLES
@@ -284,29 +924,166 @@ class SQLServerManager:
 
         try:
             result = self.execute_query(query, {'schema_name': schema_name})
-            return [row['TABLE_NAME'] for row in result['rows']]
+            return result.column('TABLE_NAME')
 
         except Exception as e:
             logger.error(f"Failed to get database tables: {e}")
             raise
     
+    def bulk_insert(self, table_name: str, columns: List[str], rows: Iterable[Sequence[Any]],
+                    batch_size: Optional[int] = None, method: str = "fast_executemany") -> Dict[str, Any]:
+        """Insert many rows in batches inside a single transaction.
+
+        ``fast_executemany`` sends each batch as one array-bound pyodbc
+        execution; ``values`` sends multi-row ``INSERT ... VALUES`` statements
+        for drivers without array binding. Neither path uses INSERT ... SELECT.
+        """
+        if not self.is_available(wait=True):
+            raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
+        if not columns:
+            raise ValueError("At least one column is required")
+        if method not in ("fast_executemany", "values"):
+            raise ValueError(f"Unknown bulk insert method: {method}")
+
+        batch_size = batch_size or self.db_config.bulk_insert_batch_size
+        target = _quote_identifier(table_name)
+        column_list = ", ".join(_quote_identifier(c) for c in columns)
+        placeholders = "(" + ", ".join("?" for _ in columns) + ")"
+        insert_sql = f"INSERT INTO {target} ({column_list}) VALUES {placeholders}"
+        self._validate_sql_query(insert_sql)
+
+        if method == "values":
+            # Keep each statement under the parameter and row-constructor limits
+            batch_size = max(1, min(batch_size, _MAX_VALUES_ROWS, _MAX_STATEMENT_PARAMETERS // len(columns)))
+
+        if config.security.enable_query_logging:
+            logger.info(f"Bulk inserting into {target} ({len(columns)} columns, batch size {batch_size}, {method})")
+
+        total_rows = 0
+        batches = 0
+        start = time.perf_counter()
+        row_iter = iter(rows)
+
+        try:
+            with self.get_connection() as conn:
+                with conn.begin():
+                    cursor = self._raw_cursor(conn)
+                    try:
+                        if method == "fast_executemany":
+                            cursor.fast_executemany = True
+                        full_values_sql = None
+                        while True:
+                            batch = list(islice(row_iter, batch_size))
+                            if not batch:
+                                break
+                            for row in batch:
+                                if len(row) != len(columns):
+                                    raise ValueError(
+                                        f"Row {total_rows + 1} has {len(row)} values, expected {len(columns)}"
+                                    )
+                                total_rows += 1
+                            if method == "fast_executemany":
+                                cursor.executemany(insert_sql, batch)
+                            else:
+                                if len(batch) == batch_size and full_values_sql is not None:
+                                    values_sql = full_values_sql
+                                else:
+                                    values_sql = (f"INSERT INTO {target} ({column_list}) VALUES "
+                                                  + ", ".join([placeholders] * len(batch)))
+                                    if len(batch) == batch_size:
+                                        full_values_sql = values_sql
+                                cursor.execute(values_sql, [value for row in batch for value in row])
+                            batches += 1
+                    finally:
+                        cursor.close()
+
+            self._invalidate_cached_results(insert_sql)
+        except Exception as e:
+            logger.error(f"Bulk insert into {target} failed after {total_rows} rows (rolled back): {e}")
+            raise
+
+        elapsed = time.perf_counter() - start
+        rows_per_second = total_rows / elapsed if elapsed > 0 else float(total_rows)
+        logger.info(f"Bulk insert into {target} committed {total_rows} rows in {elapsed:.2f}s ({rows_per_second:.0f} rows/s)")
+        return {
+            'table_name': table_name,
+            'rows_inserted': total_rows,
+            'batches': batches,
+            'batch_size': batch_size,
+            'method': method,
+            'elapsed_seconds': elapsed,
+            'rows_per_second': rows_per_second,
+        }
+
+    def describe_tables(self, tables: Optional[List[str]] = None, schema_name: str = "dbo") -> List[Dict[str, Any]]:
+        """Describe many tables in one round trip.
+
+        Returns columns, primary keys, foreign keys, indexes and row-count
+        estimates for every table matching ``tables`` (names or ``*``/``?``
+        wildcards, optionally schema-qualified) or, without tables, for all
+        tables in ``schema_name`` (``*`` for every schema). More than 1000
+        names take one round trip per 1000.
+        """
+        if not self.is_available(wait=True):
+            raise DatabaseConnectionError(f"Database is not available: {self._connection_error}")
+
+        batches = build_describe_batches(tables, schema_name)
+
+        try:
+            # tables, columns, foreign keys, indexes; every row starts with the table's object_id
+            result_sets: List[List[Any]] = [[], [], [], []]
+            seen = set()
+            with self.get_connection() as conn:
+                # Multiple result sets need the raw DBAPI cursor
+                cursor = self._raw_cursor(conn)
+                try:
+                    for batch, params in batches:
+                        cursor.execute(batch, params)
+                        fetched = []
+                        while True:
+                            if cursor.description is not None:
+                                fetched.append(cursor.fetchall())
+                            if not cursor.nextset():
+                                break
+                        # A table matched by names in several batches is described once
+                        new_ids = {row[0] for row in fetched[0]} - seen
+                        seen |= new_ids
+                        for rows, batch_rows in zip(result_sets, fetched):
+                            rows.extend(row for row in batch_rows if row[0] in new_ids)
+                finally:
+                    cursor.close()
+
+            if len(batches) > 1:
+                result_sets[0].sort(key=lambda row: (row[1], row[2]))
+            described = assemble_descriptions(*result_sets)
+            logger.info(f"Described {len(described)} tables in {len(batches)} batch(es)")
+            return described
+
+        except Exception as e:
+            logger.error(f"Failed to describe tables: {e}")
+            raise
+    
     def test_connection(self) -> bool:
         """Test database connection."""
-        if not self._engine:
+        engine = self._engine
+        if not engine:
             return False
+        return self._probe(engine) is None
 
+    def _probe(self, engine: "Engine") -> Optional[str]:
+        """Run ``SELECT 1`` on ``engine``; return the error message, or None on success."""
         try:
             # Use direct engine connection for testing to avoid circular dependency
-            connection = self._engine.connect()
+            connection = engine.connect()
             try:
-                connection.execute(text("SELECT 1"))
+                connection.execute(_text("SELECT 1"))
                 logger.debug("Database connection test successful")
-                return True
+                return None
             finally:
                 connection.close()
         except Exception as e:
             logger.debug(f"Database connection test failed: {e}")
-            return False
+            return str(e) or type(e).__name__
     
     def list_tables(self, schema_name: str = "dbo") -> List[str]:
         """Get list of tables in the database (alias for get_database_tables)."""
@@ -314,7 +1091,7 @@ class SQLServerManager:
     
     def execute_with_details(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute query and return detailed results including affected records for INSERT/UPDATE/DELETE."""
-        if not self._is_available:
+        if not self.is_available(wait=True):
             return {
                 'type': 'error',
                 'success': False,
@@ -337,57 +1114,29 @@ class SQLServerManager:
                 logger.info(f"Executing detailed query: {query}")
         
         try:
-            with self.get_connection() as conn:
+            # Read-only SELECTs may be served by a read replica
+            with self._connection_for(is_select and is_read_only_select(query)) as conn:
                 if is_select:
                     # For SELECT queries, return rows and columns
-                    result = conn.execute(text(query), parameters or {})
-                    columns = list(result.keys())
-                    rows = []
-                    for row in result:
-                        row_dict = {}
-                        for i, col_name in enumerate(columns):
-                            row_dict[col_name] = row[i]
-                        rows.append(row_dict)
+                    result = conn.execute(_text(query), parameters or {})
+                    query_result = QueryResult(result.keys(), result.fetchall())
                     
                     return {
                         'type': 'select',
                         'success': True,
-                        'columns': columns,
-                        'rows': rows,
-                        'row_count': len(rows),
-                        'message': f'查询成功，返回 {len(rows)} 行数据'
+                        'columns': query_result.columns,
+                        'rows': query_result.rows,
+                        'row_count': query_result.row_count,
+                        'message': f'查询成功，返回 {query_result.row_count} 行数据'
                     }
                 
                 elif is_insert or is_update or is_delete:
-                    # For DML queries, get affected records details
-                    affected_records = []
-                    
-                    # Try to get detailed information about affected records
-                    if is_update or is_delete:
-                        # For UPDATE/DELETE, try to get the records before operation
-                        try:
-                            # Extract table name from query (basic parsing)
-                            table_name = self._extract_table_name(query, is_update, is_delete)
-                            if table_name:
-                                # Get records that would be affected
-                                where_clause = self._extract_where_clause(query)
-                                if where_clause:
-                                    preview_query = f"SELECT * FROM {table_name} WHERE {where_clause}"
-                                    preview_result = conn.execute(text(preview_query), parameters or {})
-                                    preview_columns = list(preview_result.keys())
-                                    for row in preview_result:
-                                        row_dict = {}
-                                        for i, col_name in enumerate(preview_columns):
-                                            row_dict[col_name] = row[i]
-                                        affected_records.append(row_dict)
-                        except Exception as preview_error:
-                            logger.debug(f"Could not preview affected records: {preview_error}")
-                    
-                    # Execute the actual query
-                    result = conn.execute(text(query), parameters or {})
+                    # Affected rows come back from an OUTPUT clause in the same round trip
+                    affected_rows, affected_records, truncated = self._execute_dml_with_output(
+                        conn, query, parameters or {}
+                    )
                     conn.commit()
-                    
-                    affected_rows = result.rowcount
+                    self._invalidate_cached_results(query)
                     
                     operation_type = 'insert' if is_insert else ('update' if is_update else 'delete')
                     operation_name = {'insert': '插入', 'update': '更新', 'delete': '删除'}[operation_type]
@@ -399,16 +1148,28 @@ class SQLServerManager:
                         'message': f'{operation_name}操作成功，影响了 {affected_rows} 行记录'
                     }
                     
-                    if affected_records and (is_update or is_delete):
-                        response['affected_records'] = affected_records
+                    if affected_records:
+                        if is_update:
+                            # deleted.* then inserted.*: rows before and after the update
+                            width = len(affected_records.columns) // 2
+                            response['affected_columns'] = affected_records.columns[:width]
+                            response['affected_records'] = [tuple(row[:width]) for row in affected_records.rows]
+                            response['updated_records'] = [tuple(row[width:]) for row in affected_records.rows]
+                        else:
+                            response['affected_columns'] = affected_records.columns
+                            response['affected_records'] = affected_records.rows
+                        response['affected_records_truncated'] = truncated
                         response['message'] += f'，详细记录如下'
+                        if truncated:
+                            response['message'] += f'（仅显示前 {len(affected_records.rows)} 行）'
                     
                     return response
                 
                 else:
                     # For other queries (DDL, etc.)
-                    result = conn.execute(text(query), parameters or {})
+                    result = conn.execute(_text(query), parameters or {})
                     conn.commit()
+                    self._invalidate_cached_results(query)
                     
                     return {
                         'type': 'other',
@@ -425,47 +1186,102 @@ class SQLServerManager:
                 'message': f'SQL执行失败: {e}'
             }
     
-    def _extract_table_name(self, query: str, is_update: bool, is_delete: bool) -> Optional[str]:
-        """Extract table name from UPDATE or DELETE query."""
-        try:
-            import re
-            query_upper = query.upper()
-            
-            if is_update:
-                # UPDATE table_name SET ...
-                match = re.search(r'UPDATE\s+(\[?\w+\]?\.?\[?\w+\]?)\s+SET', query_upper)
-            elif is_delete:
-                # DELETE FROM table_name WHERE ...
-                match = re.search(r'DELETE\s+FROM\s+(\[?\w+\]?\.?\[?\w+\]?)', query_upper)
+    def _execute_dml_with_output(self, conn, query: str,
+                                 parameters: Dict[str, Any]) -> Tuple[int, Optional[QueryResult], bool]:
+        """Run a DML statement with an OUTPUT clause that returns the affected rows.
+
+        Only the first ``affected_rows_limit`` rows are kept; the rest are
+        counted and discarded. Falls back to the plain statement when it
+        cannot be rewritten or SQL Server rejects OUTPUT for the target
+        (enabled triggers, remote tables...). Returns ``(affected_rows,
+        records, truncated)``.
+        """
+        rewritten = add_output_clause(query)
+        if rewritten is not None:
+            try:
+                result = conn.execute(_text(rewritten[0]), parameters)
+            except Exception as e:
+                if not _is_output_clause_error(e):
+                    raise
+                logger.debug(f"OUTPUT clause rejected, re-running without it: {e}")
+                conn.rollback()
             else:
-                return None
-            
-            if match:
-                return match.group(1).strip()
+                limit = self.db_config.affected_rows_limit
+                kept: List[Any] = []
+                affected_rows = 0
+                while True:
+                    batch = result.fetchmany(self.db_config.fetch_batch_size)
+                    if not batch:
+                        break
+                    affected_rows += len(batch)
+                    if len(kept) < limit:
+                        kept.extend(batch[:limit - len(kept)])
+                return affected_rows, QueryResult(result.keys(), kept), affected_rows > len(kept)
+
+        result = conn.execute(_text(query), parameters)
+        return result.rowcount, None, False
+
+    def _invalidate_cached_results(self, statement: str) -> None:
+        """Drop cached results and metadata that a committed statement may have changed."""
+        if self._result_cache is not None:
+            self._result_cache.invalidate_for_statement(statement)
+        if self._catalog is not None and written_tables(statement) is None:
+            # DDL, EXEC and batches may change the schema
+            self._catalog.mark_stale()
+
+    def _run_internal_query(self, query: str) -> QueryResult:
+        """Run a trusted metadata query, bypassing validation and the result cache."""
+        with self.get_connection() as conn:
+            result = conn.execute(_text(query))
+            return QueryResult(result.keys(), result.fetchall())
+
+    def get_catalog_stats(self) -> Optional[Dict[str, Any]]:
+        """Return schema catalog counters, or None when the catalog is disabled."""
+        if self._catalog is None:
             return None
-        except Exception:
+        return self._catalog.get_stats()
+
+    def get_statement_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Return statement cache and parameterization counters, or None when disabled."""
+        if self._statement_cache is None:
             return None
-    
-    def _extract_where_clause(self, query: str) -> Optional[str]:
-        """Extract WHERE clause from query."""
-        try:
-            import re
-            query_upper = query.upper()
-            
-            # Find WHERE clause
-            match = re.search(r'WHERE\s+(.+?)(?:ORDER\s+BY|GROUP\s+BY|$)', query_upper, re.DOTALL)
-            if match:
-                return match.group(1).strip()
+        return self._statement_cache.get_stats()
+
+    def get_replica_stats(self) -> Optional[Dict[str, Any]]:
+        """Return read replica routing counters, or None when no replicas are configured."""
+        if self._replicas is None:
             return None
-        except Exception:
+        return self._replicas.get_stats()
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool state, checkout/ping timings and adaptive sizing counters."""
+        return self._pool_monitor.get_stats()
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Return result cache counters, or None when the cache is disabled."""
+        if self._result_cache is None:
             return None
+        return self._result_cache.get_stats()
     
     def close(self) -> None:
-        """Close database engine and all connections."""
+        """Close database engine and all connections.
+
+        The manager stays usable: the next database call initializes a new
+        engine (this is how idle connection profiles are evicted).
+        """
+        if self._health is not None:
+            self._health.stop()
+            self._health = None
+        with self._init_lock:
+            self._init_started = False
+            self._init_done.clear()
+        self._is_available = False
+        if self._replicas is not None:
+            self._replicas.close()
         if self._engine:
             self._engine.dispose()
             self._engine = None
-            logger.info("Database engine closed")
+            logger.info(f"Database engine closed ({self.name})")
 
 
 # Global database manager instance
@@ -0,0 +1,220 @@
+"""Bounded worker threads for blocking database and filesystem calls."""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a call cannot get a worker thread in time."""
+    pass
+
+
+class OperationCancelledError(Exception):
+    """Raised inside a worker when its call has been cancelled."""
+    pass
+
+
+class CancellationToken:
+    """Cancellation handle shared between the event loop and a worker thread.
+
+    Blocking code registers callbacks (for example ``cursor.cancel``) that are
+    invoked from the event loop thread when the awaiting task is cancelled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: List[Callable[[], Any]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def add_callback(self, callback: Callable[[], Any]) -> None:
+        """Register a callback; runs immediately if already cancelled."""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        self._run_callback(callback)
+
+    def remove_callback(self, callback: Callable[[], Any]) -> None:
+        """Unregister a callback that is no longer relevant."""
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def cancel(self) -> None:
+        """Mark the call as cancelled and fire all registered callbacks."""
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._run_callback(callback)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelledError if the call has been cancelled."""
+        if self._cancelled:
+            raise OperationCancelledError("Operation was cancelled")
+
+    @staticmethod
+    def _run_callback(callback: Callable[[], Any]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            logger.debug(f"Cancellation callback failed: {e}")
+
+
+_current_token: contextvars.ContextVar[Optional[CancellationToken]] = contextvars.ContextVar(
+    "current_cancellation_token", default=None
+)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Return the cancellation token of the call running in this worker, if any."""
+    return _current_token.get()
+
+
+class BlockingExecutor:
+    """Runs blocking callables on a bounded thread pool with backpressure.
+
+    At most ``max_workers`` calls run at once. Further calls wait for a free
+    slot, up to ``queue_timeout`` seconds, and at most ``max_pending`` calls
+    may wait at the same time; beyond that new calls are rejected with
+    ExecutorSaturatedError instead of piling up.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int = 100, queue_timeout: Optional[float] = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout or None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._active = 0
+        self._waiting = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._rejected = 0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=f"mcp-{self.name}",
+                    )
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any,
+                  cancel_token: Optional[CancellationToken] = None, **kwargs: Any) -> Any:
+        """Run ``func(*args, **kwargs)`` in a worker thread and await its result.
+
+        Cancelling the awaiting task cancels ``cancel_token`` so that the
+        blocking code can abort its in-flight work.
+        """
+        if self._waiting >= self.max_pending and self._semaphore.locked():
+            self._rejected += 1
+            raise ExecutorSaturatedError(
+                f"{self.name} executor is saturated ({self._active} running, {self._waiting} waiting)"
+            )
+
+        self._waiting += 1
+        try:
+            if self.queue_timeout:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            else:
+                await self._semaphore.acquire()
+        except asyncio.TimeoutError:
+            self._rejected += 1
+            raise ExecutorSaturatedError(
+                f"{self.name} executor: no worker available within {self.queue_timeout}s"
+            )
+        finally:
+            self._waiting -= 1
+
+        token = cancel_token or CancellationToken()
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        context.run(_current_token.set, token)
+
+        # The slot is held until the worker thread really finishes, even if the
+        # awaiting task is cancelled earlier, so the limit reflects busy threads.
+        self._active += 1
+        try:
+            future = self._get_pool().submit(context.run, func, *args, **kwargs)
+        except BaseException:
+            self._active -= 1
+            self._semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._cancelled += 1
+            token.cancel()
+            raise
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # Event loop already closed (shutdown); nothing left to wake up.
+            pass
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._completed += 1
+        self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return current load and lifetime counters."""
+        return {
+            'name': self.name,
+            'max_workers': self.max_workers,
+            'active': self._active,
+            'waiting': self._waiting,
+            'completed': self._completed,
+            'cancelled': self._cancelled,
+            'rejected': self._rejected,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+# Global executors: database calls are bounded by the connection pool size,
+# filesystem calls use the standard library's default worker count.
+db_executor = BlockingExecutor(
+    "db",
+    max_workers=config.database.pool_size + config.database.max_overflow,
+    max_pending=config.server.executor_max_pending,
+    queue_timeout=config.server.executor_queue_timeout,
+)
+fs_executor = BlockingExecutor(
+    "fs",
+    max_workers=min(32, (os.cpu_count() or 1) + 4),
+    max_pending=config.server.executor_max_pending,
+    queue_timeout=config.server.executor_queue_timeout,
+)
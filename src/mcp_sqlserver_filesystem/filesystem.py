@@ -1,15 +1,24 @@
 """Filesystem operations for MCP server."""
 
+import codecs
+import csv
+import gzip
+import io
+import json
 import logging
 import os
 import shutil
+import tempfile
+import time
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
-import aiofiles
-import asyncio
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime
 
 from .config import get_config
+from .formatters import arrow_array, import_pyarrow, json_default, text_value, unique_columns
+from .lineindex import SCAN_BLOCK_SIZE, LineIndexCache, nth_newline
+from .walker import DirectoryWalker, is_reparse_point
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +33,61 @@ class FilesystemOperationError(Exception):
     pass
 
 
+# File formats and whole-file compressions accepted by write_records
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+EXPORT_COMPRESSIONS = ('none', 'gzip', 'zstd')
+_COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.gzip': 'gzip', '.zst': 'zstd', '.zstd': 'zstd'}
+# Parquet compresses inside the file; 'none' keeps pyarrow's default codec
+_PARQUET_CODECS = {'none': 'snappy', 'gzip': 'gzip', 'zstd': 'zstd'}
+# Rows buffered per Parquet row group
+_PARQUET_ROW_GROUP_SIZE = 65536
+
+
+# Bytes returned by one read_file_range call unless a length is given
+DEFAULT_READ_LENGTH = 10000
+
+# Lines returned by tail_file by default, and bytes scanned back per read
+DEFAULT_TAIL_LINES = 50
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def _decode_chunk(raw: bytes, encoding: str, final: bool) -> Tuple[str, int]:
+    """Decode ``raw``, holding back a multi-byte character cut off at its end
+    unless ``final``; returns the text and the number of bytes it used."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    content = decoder.decode(raw, final=final)
+    return content, len(raw) - len(decoder.getstate()[0])
+
+
+class _NonClosingWriter(io.RawIOBase):
+    """Writable view of a binary file that leaves it open when closed."""
+
+    def __init__(self, raw: IO[bytes]):
+        self._raw = raw
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return self._raw.write(data)
+
+
 class FilesystemManager:
     """Manages filesystem operations with security controls."""
     
     def __init__(self):
         self._validate_configuration()
         self._log_configuration()
+        fs_config = get_config().filesystem
+        self._walker = DirectoryWalker(workers=fs_config.walk_workers)
+        # Sparse line offsets of large files, so start_line reads seek close to the line
+        self._line_index: Optional[LineIndexCache] = None
+        if fs_config.line_index_stride > 0:
+            self._line_index = LineIndexCache(
+                stride=fs_config.line_index_stride,
+                max_bytes=fs_config.line_index_cache_bytes,
+                append_only=fs_config.line_index_append_only,
+            )
     
     def _validate_configuration(self) -> None:
         """Validate filesystem configuration."""
@@ -206,6 +264,228 @@ class FilesystemManager:
             logger.error(f"Failed to read file {file_path}: {e}")
             raise FilesystemOperationError(f"Failed to read file: {e}")
     
+    def read_file_range(self, file_path: Union[str, Path], offset: int = 0, length: int = DEFAULT_READ_LENGTH,
+                        start_line: Optional[int] = None, end_line: Optional[int] = None,
+                        encoding: str = 'utf-8') -> Dict[str, Any]:
+        """Read one chunk of a file without loading the rest of it.
+
+        Byte mode reads ``length`` bytes from ``offset``; line mode (when
+        ``start_line`` or ``end_line`` is given, 1-based and inclusive) reads
+        whole lines from ``start_line`` up to ``end_line``, at most ``length``
+        bytes of them. Only the bytes read are decoded; a multi-byte
+        character split by the range is left for the next chunk. The result
+        carries ``next_offset`` (and ``next_line`` in line mode) to continue
+        from, or None at the end of the file. Since at most ``length`` bytes
+        are read, FS_MAX_FILE_SIZE does not apply.
+        """
+        file_path = Path(file_path)
+        self._validate_file_operation(file_path, 'read')
+
+        line_mode = start_line is not None or end_line is not None
+        start_line = start_line or 1
+        if offset < 0 or length <= 0 or start_line < 1 or (end_line is not None and end_line < start_line):
+            raise FilesystemOperationError(
+                "Invalid range: offset must be >= 0, length > 0, and 1 <= start_line <= end_line"
+            )
+
+        try:
+            if not file_path.exists():
+                raise FilesystemOperationError(f"File does not exist: {file_path}")
+            if not file_path.is_file():
+                raise FilesystemOperationError(f"Path is not a file: {file_path}")
+
+            with open(file_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if line_mode:
+                    start = self._line_offset(f, start_line, file_path, file_size)
+                    if start is None:
+                        start = file_size
+                else:
+                    start = min(offset, file_size)
+                f.seek(start)
+                raw = f.read(length)
+
+            if not line_mode and codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig'):
+                # Skip the tail of a character that started before the offset
+                skip = 0
+                while skip < min(3, len(raw)) and 0x80 <= raw[skip] <= 0xBF:
+                    skip += 1
+                raw = raw[skip:]
+                start += skip
+
+            at_eof = start + len(raw) >= file_size
+            line_boundary = True
+            if line_mode:
+                wanted = None if end_line is None else end_line - start_line + 1
+                cut = nth_newline(raw, wanted) if wanted is not None else -1
+                if cut >= 0:
+                    raw = raw[:cut + 1]
+                    at_eof = start + len(raw) >= file_size
+                elif not at_eof:
+                    last = raw.rfind(b'\n')
+                    if last >= 0:
+                        raw = raw[:last + 1]
+                    else:
+                        # A single line longer than length: return part of it
+                        line_boundary = False
+
+            content, consumed = _decode_chunk(raw, encoding, final=at_eof)
+            end = start + consumed
+            done = end >= file_size or (line_mode and end_line is not None and line_boundary
+                                        and raw.count(b'\n') >= end_line - start_line + 1)
+
+            result: Dict[str, Any] = {
+                'content': content,
+                'offset': start,
+                'end_offset': end,
+                'file_size': file_size,
+                'next_offset': None if done else end,
+            }
+            if line_mode:
+                lines_read = raw.count(b'\n') + (1 if raw and not raw.endswith(b'\n') and line_boundary else 0)
+                result['start_line'] = start_line
+                result['end_line'] = start_line + lines_read - 1 if lines_read else None
+                result['next_line'] = None if done or not line_boundary else start_line + raw.count(b'\n')
+            logger.info(f"File range read: {file_path} (bytes {start}-{end} of {file_size})")
+            return result
+
+        except FilesystemOperationError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to read file {file_path}: {e}")
+            raise FilesystemOperationError(f"Failed to read file: {e}")
+
+    def tail_file(self, file_path: Union[str, Path], lines: int = DEFAULT_TAIL_LINES, cursor: Optional[str] = None,
+                  encoding: str = 'utf-8', max_bytes: int = DEFAULT_READ_LENGTH * 100) -> Dict[str, Any]:
+        """Return the end of a file, or what was appended since ``cursor``.
+
+        Without a cursor, the last ``lines`` lines are found by scanning
+        backward from EOF in blocks. With the ``cursor`` of a previous call
+        (``"<inode>:<offset>"``), only bytes written after that offset are
+        read, so each poll costs as much as the new data. If the file was
+        replaced (rotated) or truncated, reading restarts at its beginning.
+        At most ``max_bytes`` are returned per call, ending on a complete
+        line where possible; ``more`` tells whether data is left.
+        """
+        file_path = Path(file_path)
+        self._validate_file_operation(file_path, 'read')
+        if lines < 0 or max_bytes <= 0:
+            raise FilesystemOperationError("lines must be >= 0 and max_bytes > 0")
+
+        try:
+            if not file_path.is_file():
+                raise FilesystemOperationError(f"File does not exist: {file_path}")
+
+            with open(file_path, 'rb') as f:
+                stat = os.fstat(f.fileno())
+                file_size = stat.st_size
+                rotated = truncated = False
+                if cursor:
+                    inode, offset = self._parse_tail_cursor(cursor)
+                    if inode != stat.st_ino:
+                        rotated, offset = True, 0
+                    elif offset > file_size:
+                        truncated, offset = True, 0
+                    start = offset
+                else:
+                    start = self._tail_start(f, file_size, lines, max_bytes)
+
+                f.seek(start)
+                raw = f.read(min(file_size - start, max_bytes))
+
+            more = start + len(raw) < file_size
+            if more:
+                # Stop at the last complete line unless a single line fills the chunk
+                last = raw.rfind(b'\n')
+                if last >= 0:
+                    raw = raw[:last + 1]
+            content, consumed = _decode_chunk(raw, encoding, final=not more)
+            end = start + consumed
+
+            logger.info(f"File tail read: {file_path} (bytes {start}-{end} of {file_size})")
+            return {
+                'content': content,
+                'offset': start,
+                'end_offset': end,
+                'file_size': file_size,
+                'cursor': f"{stat.st_ino}:{end}",
+                'more': end < file_size,
+                'rotated': rotated,
+                'truncated': truncated,
+            }
+
+        except FilesystemOperationError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to tail file {file_path}: {e}")
+            raise FilesystemOperationError(f"Failed to tail file: {e}")
+
+    @staticmethod
+    def _parse_tail_cursor(cursor: str) -> Tuple[int, int]:
+        try:
+            inode, offset = cursor.strip().split(':')
+            return int(inode), int(offset)
+        except ValueError:
+            raise FilesystemOperationError(f"Invalid tail cursor: {cursor!r} (expected '<inode>:<offset>')")
+
+    @staticmethod
+    def _tail_start(f: IO[bytes], file_size: int, lines: int, max_bytes: int) -> int:
+        """Byte offset of the last ``lines`` lines, scanning backward from EOF."""
+        if lines == 0:
+            return file_size
+        position = file_size
+        if file_size:
+            f.seek(file_size - 1)
+            if f.read(1) == b'\n':
+                # The final newline ends the last line; it does not start another
+                position -= 1
+        remaining = lines
+        limit = max(0, file_size - max_bytes)
+        while position > limit:
+            block_start = max(limit, position - _TAIL_BLOCK_SIZE)
+            f.seek(block_start)
+            block = f.read(position - block_start)
+            newlines = block.count(b'\n')
+            if newlines >= remaining:
+                index = len(block)
+                for _ in range(remaining):
+                    index = block.rfind(b'\n', 0, index)
+                return block_start + index + 1
+            remaining -= newlines
+            position = block_start
+        if limit == 0:
+            return 0
+        # The lines do not fit in max_bytes: start at the first full line inside the limit
+        f.seek(limit - 1)
+        block = f.read(min(file_size - limit + 1, _TAIL_BLOCK_SIZE))
+        first = block.find(b'\n')
+        return limit + first if first >= 0 else limit
+
+    def _line_offset(self, f: IO[bytes], line: int, file_path: Path, file_size: int) -> Optional[int]:
+        """Byte offset where 1-based ``line`` starts, or None past the end of the file.
+
+        Files of at least FS_LINE_INDEX_MIN_SIZE bytes go through the sparse
+        line index, so only the lines after the nearest checkpoint are
+        scanned; smaller files are scanned from the start.
+        """
+        if line <= 1:
+            return 0
+        if self._line_index is not None and file_size >= get_config().filesystem.line_index_min_size:
+            return self._line_index.locate(str(file_path.resolve()), f, line)
+
+        remaining = line - 1
+        position = 0
+        f.seek(0)
+        while True:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                return None
+            newlines = block.count(b'\n')
+            if newlines >= remaining:
+                return position + nth_newline(block, remaining) + 1
+            remaining -= newlines
+            position += len(block)
+
     def write_file(self, file_path: Union[str, Path], content: str, encoding: str = 'utf-8', create_dirs: bool = True) -> None:
         """Write content to file."""
         file_path = Path(file_path)
@@ -274,56 +554,72 @@ class FilesystemManager:
     
     def list_directory(self, dir_path: Union[str, Path], recursive: bool = False) -> List[Dict[str, Any]]:
         """List directory contents."""
+        items = list(self.iter_directory(dir_path, max_depth=None if recursive else 1))
+        logger.info(f"Directory listed successfully: {dir_path} ({len(items)} items)")
+        return items
+
+    def iter_directory(self, dir_path: Union[str, Path], max_depth: Optional[int] = 1,
+                       include: Optional[List[str]] = None, exclude: Optional[List[str]] = None,
+                       cursor: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the entries under a directory one at a time.
+
+        The tree is walked with ``os.scandir`` depth-first in name order, so
+        the order is stable across calls; with FS_WALK_WORKERS > 1 upcoming
+        subdirectories are listed in parallel (for network shares). Entry types come from the
+        directory listing and each entry is stat'ed at most once. ``max_depth`` limits
+        the levels walked (1 = direct children, None = unlimited).
+        ``include`` globs select the entries yielded, ``exclude`` globs skip
+        entries and the directories below them; globs containing ``/`` match
+        the path relative to ``dir_path``, others the entry name. Pass the
+        ``relative_path`` of the last entry seen as ``cursor`` to continue
+        right after it. Symbolic links and junctions to directories are not
+        followed.
+        """
         dir_path = Path(dir_path)
         self._validate_file_operation(dir_path, 'read')
-        
-        try:
-            if not dir_path.exists():
-                raise FilesystemOperationError(f"Directory does not exist: {dir_path}")
-            
-            if not dir_path.is_dir():
-                raise FilesystemOperationError(f"Path is not a directory: {dir_path}")
-            
-            items = []
-            
-            if recursive:
-                for item in dir_path.rglob('*'):
-                    if self._is_path_allowed(item):
-                        items.append(self._get_file_info(item))
-            else:
-                for item in dir_path.iterdir():
-                    if self._is_path_allowed(item):
-                        items.append(self._get_file_info(item))
-            
-            logger.info(f"Directory listed successfully: {dir_path} ({len(items)} items)")
-            return items
-            
-        except Exception as e:
-            logger.error(f"Failed to list directory {dir_path}: {e}")
-            raise FilesystemOperationError(f"Failed to list directory: {e}")
-    
-    def _get_file_info(self, file_path: Path) -> Dict[str, Any]:
-        """Get file information."""
+        if not dir_path.exists():
+            raise FilesystemOperationError(f"Directory does not exist: {dir_path}")
+        if not dir_path.is_dir():
+            raise FilesystemOperationError(f"Path is not a directory: {dir_path}")
+        if max_depth is not None and max_depth < 1:
+            raise FilesystemOperationError("max_depth must be at least 1")
+        restricted = not get_config().filesystem.is_full_access_mode
+
+        def skip(entry: os.DirEntry) -> bool:
+            # Everything below an allowed directory is allowed, except where a symlink,
+            # junction or other reparse point leads
+            return restricted and is_reparse_point(entry) and not self._is_path_allowed(entry.path)
+
+        walk = self._walker.walk(str(dir_path), max_depth, include, exclude,
+                                 cursor.strip('/').split('/') if cursor else None, skip)
+        return (self._entry_info(entry, relative) for entry, relative in walk)
+
+    @staticmethod
+    def _entry_info(entry: os.DirEntry, relative: str) -> Dict[str, Any]:
+        """File information from a DirEntry, reusing its cached type and stat."""
         try:
-            stat = file_path.stat()
+            is_dir = entry.is_dir(follow_symlinks=False)
+            stat = entry.stat(follow_symlinks=False)
             return {
-                'name': file_path.name,
-                'path': str(file_path),
-                'type': 'directory' if file_path.is_dir() else 'file',
+                'name': entry.name,
+                'path': entry.path,
+                'relative_path': relative,
+                'type': 'directory' if is_dir else 'file',
                 'size': stat.st_size,
                 'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
                 'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                'extension': file_path.suffix.lower() if file_path.is_file() else None,
+                'extension': None if is_dir else os.path.splitext(entry.name)[1].lower(),
             }
-        except Exception as e:
-            logger.warning(f"Failed to get file info for {file_path}: {e}")
+        except OSError as e:
+            logger.warning(f"Failed to get file info for {entry.path}: {e}")
             return {
-                'name': file_path.name,
-                'path': str(file_path),
+                'name': entry.name,
+                'path': entry.path,
+                'relative_path': relative,
                 'type': 'unknown',
                 'error': str(e)
             }
-    
+
     def create_directory(self, dir_path: Union[str, Path], parents: bool = True) -> None:
         """Create directory."""
         dir_path = Path(dir_path)
@@ -337,6 +633,239 @@ class FilesystemManager:
             logger.error(f"Failed to create directory {dir_path}: {e}")
             raise FilesystemOperationError(f"Failed to create directory: {e}")
     
+    def open_records(self, file_path: Union[str, Path], file_format: Optional[str] = None,
+                     encoding: str = 'utf-8') -> Tuple[List[str], Iterator[List[Any]]]:
+        """Open a CSV or JSONL file as ``(columns, rows)`` for streaming.
+
+        CSV files must start with a header line; empty fields become None.
+        JSONL files hold one object per line; columns come from the first
+        object. Rows are read lazily and the file is closed once they are
+        exhausted.
+        """
+        file_path = Path(file_path)
+        self._validate_file_operation(file_path, 'read')
+
+        file_format = (file_format or file_path.suffix.lstrip('.')).lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in ('csv', 'jsonl'):
+            raise FilesystemOperationError(f"Unsupported record file format: {file_format or 'unknown'} (use csv or jsonl)")
+
+        if not file_path.is_file():
+            raise FilesystemOperationError(f"File does not exist: {file_path}")
+
+        config = get_config()
+        file_size = file_path.stat().st_size
+        if file_size > config.filesystem.max_file_size:
+            raise FilesystemOperationError(
+                f"File too large: {file_size} bytes (max: {config.filesystem.max_file_size})"
+            )
+
+        f = open(file_path, 'r', encoding=encoding, newline='')
+        try:
+            if file_format == 'csv':
+                reader = csv.reader(f)
+                columns = next(reader, None)
+                if not columns:
+                    raise FilesystemOperationError(f"CSV file has no header line: {file_path}")
+                rows = ([value if value != '' else None for value in row] for row in reader if row)
+            else:
+                records = (json.loads(line) for line in f if line.strip())
+                first = next(records, None)
+                if first is None:
+                    raise FilesystemOperationError(f"JSONL file is empty: {file_path}")
+                if not isinstance(first, dict):
+                    raise FilesystemOperationError(f"JSONL lines must be objects: {file_path}")
+                columns = list(first.keys())
+                rows = (self._record_values(record, columns) for record in chain([first], records))
+        except Exception:
+            f.close()
+            raise
+
+        logger.info(f"Opened {file_format} records: {file_path} ({len(columns)} columns)")
+        return columns, self._closing_iter(f, rows)
+
+    @staticmethod
+    def _record_values(record: Dict[str, Any], columns: List[str]) -> List[Any]:
+        """Pick column values from a JSON object; nested values are kept as JSON text."""
+        values = []
+        for column in columns:
+            value = record.get(column)
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, ensure_ascii=False)
+            values.append(value)
+        return values
+
+    @staticmethod
+    def _closing_iter(f: IO, rows: Iterator[List[Any]]) -> Iterator[List[Any]]:
+        try:
+            yield from rows
+        finally:
+            f.close()
+
+    def write_records(self, file_path: Union[str, Path], batches: Iterable[Tuple[List[str], Sequence[Sequence[Any]]]],
+                      file_format: Optional[str] = None, compression: Optional[str] = None,
+                      encoding: str = 'utf-8', overwrite: bool = False) -> Dict[str, Any]:
+        """Stream ``(columns, rows)`` batches into a CSV, JSONL or Parquet file.
+
+        Only one batch is held in memory at a time (Parquet buffers up to one
+        row group). CSV/JSONL can be gzip or zstd compressed as a whole;
+        Parquet uses the codec inside the file. The data goes to a temporary
+        file next to the target, renamed into place once complete, and the
+        export is aborted once it grows past FS_MAX_FILE_SIZE.
+        """
+        file_path = Path(file_path)
+        self._validate_file_operation(file_path, 'write')
+
+        suffixes = [suffix.lower() for suffix in file_path.suffixes]
+        if compression is None and suffixes and suffixes[-1] in _COMPRESSION_SUFFIXES:
+            compression = _COMPRESSION_SUFFIXES[suffixes[-1]]
+        compression = (compression or 'none').lower()
+        if compression not in EXPORT_COMPRESSIONS:
+            raise FilesystemOperationError(f"Unsupported compression: {compression} (use {', '.join(EXPORT_COMPRESSIONS)})")
+        if file_format is None:
+            data_suffixes = [suffix for suffix in suffixes if suffix not in _COMPRESSION_SUFFIXES]
+            file_format = data_suffixes[-1].lstrip('.') if data_suffixes else ''
+        file_format = file_format.lower()
+        if file_format == 'ndjson':
+            file_format = 'jsonl'
+        if file_format not in EXPORT_FORMATS:
+            raise FilesystemOperationError(f"Unsupported export format: {file_format or 'unknown'} (use {', '.join(EXPORT_FORMATS)})")
+
+        if file_path.exists() and not overwrite:
+            raise FilesystemOperationError(f"File already exists: {file_path} (set overwrite to replace it)")
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        max_size = get_config().filesystem.max_file_size
+        # A unique temporary file per call, so concurrent exports to one target never share it
+        fd, temp_name = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+        temp_path = Path(temp_name)
+        start = time.perf_counter()
+        rows_written = 0
+        try:
+            with open(fd, 'wb') as raw:
+                def check_size() -> None:
+                    if raw.tell() > max_size:
+                        raise FilesystemOperationError(f"Export exceeds the maximum file size of {max_size} bytes")
+
+                if file_format == 'parquet':
+                    rows_written = self._write_parquet(raw, batches, compression, check_size)
+                else:
+                    with self._open_text_sink(raw, compression, encoding) as sink:
+                        write_batch = self._csv_writer(sink) if file_format == 'csv' else self._jsonl_writer(sink)
+                        for columns, rows in batches:
+                            write_batch(columns, rows)
+                            rows_written += len(rows)
+                            check_size()
+                size = raw.tell()
+            os.replace(temp_path, file_path)
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            logger.error(f"Failed to export records to {file_path}: {e}")
+            if isinstance(e, (FilesystemOperationError, FilesystemSecurityError)):
+                raise
+            raise FilesystemOperationError(f"Failed to export records: {e}") from e
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Exported {rows_written} rows to {file_path} ({size} bytes, {file_format}, {compression})")
+        return {
+            'path': str(file_path),
+            'file_format': file_format,
+            'compression': compression,
+            'rows_written': rows_written,
+            'bytes_written': size,
+            'elapsed_seconds': elapsed,
+            'rows_per_second': rows_written / elapsed if elapsed > 0 else 0.0,
+            'bytes_per_second': size / elapsed if elapsed > 0 else 0.0,
+        }
+
+    @staticmethod
+    def _open_text_sink(raw: IO[bytes], compression: str, encoding: str) -> IO[str]:
+        if compression == 'gzip':
+            stream = gzip.GzipFile(fileobj=raw, mode='wb')
+        elif compression == 'zstd':
+            try:
+                import zstandard
+            except ImportError as e:
+                raise FilesystemOperationError(
+                    f"zstd compression needs zstandard ({e}); install it with: pip install mcp-sqlserver-filesystem[export]"
+                ) from e
+            stream = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+        else:
+            stream = _NonClosingWriter(raw)
+        return io.TextIOWrapper(stream, encoding=encoding, newline='')
+
+    @staticmethod
+    def _csv_writer(sink: IO[str]):
+        writer = csv.writer(sink, lineterminator='\n')
+        header_written = False
+
+        def write_batch(columns: List[str], rows: Sequence[Sequence[Any]]) -> None:
+            nonlocal header_written
+            if not header_written:
+                writer.writerow(columns)
+                header_written = True
+            writer.writerows([text_value(value) for value in row] for row in rows)
+        return write_batch
+
+    @staticmethod
+    def _jsonl_writer(sink: IO[str]):
+        encoder = json.JSONEncoder(ensure_ascii=False, default=json_default)
+
+        def write_batch(columns: List[str], rows: Sequence[Sequence[Any]]) -> None:
+            keys = unique_columns(columns)
+            sink.write(''.join([encoder.encode(dict(zip(keys, row))) + '\n' for row in rows]))
+        return write_batch
+
+    @staticmethod
+    def _write_parquet(raw: IO[bytes], batches: Iterable[Tuple[List[str], Sequence[Sequence[Any]]]],
+                       compression: str, check_size) -> int:
+        pa = import_pyarrow("Parquet export")
+        import pyarrow.parquet as pq
+
+        writer = None
+        schema = None
+        pending: List[Any] = []
+        pending_rows = 0
+        rows_written = 0
+
+        def flush() -> None:
+            nonlocal pending, pending_rows
+            if pending:
+                writer.write_table(pa.Table.from_batches(pending, schema=schema))
+                pending, pending_rows = [], 0
+                check_size()
+
+        try:
+            for columns, rows in batches:
+                if schema is None:
+                    arrays = [arrow_array(pa, [row[i] for row in rows]) for i in range(len(columns))]
+                    # Columns that are all NULL in the first batch are written as text
+                    schema = pa.schema([
+                        pa.field(name, pa.string() if pa.types.is_null(array.type) else array.type)
+                        for name, array in zip(columns, arrays)
+                    ])
+                    arrays = [array.cast(field.type) if pa.types.is_null(array.type) else array
+                              for array, field in zip(arrays, schema)]
+                    writer = pq.ParquetWriter(raw, schema, compression=_PARQUET_CODECS[compression])
+                else:
+                    arrays = [arrow_array(pa, [row[i] for row in rows], type=field.type)
+                              for i, field in enumerate(schema)]
+                pending.append(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                pending_rows += len(rows)
+                rows_written += len(rows)
+                if pending_rows >= _PARQUET_ROW_GROUP_SIZE:
+                    flush()
+            if writer is not None:
+                flush()
+            else:
+                # No rows: still leave a readable (empty) Parquet file
+                pq.write_table(pa.table({}), raw)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows_written
+
     def delete_file(self, file_path: Union[str, Path]) -> None:
         """Delete file."""
         file_path = Path(file_path)
@@ -0,0 +1,208 @@
+"""Result set encodings for MCP tool output."""
+
+import base64
+import csv
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Sequence
+
+# Encodings accepted by the `format` tool argument
+DEFAULT_FORMAT = "table"
+FORMATS = ("table", "csv", "jsonl", "markdown", "arrow-ipc")
+
+
+class FormatError(ValueError):
+    """Raised for unknown formats or when a format's dependency is missing."""
+    pass
+
+
+def _format_binary(value: bytes) -> str:
+    # SQL Server's own literal form for binary/varbinary values
+    return "0x" + bytes(value).hex().upper()
+
+
+def text_value(value: Any) -> str:
+    """Render one value as text without losing precision.
+
+    Decimals keep every digit, date/time values use ISO 8601 and binary
+    values are written as ``0x`` hex; NULL becomes an empty string.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _format_binary(value)
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+def json_default(value: Any) -> Any:
+    """``json.dumps`` fallback for driver types JSON has no literal for.
+
+    Decimals are emitted as strings so no precision is lost to float.
+    """
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _format_binary(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return str(value)
+
+
+def unique_columns(columns: Sequence[str]) -> List[str]:
+    """Column names usable as JSON object keys.
+
+    Repeated names (``SELECT a.id, b.id``) get a ``_2``, ``_3``... suffix
+    and unnamed expressions become ``column_<position>``, so no value is
+    lost when a row is turned into an object.
+    """
+    seen = set(columns)
+    names: List[str] = []
+    used = set()
+    for position, column in enumerate(columns, 1):
+        name = column or f"column_{position}"
+        if name in used:
+            suffix = 2
+            while f"{name}_{suffix}" in used or f"{name}_{suffix}" in seen:
+                suffix += 1
+            name = f"{name}_{suffix}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _format_table(columns: Sequence[str], rows: Sequence[Sequence[Any]], out: io.StringIO) -> None:
+    if not columns:
+        return
+    header = " | ".join(columns)
+    out.write(header)
+    out.write("\n")
+    out.write("-" * len(header))
+    out.write("\n")
+    for row in rows:
+        out.write(" | ".join(["NULL" if value is None else text_value(value) for value in row]))
+        out.write("\n")
+
+
+def _format_csv(columns: Sequence[str], rows: Sequence[Sequence[Any]], out: io.StringIO) -> None:
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows([text_value(value) for value in row] for row in rows)
+
+
+def _format_jsonl(columns: Sequence[str], rows: Sequence[Sequence[Any]], out: io.StringIO) -> None:
+    encoder = json.JSONEncoder(ensure_ascii=False, default=json_default)
+    keys = unique_columns(columns)
+    for row in rows:
+        out.write(encoder.encode(dict(zip(keys, row))))
+        out.write("\n")
+
+
+def _markdown_cell(value: Any) -> str:
+    text = "NULL" if value is None else text_value(value)
+    return text.replace("\\", "\\\\").replace("|", "\\|").replace("\r\n", "<br>").replace("\n", "<br>")
+
+
+def _format_markdown(columns: Sequence[str], rows: Sequence[Sequence[Any]], out: io.StringIO) -> None:
+    out.write("| " + " | ".join(_markdown_cell(column) for column in columns) + " |\n")
+    out.write("|" + "---|" * len(columns) + "\n")
+    for row in rows:
+        out.write("| " + " | ".join([_markdown_cell(value) for value in row]) + " |\n")
+
+
+def import_pyarrow(feature: str):
+    """Import pyarrow, raising FormatError with an install hint if it is missing."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise FormatError(
+            f"{feature} needs pyarrow ({e}); install it with: pip install mcp-sqlserver-filesystem[arrow]"
+        ) from e
+    return pa
+
+
+def arrow_array(pa, values: list, type=None):
+    """Build an Arrow array, inferring the type unless ``type`` is given."""
+    if type is not None and pa.types.is_string(type):
+        return pa.array([None if value is None else text_value(value) for value in values], type=type)
+    try:
+        return pa.array(values, type=type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        if type is not None:
+            raise
+        # Mixed or unsupported types (e.g. sql_variant, UUID): keep them as text
+        return pa.array([None if value is None else text_value(value) for value in values], type=pa.string())
+
+
+def _format_arrow_ipc(columns: Sequence[str], rows: Sequence[Sequence[Any]], out: io.StringIO) -> None:
+    pa = import_pyarrow("The arrow-ipc format")
+    arrays = [arrow_array(pa, [row[i] for row in rows]) for i in range(len(columns))]
+    table = pa.Table.from_arrays(arrays, names=list(columns))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    out.write(base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii"))
+
+
+_FORMATTERS: Dict[str, Callable[[Sequence[str], Sequence[Sequence[Any]], io.StringIO], None]] = {
+    "table": _format_table,
+    "csv": _format_csv,
+    "jsonl": _format_jsonl,
+    "markdown": _format_markdown,
+    "arrow-ipc": _format_arrow_ipc,
+}
+
+
+def check_format(fmt: str) -> str:
+    """Normalize a format name, raising FormatError for unknown ones."""
+    name = (fmt or DEFAULT_FORMAT).strip().lower()
+    if name not in _FORMATTERS:
+        raise FormatError(f"Unknown format '{fmt}'. Supported formats: {', '.join(FORMATS)}")
+    return name
+
+
+def format_rows(columns: Sequence[str], rows: Sequence[Sequence[Any]], fmt: str = DEFAULT_FORMAT) -> str:
+    """Encode a result set in one of FORMATS.
+
+    ``table``: the human-readable ``a | b`` layout; ``csv``: RFC 4180 with a
+    header row; ``jsonl``: one JSON object per row; ``markdown``: a GFM
+    table; ``arrow-ipc``: an Arrow IPC stream, base64 encoded (needs
+    pyarrow). Everything is written into a single buffer.
+    """
+    out = io.StringIO()
+    _FORMATTERS[check_format(fmt)](columns, rows, out)
+    return out.getvalue()
+
+
+def format_details(details: Dict[str, Any], fmt: str = DEFAULT_FORMAT) -> str:
+    """Render an ``execute_with_details`` response: its message followed by
+    the returned rows, or the affected (and, for UPDATE, updated) records,
+    each encoded with ``format_rows``."""
+    out = io.StringIO()
+    out.write(details.get('message', ''))
+    sections = []
+    if details.get('type') == 'select':
+        sections.append((None, details.get('columns', []), details.get('rows', [])))
+    elif 'affected_records' in details:
+        columns = details.get('affected_columns', [])
+        if 'updated_records' in details:
+            sections.append(("Before", columns, details['affected_records']))
+            sections.append(("After", columns, details['updated_records']))
+        else:
+            sections.append((None, columns, details['affected_records']))
+    for title, columns, rows in sections:
+        out.write("\n\n")
+        if title:
+            out.write(f"{title}:\n")
+        out.write(format_rows(columns, rows, fmt))
+    return out.getvalue()
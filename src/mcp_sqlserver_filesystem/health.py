@@ -0,0 +1,169 @@
+"""Circuit breaker and background health checking for MCP server."""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# First retry delay after a failed health check; doubles up to the maximum backoff
+_INITIAL_BACKOFF = 1.0
+
+
+class CircuitBreaker:
+    """Fails fast after repeated connection failures.
+
+    ``closed``: calls go through. After ``failure_threshold`` consecutive
+    failures the breaker opens and calls are rejected. Once
+    ``reset_timeout`` seconds have passed it becomes ``half_open`` and lets
+    one trial call through: success closes it, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.trips = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = 'half_open'
+        return self._state
+
+    def is_open(self) -> bool:
+        """Whether calls are currently rejected outright."""
+        return self.state == 'open'
+
+    def allow_request(self) -> bool:
+        """Return whether a call may proceed, claiming the trial slot when half-open."""
+        with self._lock:
+            state = self._current_state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != 'closed':
+                logger.info("Circuit breaker closed: database calls succeed again")
+            self._state = 'closed'
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: str) -> bool:
+        """Count a connection failure; return True if this opened the breaker."""
+        with self._lock:
+            self.last_error = error
+            self._failures += 1
+            self._trial_in_flight = False
+            state = self._current_state()
+            if state == 'half_open' or (state == 'closed' and self._failures >= self.failure_threshold):
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+                self.trips += 1
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial call is allowed (0 unless open)."""
+        with self._lock:
+            if self._current_state() != 'open':
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._current_state(),
+                'consecutive_failures': self._failures,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'last_error': self.last_error,
+            }
+
+
+class HealthChecker:
+    """Runs ``check`` on a daemon thread: every ``interval`` seconds while it
+    succeeds, and with exponential backoff (1s doubling up to
+    ``max_backoff``) while it fails."""
+
+    def __init__(self, check: Callable[[], bool], interval: float, max_backoff: float = 60.0,
+                 name: str = "db-health"):
+        self._check = check
+        self.interval = interval
+        self.max_backoff = max(max_backoff, _INITIAL_BACKOFF)
+        self._name = name
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._backoff = _INITIAL_BACKOFF
+        self.healthy = True
+        self.checks = 0
+        self.failures = 0
+        self.last_check: Optional[float] = None
+
+    def start(self, healthy: bool = True) -> None:
+        if self._thread is not None:
+            return
+        self.healthy = healthy
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        """Run the next check now instead of waiting for the current delay."""
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _next_delay(self) -> float:
+        return self.interval if self.healthy else min(self._backoff, self.max_backoff)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._next_delay())
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            try:
+                ok = self._check()
+            except Exception as e:
+                logger.warning(f"Health check raised an error: {e}")
+                ok = False
+            self.checks += 1
+            self.last_check = time.time()
+            if ok:
+                self.healthy = True
+                self._backoff = _INITIAL_BACKOFF
+            else:
+                if not self.healthy:
+                    self._backoff = min(self._backoff * 2, self.max_backoff)
+                self.healthy = False
+                self.failures += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'healthy': self.healthy,
+            'interval': self.interval,
+            'next_retry_in': None if self.healthy else min(self._backoff, self.max_backoff),
+            'checks': self.checks,
+            'failures': self.failures,
+            'last_check': self.last_check,
+        }
@@ -0,0 +1,206 @@
+"""Sparse line-offset index for random line access in large text files."""
+
+import logging
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from typing import IO, Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Block size used when scanning a file for newlines
+SCAN_BLOCK_SIZE = 1024 * 1024
+# Bytes counted at a time when skipping over many lines
+_COUNT_WINDOW = 8192
+# Bytes before the indexed end kept to recognize an appended (not rewritten) file
+_SAMPLE_SIZE = 64
+
+
+def nth_newline(data: bytes, n: Optional[int], start: int = 0) -> int:
+    """Index of the n-th (1-based) newline in ``data`` from ``start``, or -1 if there are fewer."""
+    if not n:
+        return -1
+    # Skip whole windows by counting, then find the remaining newlines one by one
+    position, end = start, len(data)
+    while position < end:
+        count = data.count(b'\n', position, position + _COUNT_WINDOW)
+        if count >= n:
+            break
+        n -= count
+        position += _COUNT_WINDOW
+    else:
+        return -1
+    index = position - 1
+    for _ in range(n):
+        index = data.find(b'\n', index + 1)
+    return index
+
+
+class LineIndex:
+    """Byte offsets of every ``stride``-th line of one file.
+
+    ``checkpoints[k]`` is where line ``k * stride + 1`` starts. The file is
+    scanned lazily, only as far as the lines asked for, and scanning resumes
+    where it stopped, so the index of a growing log is extended instead of
+    rebuilt.
+    """
+
+    def __init__(self, stride: int, mtime_ns: int, size: int):
+        self.stride = stride
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checkpoints = array('Q', [0])
+        # Everything before scanned_to has been scanned; it is the start of line newlines_before + 1
+        self.scanned_to = 0
+        self.newlines_before = 0
+        self.sample = b''
+        self.lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self.checkpoints.itemsize * len(self.checkpoints) + len(self.sample) + 128
+
+    def _extend(self, f: IO[bytes], target_newlines: int) -> None:
+        """Scan forward until ``target_newlines`` newlines are indexed or the file ends."""
+        f.seek(self.scanned_to)
+        position = self.scanned_to
+        while self.newlines_before < target_newlines:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+            base = self.newlines_before
+            count = block.count(b'\n')
+            # Newlines of this block to take: the j-th one is newline number base + j
+            take = min(count, target_newlines - base)
+            taken, index = 0, -1
+            next_checkpoint = (base // self.stride + 1) * self.stride
+            while next_checkpoint - base <= take:
+                index = nth_newline(block, next_checkpoint - base - taken, index + 1)
+                taken = next_checkpoint - base
+                self.checkpoints.append(position + index + 1)
+                next_checkpoint += self.stride
+            if take == count:
+                index = block.rfind(b'\n')
+            elif take > taken:
+                index = nth_newline(block, take - taken, index + 1)
+            self.newlines_before = base + take
+            if index >= 0:
+                self.scanned_to = position + index + 1
+            position += len(block)
+        if self.scanned_to:
+            f.seek(max(0, self.scanned_to - _SAMPLE_SIZE))
+            self.sample = f.read(min(_SAMPLE_SIZE, self.scanned_to))
+
+    def locate(self, f: IO[bytes], line: int) -> Optional[int]:
+        """Byte offset where 1-based ``line`` starts, or None past the end of the file."""
+        wanted = line - 1
+        with self.lock:
+            if wanted > self.newlines_before:
+                self._extend(f, wanted)
+            if wanted > self.newlines_before:
+                return None
+            k = wanted // self.stride
+            offset, skip = self.checkpoints[k], wanted - k * self.stride
+        if skip == 0:
+            return offset
+        # Fewer than `stride` lines past the checkpoint, all inside the scanned range
+        f.seek(offset)
+        position = offset
+        while True:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                # The file was truncated or rewritten after it was indexed
+                return None
+            newlines = block.count(b'\n')
+            if newlines >= skip:
+                return position + nth_newline(block, skip) + 1
+            skip -= newlines
+            position += len(block)
+
+    def still_matches(self, f: IO[bytes]) -> bool:
+        """Whether the indexed prefix of the file is unchanged (for appended files)."""
+        if not self.sample:
+            return True
+        f.seek(self.scanned_to - len(self.sample))
+        return f.read(len(self.sample)) == self.sample
+
+
+class LineIndexCache:
+    """LRU cache of LineIndex objects per file, bounded by total index size.
+
+    An index is only valid for the (mtime, size) it was built for. In
+    ``append_only`` mode a file that only grew, with its indexed prefix
+    unchanged, keeps its index and extends it on the next read.
+    """
+
+    def __init__(self, stride: int = 1000, max_bytes: int = 16 * 1024 * 1024, append_only: bool = False):
+        self.stride = stride
+        self.max_bytes = max_bytes
+        self.append_only = append_only
+        self._entries: "OrderedDict[str, LineIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.extended = 0
+        self.evictions = 0
+
+    def get(self, path: str, f: IO[bytes]) -> LineIndex:
+        """Return the index for the open file ``f`` at ``path``, creating it if needed."""
+        stat = os.fstat(f.fileno())
+        with self._lock:
+            index = self._entries.get(path)
+            if index is not None:
+                if index.mtime_ns == stat.st_mtime_ns and index.size == stat.st_size:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return index
+                if self.append_only and stat.st_size >= index.size and index.still_matches(f):
+                    index.mtime_ns, index.size = stat.st_mtime_ns, stat.st_size
+                    self._entries.move_to_end(path)
+                    self.extended += 1
+                    return index
+                del self._entries[path]
+            self.misses += 1
+            index = LineIndex(self.stride, stat.st_mtime_ns, stat.st_size)
+            self._entries[path] = index
+            self._evict()
+        return index
+
+    def locate(self, path: str, f: IO[bytes], line: int) -> Optional[int]:
+        """Byte offset where 1-based ``line`` of the open file ``f`` starts (see LineIndex.locate).
+
+        Scanning may grow the index, so the size budget is enforced again afterwards.
+        """
+        index = self.get(path, f)
+        before = index.nbytes
+        offset = index.locate(f, line)
+        if index.nbytes > before:
+            with self._lock:
+                self._evict()
+        return offset
+
+    def _evict(self) -> None:
+        total = sum(index.nbytes for index in self._entries.values())
+        while total > self.max_bytes and self._entries:
+            _, index = self._entries.popitem(last=False)
+            total -= index.nbytes
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'files': len(self._entries),
+                'bytes': sum(index.nbytes for index in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'stride': self.stride,
+                'append_only': self.append_only,
+                'hits': self.hits,
+                'misses': self.misses,
+                'extended': self.extended,
+                'evictions': self.evictions,
+            }
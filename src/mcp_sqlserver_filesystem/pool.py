@@ -0,0 +1,214 @@
+"""Connection pool instrumentation and adaptive sizing for MCP server."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# How often the adaptive mode re-evaluates the number of idle connections kept
+_ADAPT_INTERVAL = 60.0
+
+
+class PoolMonitor:
+    """Collects pool telemetry from SQLAlchemy pool events.
+
+    The monitor also replaces ``pool_pre_ping``: connections are pinged on
+    checkout with a timed ``SELECT 1``, except brand-new ones and, when
+    ``ping_skip_seconds`` is set, ones checked in less than that long ago.
+    In adaptive mode the number of idle connections kept open follows recent
+    peak demand between ``min_size`` and the configured pool size: surplus
+    connections are closed when checked in and reopened on demand. Total
+    capacity (pool size + overflow) never changes.
+    """
+
+    def __init__(self, pool_size: int, max_overflow: int, adaptive: bool = False,
+                 min_size: int = 1, ping_skip_seconds: float = 0.0):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.adaptive = adaptive
+        self.min_size = max(1, min(min_size, pool_size))
+        self.ping_skip_seconds = ping_skip_seconds if adaptive else 0.0
+        self._pool = None
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self._open = 0
+        self._idle_limit = pool_size
+        self._peak_checked_out = 0
+        self._window_peak = 0
+        self._last_adapt = time.monotonic()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+        self.pool_timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.pings = 0
+        self.pings_skipped = 0
+        self.ping_failures = 0
+        self.ping_seconds_total = 0.0
+        self.ping_seconds_max = 0.0
+        self.ping_ewma_ms: Optional[float] = None
+        self.resizes = 0
+        self.trimmed = 0
+
+    def attach(self, engine) -> None:
+        """Listen to the pool events of ``engine``.
+
+        Counters are shared by every attached pool, so connections of a
+        replaced engine are still accounted for until they are closed.
+        """
+        from sqlalchemy import event
+
+        pool = engine.pool
+        event.listen(pool, "connect", self._on_connect)
+        event.listen(pool, "checkout", self._on_checkout)
+        event.listen(pool, "checkin", self._on_checkin)
+        event.listen(pool, "invalidate", self._on_invalidate)
+        event.listen(pool, "soft_invalidate", self._on_invalidate)
+        event.listen(pool, "close", self._on_close)
+
+    def activate(self, engine) -> None:
+        """Report pool state (idle slots, overflow) from ``engine``'s pool."""
+        with self._lock:
+            self._pool = engine.pool
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        connection_record.info['fresh'] = True
+        with self._lock:
+            self.connects += 1
+            self._open += 1
+
+    def _on_close(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._open = max(0, self._open - 1)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        if connection_record.info.pop('fresh', False):
+            skip = True
+        else:
+            last_used = connection_record.info.get('last_used')
+            skip = (self.ping_skip_seconds > 0 and last_used is not None
+                    and time.monotonic() - last_used < self.ping_skip_seconds)
+        if skip:
+            with self._lock:
+                self.pings_skipped += 1
+        else:
+            self._ping(dbapi_connection)
+
+        with self._lock:
+            self._checked_out += 1
+            self.checkouts += 1
+            if self._checked_out > self.pool_size:
+                self.overflow_checkouts += 1
+            self._peak_checked_out = max(self._peak_checked_out, self._checked_out)
+            self._window_peak = max(self._window_peak, self._checked_out)
+
+    def _ping(self, dbapi_connection) -> None:
+        start = time.perf_counter()
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            with self._lock:
+                self.ping_failures += 1
+            logger.info(f"Pooled connection failed its ping and will be replaced: {e}")
+            from sqlalchemy.exc import DisconnectionError
+            # The pool discards this connection and retries the checkout with a new one
+            raise DisconnectionError(f"Connection ping failed: {e}") from e
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.pings += 1
+            self.ping_seconds_total += elapsed
+            self.ping_seconds_max = max(self.ping_seconds_max, elapsed)
+            # Recent round-trip latency, used to pick the fastest read replica
+            sample = elapsed * 1000
+            self.ping_ewma_ms = sample if self.ping_ewma_ms is None else 0.8 * self.ping_ewma_ms + 0.2 * sample
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        if connection_record is not None:
+            connection_record.info['last_used'] = time.monotonic()
+        with self._lock:
+            self._checked_out = max(0, self._checked_out - 1)
+            surplus = (self.adaptive and dbapi_connection is not None and connection_record is not None
+                       and self._open - self._checked_out > self._idle_limit)
+            if surplus:
+                self.trimmed += 1
+        if surplus:
+            # Close the DBAPI connection but keep the pool slot; the pool
+            # reconnects transparently the next time the slot is checked out
+            connection_record.info['trimmed'] = True
+            connection_record.invalidate()
+        if self.adaptive:
+            self._maybe_adapt()
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        if connection_record.info.pop('trimmed', False):
+            return
+        with self._lock:
+            self.invalidations += 1
+
+    def record_checkout(self, seconds: float) -> None:
+        """Record how long obtaining a usable connection took (waiting plus ping)."""
+        with self._lock:
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+
+    def record_pool_timeout(self) -> None:
+        with self._lock:
+            self.pool_timeouts += 1
+
+    def _maybe_adapt(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_adapt < _ADAPT_INTERVAL:
+                return
+            self._last_adapt = now
+            target = max(self.min_size, min(self.pool_size, self._window_peak))
+            self._window_peak = self._checked_out
+            if target == self._idle_limit:
+                return
+            previous = self._idle_limit
+            self._idle_limit = target
+            self.resizes += 1
+        logger.info(f"Adaptive pool: keeping up to {target} idle connections open (was {previous})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return current pool state and lifetime counters."""
+        with self._lock:
+            pool = self._pool
+            stats: Dict[str, Any] = {
+                'adaptive': self.adaptive,
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'checked_out': self._checked_out,
+                'peak_checked_out': self._peak_checked_out,
+                'checkouts': self.checkouts,
+                'overflow_checkouts': self.overflow_checkouts,
+                'avg_checkout_ms': self.checkout_seconds_total / self.checkouts * 1000 if self.checkouts else 0.0,
+                'max_checkout_ms': self.checkout_seconds_max * 1000,
+                'pool_timeouts': self.pool_timeouts,
+                'connects': self.connects,
+                'invalidations': self.invalidations,
+                'pings': self.pings,
+                'pings_skipped': self.pings_skipped,
+                'ping_failures': self.ping_failures,
+                'avg_ping_ms': self.ping_seconds_total / self.pings * 1000 if self.pings else 0.0,
+                'max_ping_ms': self.ping_seconds_max * 1000,
+                'recent_ping_ms': self.ping_ewma_ms,
+                'open_connections': self._open,
+                'idle_limit': self._idle_limit if self.adaptive else self.pool_size,
+                'resizes': self.resizes,
+                'trimmed': self.trimmed,
+            }
+        if pool is not None:
+            stats['idle'] = pool.checkedin()
+            stats['overflow'] = max(0, pool.overflow())
+            stats['saturation'] = stats['checked_out'] / (self.pool_size + self.max_overflow)
+        return stats
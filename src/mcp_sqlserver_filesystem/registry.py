@@ -0,0 +1,174 @@
+"""Registry of named database connection profiles for MCP server."""
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from .config import DatabaseConfig, config
+from .database import SQLServerManager, db_manager
+
+if TYPE_CHECKING:
+    from .async_database import AsyncSQLServerManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = "default"
+
+
+class DatabaseRegistry:
+    """Maps connection profile names to SQLServerManager instances.
+
+    ``default`` is the DB_* connection served by the global ``db_manager``.
+    Named profiles (DB_PROFILES) get their own manager, and thus their own
+    pool, caches and circuit breaker, created on first use. A named profile
+    unused for ``idle_timeout`` seconds has its engine closed; the next call
+    to it reconnects.
+    """
+
+    def __init__(self, default: SQLServerManager, profiles: Dict[str, DatabaseConfig],
+                 idle_timeout: float = 600.0):
+        self._default = default
+        self._profiles = dict(profiles)
+        self.idle_timeout = idle_timeout
+        self._managers: Dict[str, SQLServerManager] = {}
+        self._last_used: Dict[str, float] = {}
+        self._async_managers: Dict[str, "AsyncSQLServerManager"] = {}
+        self._lock = threading.Lock()
+        # Profiles whose engines are being closed; get() waits until they are done
+        self._closing: Set[str] = set()
+        self._closed = threading.Condition(self._lock)
+        self._evictor: Optional[threading.Thread] = None
+        self.evictions = 0
+
+    def names(self) -> List[str]:
+        return [DEFAULT_PROFILE] + sorted(self._profiles)
+
+    def has_profiles(self) -> bool:
+        return bool(self._profiles)
+
+    def get(self, name: Optional[str] = None) -> SQLServerManager:
+        """Return the manager for a profile (``None`` or ``"default"`` = DB_* connection)."""
+        key = (name or DEFAULT_PROFILE).strip().lower()
+        if key == DEFAULT_PROFILE:
+            return self._default
+        if key not in self._profiles:
+            raise ValueError(f"Unknown connection '{name}'. Available connections: {', '.join(self.names())}")
+
+        with self._lock:
+            while key in self._closing:
+                self._closed.wait()
+            manager = self._managers.get(key)
+            if manager is None:
+                manager = SQLServerManager(self._profiles[key], name=key)
+                self._managers[key] = manager
+                logger.info(f"Created database manager for connection profile '{key}'")
+            self._last_used[key] = time.monotonic()
+            self._start_evictor()
+        return manager
+
+    def get_async(self, name: Optional[str] = None) -> "AsyncSQLServerManager":
+        """Return the asyncio manager (DB_ASYNC_DRIVER) paired with a profile's manager."""
+        from .async_database import AsyncSQLServerManager
+
+        manager = self.get(name)
+        with self._lock:
+            async_manager = self._async_managers.get(manager.name)
+            if async_manager is None:
+                async_manager = AsyncSQLServerManager(manager)
+                self._async_managers[manager.name] = async_manager
+        return async_manager
+
+    def _start_evictor(self) -> None:
+        if self._evictor is not None or self.idle_timeout <= 0:
+            return
+        self._evictor = threading.Thread(target=self._evict_loop, name="db-profile-evictor", daemon=True)
+        self._evictor.start()
+
+    def _evict_loop(self) -> None:
+        while True:
+            time.sleep(max(1.0, self.idle_timeout / 4))
+            try:
+                self.evict_idle()
+            except Exception as e:
+                logger.warning(f"Evicting idle connection profiles failed: {e}")
+
+    def evict_idle(self) -> List[str]:
+        """Close the engines (thread-based and asyncio) of named profiles unused
+        for ``idle_timeout`` seconds.
+
+        A profile is marked as closing under the lock after checking that it
+        is still idle and has no connection checked out, so a concurrent
+        ``get()`` waits for the close instead of handing out a manager whose
+        engine is being disposed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            evicted = []
+            for key, manager in self._managers.items():
+                if now - self._last_used.get(key, now) < self.idle_timeout or not manager.is_engine_open():
+                    continue
+                async_manager = self._async_managers.get(key)
+                if manager.get_pool_stats()['checked_out'] > 0 or (
+                        async_manager is not None and async_manager.checked_out() > 0):
+                    continue
+                self._closing.add(key)
+                evicted.append(key)
+        try:
+            for key in evicted:
+                self._managers[key].close()
+                async_manager = self._async_managers.get(key)
+                if async_manager is not None:
+                    try:
+                        async_manager.close_from_thread()
+                    except Exception as e:
+                        logger.warning(f"Closing the async engine of connection profile '{key}' failed: {e}")
+                logger.info(f"Closed idle connection profile '{key}'")
+        finally:
+            with self._lock:
+                self._closing.difference_update(evicted)
+                self.evictions += len(evicted)
+                self._closed.notify_all()
+        return evicted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return every profile's target and whether its engine is open."""
+        now = time.monotonic()
+        with self._lock:
+            managers = dict(self._managers)
+            last_used = dict(self._last_used)
+        profiles = {
+            DEFAULT_PROFILE: {
+                'server': self._default.db_config.server,
+                'database': self._default.db_config.database,
+                'open': self._default.is_engine_open(),
+                'available': self._default.is_available(),
+            }
+        }
+        for key, profile in sorted(self._profiles.items()):
+            manager = managers.get(key)
+            profiles[key] = {
+                'server': profile.server,
+                'database': profile.database,
+                'open': manager is not None and manager.is_engine_open(),
+                'available': manager is not None and manager.is_available(),
+                'idle_seconds': now - last_used[key] if key in last_used else None,
+            }
+        return {'profiles': profiles, 'idle_timeout': self.idle_timeout, 'evictions': self.evictions}
+
+    async def close_async(self) -> None:
+        """Dispose the engines of all asyncio managers."""
+        with self._lock:
+            async_managers = list(self._async_managers.values())
+        for async_manager in async_managers:
+            await async_manager.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            managers = list(self._managers.values())
+        for manager in managers:
+            manager.close()
+
+
+# Global registry of connection profiles
+db_registry = DatabaseRegistry(db_manager, config.database_profiles, config.database.profile_idle_timeout)
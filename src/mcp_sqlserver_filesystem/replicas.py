@@ -0,0 +1,82 @@
+"""Read replica selection for MCP server."""
+
+import itertools
+import logging
+import threading
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRouter:
+    """Chooses the read replica that serves the next read-only query.
+
+    ``replicas`` are SQLServerManager instances connected with
+    ``ApplicationIntent=ReadOnly``. ``candidates()`` returns the replicas
+    that are currently available, in the order they should be tried:
+    rotated for ``round_robin``, fastest recent ping first for
+    ``least_latency``. Replicas connect in the background the first time
+    they are considered.
+    """
+
+    def __init__(self, replicas: List[Any], strategy: str = "round_robin"):
+        self.replicas = replicas
+        self.strategy = strategy
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._routed: Dict[str, int] = {replica.name: 0 for replica in replicas}
+        self._failures: Dict[str, int] = {replica.name: 0 for replica in replicas}
+        self.fallbacks = 0
+
+    def candidates(self) -> List[Any]:
+        for replica in self.replicas:
+            replica.start_background_init()
+        available = [replica for replica in self.replicas if replica.is_available()]
+        if len(available) < 2:
+            return available
+        if self.strategy == 'least_latency':
+            # Replicas without a measurement yet go first so that they get one
+            return sorted(available, key=lambda r: r.get_pool_stats()['recent_ping_ms'] or 0.0)
+        start = next(self._counter) % len(available)
+        return available[start:] + available[:start]
+
+    def record_routed(self, replica) -> None:
+        with self._lock:
+            self._routed[replica.name] += 1
+
+    def record_failure(self, replica) -> None:
+        with self._lock:
+            self._failures[replica.name] += 1
+
+    def record_fallback(self) -> None:
+        with self._lock:
+            self.fallbacks += 1
+
+    def start(self) -> None:
+        for replica in self.replicas:
+            replica.start_background_init()
+
+    def close(self) -> None:
+        for replica in self.replicas:
+            replica.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routed = dict(self._routed)
+            failures = dict(self._failures)
+            fallbacks = self.fallbacks
+        return {
+            'strategy': self.strategy,
+            'fallbacks': fallbacks,
+            'replicas': [
+                {
+                    'name': replica.name,
+                    'server': f"{replica.db_config.server},{replica.db_config.port}",
+                    'available': replica.is_available(),
+                    'queries': routed[replica.name],
+                    'failures': failures[replica.name],
+                    'recent_ping_ms': replica.get_pool_stats()['recent_ping_ms'],
+                }
+                for replica in self.replicas
+            ],
+        }
@@ -0,0 +1,74 @@
+"""Compact query result container for MCP server."""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+class QueryResult:
+    """Result set holding column names once and rows as tuples.
+
+    Rows are kept exactly as the driver returned them (SQLAlchemy ``Row``
+    objects are tuple-like), so no per-row dictionaries are built. Dict views
+    are produced lazily by ``iter_dicts`` / ``to_dicts`` for callers that need
+    them, and ``result['rows']`` style access is kept for compatibility.
+    """
+
+    __slots__ = ('columns', 'rows', 'has_more', '_index')
+
+    def __init__(self, columns: Sequence[str], rows: Sequence[Sequence[Any]], has_more: bool = False):
+        self.columns: List[str] = list(columns)
+        self.rows: List[Sequence[Any]] = rows if isinstance(rows, list) else list(rows)
+        self.has_more = has_more
+        self._index: Optional[Dict[str, int]] = None
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Sequence[Any]]:
+        return iter(self.rows)
+
+    def column_index(self, name: str) -> int:
+        """Return the position of a column by name."""
+        if self._index is None:
+            self._index = {col: i for i, col in enumerate(self.columns)}
+        return self._index[name]
+
+    def column(self, name: str) -> List[Any]:
+        """Return all values of one column."""
+        i = self.column_index(name)
+        return [row[i] for row in self.rows]
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield each row as a ``{column: value}`` dict."""
+        columns = self.columns
+        for row in self.rows:
+            yield dict(zip(columns, row))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return all rows as dicts."""
+        return list(self.iter_dicts())
+
+    # Mapping-style access kept for callers written against the old dict result
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'columns':
+            return self.columns
+        if key == 'rows':
+            return self.to_dicts()
+        if key == 'row_count':
+            return self.row_count
+        if key == 'has_more':
+            return self.has_more
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"QueryResult(columns={self.columns!r}, row_count={self.row_count}, has_more={self.has_more})"
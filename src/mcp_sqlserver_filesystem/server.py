@@ -1,9 +1,11 @@
 """MCP Server for SQL Server and Filesystem Access."""
 
 import asyncio
+import contextlib
+import io
 import logging
 import sys
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import json
 
 from mcp.server import Server
@@ -22,15 +24,21 @@ from mcp.types import (
 
 from .config import config
 from .database import db_manager, SQLSecurityError, DatabaseConnectionError
-from .filesystem import fs_manager, FilesystemSecurityError, FilesystemOperationError
+from .registry import db_registry
+from .filesystem import (
+    fs_manager, FilesystemSecurityError, FilesystemOperationError,
+    DEFAULT_READ_LENGTH, DEFAULT_TAIL_LINES, EXPORT_COMPRESSIONS, EXPORT_FORMATS,
+)
+from .executor import db_executor, fs_executor
+from .formatters import DEFAULT_FORMAT, FORMATS, FormatError, check_format, format_details, format_rows
 from . import __version__
 
-# Configure logging
+# Configure logging (stdout carries the MCP stdio protocol, so logs go to stderr)
 logging.basicConfig(
     level=getattr(logging, config.server.log_level),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.StreamHandler(sys.stdout),
+        logging.StreamHandler(sys.stderr),
         *([logging.FileHandler(config.server.log_file)] if config.server.log_file else [])
     ]
 )
@@ -40,6 +48,18 @@ logger = logging.getLogger(__name__)
 # Create MCP server instance
 server = Server("mcp-sqlserver-filesystem")
 
+# Default number of rows fetched and shown by sql_query
+SQL_QUERY_DISPLAY_LIMIT = 100
+
+# Entries returned by one list_directory page
+LIST_DIRECTORY_PAGE_SIZE = 1000
+
+# Largest chunk read_file returns in one call
+READ_FILE_MAX_LENGTH = 1024 * 1024
+
+# Tools that need a database connection; they accept an optional `connection` profile
+DATABASE_TOOLS = ["sql_query", "sql_execute", "sql_batch", "get_table_schema", "list_tables", "describe_tables", "sql_bulk_insert", "sql_export"]
+
 
 @server.list_resources()
 async def handle_list_resources() -> List[Resource]:
@@ -63,6 +83,12 @@ async def handle_list_resources() -> List[Resource]:
             description="Current database connection status",
             mimeType="application/json",
         ),
+        Resource(
+            uri="status://pool",
+            name="Connection Pool Status",
+            description="Connection pool usage, checkout wait, ping latency and adaptive sizing counters",
+            mimeType="application/json",
+        ),
     ]
     
     return resources
@@ -95,10 +121,11 @@ async def handle_read_resource(uri: str) -> str:
     
     elif uri == "status://database":
         try:
-            is_connected = db_manager.test_connection()
+            is_connected = await db_executor.run(db_manager.test_connection)
             return json.dumps({
                 "connected": is_connected,
                 "status": "Connected" if is_connected else "Disconnected",
+                "health": db_manager.get_health_stats(),
                 "timestamp": asyncio.get_event_loop().time(),
             }, indent=2)
         except Exception as e:
@@ -108,6 +135,9 @@ async def handle_read_resource(uri: str) -> str:
                 "timestamp": asyncio.get_event_loop().time(),
             }, indent=2)
     
+    elif uri == "status://pool":
+        return json.dumps(db_manager.get_pool_stats(), indent=2)
+
     else:
         raise ValueError(f"Unknown resource: {uri}")
 
@@ -117,8 +147,8 @@ async def handle_list_tools() -> List[Tool]:
     """List available tools."""
     tools = []
 
-    # Add database tools only if database is available
-    if db_manager.is_available():
+    # Add database tools only if database is available (or still connecting)
+    if db_manager.is_available() or db_manager.is_initializing():
         tools.extend([
             # Database tools
             Tool(
@@ -136,6 +166,23 @@ async def handle_list_tools() -> List[Tool]:
                         "description": "Query parameters (optional)",
                         "additionalProperties": True
                     },
+                    "max_rows": {
+                        "type": "integer",
+                        "description": f"Maximum number of rows to fetch and return (default: {SQL_QUERY_DISPLAY_LIMIT})",
+                        "default": SQL_QUERY_DISPLAY_LIMIT,
+                        "minimum": 0
+                    },
+                    "timeout": {
+                        "type": "integer",
+                        "description": f"Statement timeout in seconds, 0 = no limit (default: DB_COMMAND_TIMEOUT = {config.database.command_timeout})",
+                        "minimum": 0
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "Result encoding: table (default), csv, jsonl, markdown or arrow-ipc (base64 Arrow IPC stream, needs pyarrow)",
+                        "default": DEFAULT_FORMAT
+                    },
 
                 },
                 "required": ["query"]
@@ -156,11 +203,71 @@ async def handle_list_tools() -> List[Tool]:
                         "description": "Query parameters (optional)",
                         "additionalProperties": True
                     },
+                    "timeout": {
+                        "type": "integer",
+                        "description": f"Statement timeout in seconds, 0 = no limit (default: DB_COMMAND_TIMEOUT = {config.database.command_timeout})",
+                        "minimum": 0
+                    },
+                    "details": {
+                        "type": "boolean",
+                        "description": "Return the affected records (before and after values for UPDATE) instead of just the row count; the timeout argument is not applied",
+                        "default": False
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": list(FORMATS),
+                        "description": "Encoding of the affected records with details: table (default), csv, jsonl, markdown or arrow-ipc (base64 Arrow IPC stream, needs pyarrow)",
+                        "default": DEFAULT_FORMAT
+                    },
 
                 },
                 "required": ["query"]
             }
         ),
+        Tool(
+            name="sql_batch",
+            description="Execute an ordered list of SQL statements on one connection and report per-statement row counts and timings",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "statements": {
+                        "type": "array",
+                        "items": {
+                            "anyOf": [
+                                {"type": "string"},
+                                {
+                                    "type": "object",
+                                    "properties": {
+                                        "query": {"type": "string"},
+                                        "parameters": {"type": "object", "additionalProperties": True}
+                                    },
+                                    "required": ["query"]
+                                }
+                            ]
+                        },
+                        "description": "Statements to run in order: SQL strings or {query, parameters} objects"
+                    },
+                    "transaction": {
+                        "type": "string",
+                        "enum": ["single", "per_statement"],
+                        "description": "single: commit all together, roll back everything on error; per_statement: commit each statement",
+                        "default": "single"
+                    },
+                    "stop_on_error": {
+                        "type": "boolean",
+                        "description": "Stop at the first failing statement (always true in single mode)",
+                        "default": True
+                    },
+                    "confirm": {
+                        "type": "boolean",
+                        "description": "Required when the batch contains DELETE/DROP/TRUNCATE/ALTER",
+                        "default": False
+                    },
+
+                },
+                "required": ["statements"]
+            }
+        ),
         Tool(
             name="get_table_schema",
             description="Get table schema information",
@@ -195,6 +302,134 @@ async def handle_list_tools() -> List[Tool]:
 
                 }
             }
+        ),
+        Tool(
+            name="describe_tables",
+            description="Describe many tables at once: columns, keys, foreign keys, indexes and row-count estimates",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tables": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Table names, optionally schema-qualified; * and ? wildcards allowed (e.g. 'sales.Order*')"
+                    },
+                    "schema_name": {
+                        "type": "string",
+                        "description": "Schema used when no tables are given or a name is unqualified; '*' = all schemas (default: dbo)",
+                        "default": "dbo"
+                    },
+
+                }
+            }
+        ),
+        Tool(
+            name="sql_bulk_insert",
+            description="Bulk insert rows (inline or from a CSV/JSONL file) in batches within one transaction",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "table_name": {
+                        "type": "string",
+                        "description": "Target table, optionally schema-qualified (e.g. dbo.Orders)"
+                    },
+                    "columns": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Column names (optional when rows are objects or a file with a header is used)"
+                    },
+                    "rows": {
+                        "type": "array",
+                        "description": "Rows to insert, as arrays of values or objects keyed by column name"
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "CSV (with header) or JSONL file to load instead of rows"
+                    },
+                    "file_format": {
+                        "type": "string",
+                        "enum": ["csv", "jsonl"],
+                        "description": "File format (default: from file extension)"
+                    },
+                    "encoding": {
+                        "type": "string",
+                        "description": "File encoding (default: utf-8)",
+                        "default": "utf-8"
+                    },
+                    "batch_size": {
+                        "type": "integer",
+                        "description": "Rows per round trip (default: DB_BULK_INSERT_BATCH_SIZE)",
+                        "minimum": 1
+                    },
+                    "method": {
+                        "type": "string",
+                        "enum": ["fast_executemany", "values"],
+                        "description": "fast_executemany (array binding) or values (multi-row INSERT ... VALUES)",
+                        "default": "fast_executemany"
+                    },
+
+                },
+                "required": ["table_name"]
+            }
+        ),
+        Tool(
+            name="sql_export",
+            description="Stream the results of a SELECT query straight into a CSV, JSONL or Parquet file, optionally gzip/zstd compressed",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "query": {
+                        "type": "string",
+                        "description": "SQL SELECT query to export"
+                    },
+                    "parameters": {
+                        "type": "object",
+                        "description": "Query parameters (optional)",
+                        "additionalProperties": True
+                    },
+                    "file_path": {
+                        "type": "string",
+                        "description": "File to write (e.g. C:\\exports\\orders.csv.gz)"
+                    },
+                    "file_format": {
+                        "type": "string",
+                        "enum": list(EXPORT_FORMATS),
+                        "description": "File format (default: from file extension)"
+                    },
+                    "compression": {
+                        "type": "string",
+                        "enum": list(EXPORT_COMPRESSIONS),
+                        "description": "Compression (default: from a .gz/.zst extension, otherwise none); Parquet uses it as its internal codec"
+                    },
+                    "encoding": {
+                        "type": "string",
+                        "description": "Text encoding for CSV/JSONL (default: utf-8)",
+                        "default": "utf-8"
+                    },
+                    "batch_size": {
+                        "type": "integer",
+                        "description": "Rows fetched per round trip (default: DB_FETCH_BATCH_SIZE)",
+                        "minimum": 1
+                    },
+                    "max_rows": {
+                        "type": "integer",
+                        "description": "Stop after this many rows (default: export all rows)",
+                        "minimum": 0
+                    },
+                    "overwrite": {
+                        "type": "boolean",
+                        "description": "Replace the file if it already exists",
+                        "default": False
+                    },
+                    "timeout": {
+                        "type": "integer",
+                        "description": f"Statement timeout in seconds, 0 = no limit (default: DB_COMMAND_TIMEOUT = {config.database.command_timeout})",
+                        "minimum": 0
+                    },
+
+                },
+                "required": ["query", "file_path"]
+            }
         )])
 
     # Always add database management tools
@@ -220,12 +455,23 @@ async def handle_list_tools() -> List[Tool]:
         ),
     ])
 
+    # Let database tools target a named connection profile (DB_PROFILES)
+    if db_registry.has_profiles():
+        for tool in tools:
+            if tool.name in DATABASE_TOOLS or tool.name in ("database_reconnect", "database_status"):
+                tool.inputSchema["properties"]["connection"] = {
+                    "type": "string",
+                    "enum": db_registry.names(),
+                    "description": "Connection profile to use (default: the DB_* connection)",
+                    "default": "default"
+                }
+
     # Always add filesystem tools (they don't depend on database)
     tools.extend([
         # Filesystem tools
         Tool(
             name="read_file",
-            description="Read file content",
+            description="Read file content, one chunk at a time: a byte range (offset/length) or a window of lines (start_line/end_line); the response says where to continue",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -238,6 +484,59 @@ async def handle_list_tools() -> List[Tool]:
                         "description": "File encoding (default: utf-8)",
                         "default": "utf-8"
                     },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Byte offset to start reading at (default: 0)",
+                        "default": 0,
+                        "minimum": 0
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": f"Maximum number of bytes to read (default: {DEFAULT_READ_LENGTH}, max: {READ_FILE_MAX_LENGTH})",
+                        "default": DEFAULT_READ_LENGTH,
+                        "minimum": 1,
+                        "maximum": READ_FILE_MAX_LENGTH
+                    },
+                    "start_line": {
+                        "type": "integer",
+                        "description": "First line to read, 1-based (line mode; offset is ignored)",
+                        "minimum": 1
+                    },
+                    "end_line": {
+                        "type": "integer",
+                        "description": "Last line to read, inclusive (line mode, still limited by length)",
+                        "minimum": 1
+                    },
+
+                },
+                "required": ["file_path"]
+            }
+        ),
+        Tool(
+            name="tail_file",
+            description="Return the last lines of a file, or with a cursor from a previous call only the lines appended since (for following growing logs)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "file_path": {
+                        "type": "string",
+                        "description": "Path to the file to tail"
+                    },
+                    "lines": {
+                        "type": "integer",
+                        "description": f"Number of lines to return from the end of the file (default: {DEFAULT_TAIL_LINES}; ignored with a cursor)",
+                        "default": DEFAULT_TAIL_LINES,
+                        "minimum": 0
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor returned by the previous tail_file call; only data appended after it is returned"
+                    },
+                    "encoding": {
+                        "type": "string",
+                        "description": "File encoding (default: utf-8)",
+                        "default": "utf-8"
+                    },
 
                 },
                 "required": ["file_path"]
@@ -287,6 +586,31 @@ async def handle_list_tools() -> List[Tool]:
                         "description": "List recursively",
                         "default": False
                     },
+                    "max_depth": {
+                        "type": "integer",
+                        "description": "Directory levels to walk when recursive (1 = direct children; default: unlimited)",
+                        "minimum": 1
+                    },
+                    "max_entries": {
+                        "type": "integer",
+                        "description": f"Maximum entries to return in this page (default: {LIST_DIRECTORY_PAGE_SIZE})",
+                        "default": LIST_DIRECTORY_PAGE_SIZE,
+                        "minimum": 1
+                    },
+                    "include": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Glob patterns of entries to list (e.g. *.sql); patterns containing / match the relative path"
+                    },
+                    "exclude": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Glob patterns of entries to skip, including everything below matching directories (e.g. .git, node_modules)"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "Cursor returned by the previous page to continue the listing"
+                    },
 
                 },
                 "required": ["dir_path"]
@@ -302,25 +626,39 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
     """Handle tool calls."""
     try:
         # Database tools - check availability first
-        if name in ["sql_query", "sql_execute", "get_table_schema", "list_tables"]:
-            if not db_manager.is_available():
-                error_msg = f"❌ 数据库工具不可用: {db_manager.get_connection_error()}"
+        if name in DATABASE_TOOLS:
+            # Named connection profiles connect on first use
+            manager = db_registry.get(arguments.get("connection"))
+            if not manager.is_available():
+                await db_executor.run(manager.wait_until_initialized)
+            if not manager.is_available():
+                error_msg = f"❌ 数据库工具不可用 ({manager.name}): {manager.get_connection_error()}"
                 return [TextContent(type="text", text=error_msg)]
 
         if name == "sql_query":
             return await handle_sql_query(arguments)
         elif name == "sql_execute":
             return await handle_sql_execute(arguments)
+        elif name == "sql_batch":
+            return await handle_sql_batch(arguments)
         elif name == "get_table_schema":
             return await handle_get_table_schema(arguments)
         elif name == "list_tables":
             return await handle_list_tables(arguments)
+        elif name == "describe_tables":
+            return await handle_describe_tables(arguments)
+        elif name == "sql_bulk_insert":
+            return await handle_sql_bulk_insert(arguments)
+        elif name == "sql_export":
+            return await handle_sql_export(arguments)
         elif name == "database_reconnect":
             return await handle_database_reconnect(arguments)
         elif name == "database_status":
             return await handle_database_status(arguments)
         elif name == "read_file":
             return await handle_read_file(arguments)
+        elif name == "tail_file":
+            return await handle_tail_file(arguments)
         elif name == "write_file":
             return await handle_write_file(arguments)
         elif name == "list_directory":
@@ -334,43 +672,55 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[TextCon
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
 
+async def _run_database_call(manager, method: str, *args: Any) -> Any:
+    """Await a database call natively when DB_ASYNC_DRIVER is on, otherwise on a database worker thread."""
+    if manager.db_config.async_driver:
+        return await getattr(db_registry.get_async(manager.name), method)(*args)
+    return await db_executor.run(getattr(manager, method), *args)
+
+
 # Tool handler functions
 async def handle_sql_query(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle SQL query execution."""
+    manager = db_registry.get(arguments.get("connection"))
     query = arguments.get("query", "")
     parameters = arguments.get("parameters", {})
+    max_rows = int(arguments.get("max_rows", SQL_QUERY_DISPLAY_LIMIT))
+    timeout = arguments.get("timeout")
+    try:
+        output_format = check_format(arguments.get("format", DEFAULT_FORMAT))
+    except FormatError as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
 
     try:
-        result_data = db_manager.execute_query(query, parameters)
+        # Only the rows we are going to show are fetched; the rest of the
+        # result set is cancelled on the server.
+        result_data = await _run_database_call(manager, "execute_query", query, parameters, max_rows, timeout)
 
-        # Extract rows from the result dictionary
-        rows = result_data.get('rows', [])
-        columns = result_data.get('columns', [])
-        row_count = result_data.get('row_count', 0)
+        row_count = result_data.row_count
+        has_more = result_data.has_more
 
         # Format results for display
-        if row_count == 0:
-            response_text = "Query executed successfully. No results returned."
-        else:
-            # Create a formatted table
-            if row_count == 1:
-                response_text = f"Query returned 1 row:\n\n"
-            else:
-                response_text = f"Query returned {row_count} rows:\n\n"
+        if row_count == 0 and not has_more and output_format == DEFAULT_FORMAT:
+            return [TextContent(type="text", text="Query executed successfully. No results returned.")]
 
-            # Add column headers
-            if columns:
-                response_text += " | ".join(columns) + "\n"
-                response_text += "-" * (len(" | ".join(columns))) + "\n"
+        if has_more:
+            summary = f"Query returned more than {row_count} rows, showing the first {row_count}"
+        elif row_count == 1:
+            summary = "Query returned 1 row"
+        else:
+            summary = f"Query returned {row_count} rows"
+        body = format_rows(result_data.columns, result_data.rows, output_format)
 
-                # Add data rows (limit to first 100 rows for display)
-                display_rows = rows[:100]
-                for row in display_rows:
-                    row_values = [str(row.get(col, "")) for col in columns]
-                    response_text += " | ".join(row_values) + "\n"
+        if output_format != DEFAULT_FORMAT:
+            # Machine-readable output goes in its own content block, untouched by the summary
+            if has_more:
+                summary += " (increase max_rows to fetch more)"
+            return [TextContent(type="text", text=f"{summary} as {output_format}:"), TextContent(type="text", text=body)]
 
-                if row_count > 100:
-                    response_text += f"\n... and {row_count - 100} more rows"
+        response_text = f"{summary}:\n\n{body}"
+        if has_more:
+            response_text += f"\n... more rows available (increase max_rows to fetch more)"
 
         return [TextContent(type="text", text=response_text)]
 
@@ -395,9 +745,16 @@ async def handle_sql_query(arguments: Dict[str, Any]) -> List[TextContent]:
 
 async def handle_sql_execute(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle SQL execution (INSERT, UPDATE, DELETE)."""
+    manager = db_registry.get(arguments.get("connection"))
     query = arguments.get("query", "")
     parameters = arguments.get("parameters", {})
     confirm = arguments.get("confirm", False)
+    timeout = arguments.get("timeout")
+    details = arguments.get("details", False)
+    try:
+        output_format = check_format(arguments.get("format", DEFAULT_FORMAT))
+    except FormatError as e:
+        return [TextContent(type="text", text=f"Error: {e}")]
 
     try:
         # Check if confirmation is required for dangerous operations
@@ -412,7 +769,14 @@ async def handle_sql_execute(arguments: Dict[str, Any]) -> List[TextContent]:
                 text=f"This operation requires confirmation. Please add 'confirm': true to execute: {query}"
             )]
 
-        affected_rows = db_manager.execute_non_query(query, parameters)
+        if details:
+            # Affected records come back from an OUTPUT clause in the same statement
+            result = await db_executor.run(manager.execute_with_details, query, parameters)
+            if not result.get('success'):
+                return [TextContent(type="text", text=f"SQL execution failed: {result.get('error')}")]
+            return [TextContent(type="text", text=format_details(result, output_format))]
+
+        affected_rows = await _run_database_call(manager, "execute_non_query", query, parameters, timeout)
 
         response_text = f"SQL executed successfully. {affected_rows} rows affected."
 
@@ -424,13 +788,154 @@ async def handle_sql_execute(arguments: Dict[str, Any]) -> List[TextContent]:
         return [TextContent(type="text", text=error_msg)]
 
 
+async def handle_sql_batch(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle execution of an ordered list of statements on one connection."""
+    manager = db_registry.get(arguments.get("connection"))
+    statements = arguments.get("statements") or []
+    transaction = arguments.get("transaction", "single")
+    stop_on_error = arguments.get("stop_on_error", True)
+    confirm = arguments.get("confirm", False)
+
+    try:
+        dangerous_keywords = ["DELETE", "DROP", "TRUNCATE", "ALTER"]
+        queries = [s if isinstance(s, str) else s.get("query", "") for s in statements]
+        is_dangerous = any(keyword in q.upper() for q in queries for keyword in dangerous_keywords)
+
+        if is_dangerous and not confirm:
+            return [TextContent(
+                type="text",
+                text="This batch contains DELETE/DROP/TRUNCATE/ALTER statements and requires confirmation. Please add 'confirm': true to execute."
+            )]
+
+        result = await db_executor.run(manager.execute_batch, statements, transaction, stop_on_error)
+
+        out = io.StringIO()
+        status = "succeeded" if result['success'] else "failed"
+        out.write(f"Batch {status}: {result['committed']}/{result['statements']} statements committed "
+                  f"in {result['elapsed_seconds'] * 1000:.1f} ms (transaction: {result['transaction']}).\n")
+        if result['error'] and result['transaction'] == "single":
+            out.write("All statements were rolled back.\n")
+        out.write("\n")
+        for entry in result['results']:
+            line = f"#{entry['index']} {entry['status']}"
+            if 'rowcount' in entry:
+                if entry['rows_returned'] is not None:
+                    line += f", {entry['rows_returned']} rows returned"
+                elif entry['rowcount'] >= 0:
+                    line += f", {entry['rowcount']} rows affected"
+            if 'elapsed_ms' in entry:
+                line += f", {entry['elapsed_ms']:.1f} ms"
+            if 'error' in entry:
+                line += f": {entry['error']}"
+            out.write(line + "\n")
+
+        return [TextContent(type="text", text=out.getvalue())]
+
+    except Exception as e:
+        error_msg = f"SQL batch failed: {str(e)}"
+        logger.error(error_msg)
+        return [TextContent(type="text", text=error_msg)]
+
+
+async def handle_sql_bulk_insert(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle bulk inserts from inline rows or a CSV/JSONL file."""
+    manager = db_registry.get(arguments.get("connection"))
+    table_name = arguments.get("table_name", "")
+    columns = arguments.get("columns") or []
+    rows = arguments.get("rows")
+    file_path = arguments.get("file_path")
+    file_format = arguments.get("file_format")
+    encoding = arguments.get("encoding", "utf-8")
+    batch_size = arguments.get("batch_size")
+    method = arguments.get("method", "fast_executemany")
+
+    def load() -> Dict[str, Any]:
+        # Runs on a worker thread: file rows are streamed straight into the batches
+        if file_path:
+            file_columns, file_rows = fs_manager.open_records(file_path, file_format, encoding)
+            return manager.bulk_insert(table_name, columns or file_columns, file_rows, batch_size, method)
+
+        if not rows:
+            raise ValueError("Either rows or file_path is required")
+        if isinstance(rows[0], dict):
+            keys = columns or list(rows[0].keys())
+            values = [[row.get(key) for key in keys] for row in rows]
+            return manager.bulk_insert(table_name, keys, values, batch_size, method)
+        return manager.bulk_insert(table_name, columns, rows, batch_size, method)
+
+    try:
+        result = await db_executor.run(load)
+
+        response_text = (
+            f"Bulk insert into '{table_name}' committed {result['rows_inserted']} rows "
+            f"in {result['elapsed_seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s, "
+            f"{result['batches']} batches of up to {result['batch_size']}, method: {result['method']})."
+        )
+        return [TextContent(type="text", text=response_text)]
+
+    except Exception as e:
+        error_msg = f"Bulk insert failed (no rows were committed): {str(e)}"
+        logger.error(error_msg)
+        return [TextContent(type="text", text=error_msg)]
+
+
+async def handle_sql_export(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle streaming a query's results into a file."""
+    manager = db_registry.get(arguments.get("connection"))
+    query = arguments.get("query", "")
+    parameters = arguments.get("parameters", {})
+    file_path = arguments.get("file_path", "")
+    file_format = arguments.get("file_format")
+    compression = arguments.get("compression")
+    encoding = arguments.get("encoding", "utf-8")
+    batch_size = arguments.get("batch_size")
+    max_rows = arguments.get("max_rows")
+    overwrite = arguments.get("overwrite", False)
+    timeout = arguments.get("timeout")
+
+    def limited(batches):
+        # Stopping early cancels the rest of the statement on the server
+        remaining = max_rows
+        for columns, rows in batches:
+            if remaining is not None and len(rows) >= remaining:
+                yield columns, rows[:remaining]
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+            yield columns, rows
+
+    def export() -> Dict[str, Any]:
+        # Runs on a worker thread: each fetched batch is written before the next is fetched.
+        # Closing the stream when the export stops early or fails cancels the statement
+        # and returns the connection right away instead of when the generator is collected.
+        with contextlib.closing(manager.iter_query(query, parameters, batch_size, timeout)) as batches:
+            return fs_manager.write_records(file_path, limited(batches), file_format, compression, encoding, overwrite)
+
+    try:
+        result = await db_executor.run(export)
+
+        response_text = (
+            f"Exported {result['rows_written']:,} rows to {result['path']} "
+            f"({result['file_format']}, compression: {result['compression']}, {result['bytes_written']:,} bytes) "
+            f"in {result['elapsed_seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s, "
+            f"{result['bytes_per_second'] / (1024 * 1024):.2f} MB/s)."
+        )
+        return [TextContent(type="text", text=response_text)]
+
+    except Exception as e:
+        error_msg = f"SQL export failed: {str(e)}"
+        logger.error(error_msg)
+        return [TextContent(type="text", text=error_msg)]
+
+
 async def handle_get_table_schema(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle table schema retrieval."""
+    manager = db_registry.get(arguments.get("connection"))
     table_name = arguments.get("table_name", "")
     schema_name = arguments.get("schema_name", "dbo")
 
     try:
-        schema_data = db_manager.get_table_schema(table_name, schema_name)
+        schema_data = await _run_database_call(manager, "get_table_schema", table_name, schema_name)
 
         # Extract columns from the schema data
         columns = schema_data.get('columns', []) if isinstance(schema_data, dict) else []
@@ -468,10 +973,11 @@ async def handle_get_table_schema(arguments: Dict[str, Any]) -> List[TextContent
 
 async def handle_list_tables(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle database tables listing."""
+    manager = db_registry.get(arguments.get("connection"))
     schema_name = arguments.get("schema_name", "dbo")
 
     try:
-        tables = db_manager.get_database_tables(schema_name)
+        tables = await db_executor.run(manager.get_database_tables, schema_name)
 
         if not tables:
             response_text = f"No tables found in schema '{schema_name}'."
@@ -488,58 +994,61 @@ async def handle_list_tables(arguments: Dict[str, Any]) -> List[TextContent]:
         return [TextContent(type="text", text=error_msg)]
 
 
-async def handle_database_reconnect(arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle database reconnection attempt."""
-    try:
-        logger.info("Attempting to reconnect to database...")
-        success = db_manager.reconnect()
-
-        if success:
-            return [TextContent(type="text", text="✅ 数据库重连成功！数据库工具现在可用。")]
-        else:
-            error_msg = db_manager.get_connection_error() or "未知错误"
-            return [TextContent(type="text", text=f"❌ 数据库重连失败: {error_msg}")]
-
-    except Exception as e:
-        error_msg = f"数据库重连过程中发生错误: {str(e)}"
-        logger.error(error_msg)
-        return [TextContent(type="text", text=error_msg)]
-
+async def handle_describe_tables(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle bulk table description."""
+    manager = db_registry.get(arguments.get("connection"))
+    tables = arguments.get("tables") or None
+    schema_name = arguments.get("schema_name", "dbo")
 
-async def handle_database_status(arguments: Dict[str, Any]) -> List[TextContent]:
-    """Handle database status check."""
     try:
-        is_available = db_manager.is_available()
-
-        if is_available:
-            # Test actual connection
-            connection_ok = db_manager.test_connection()
-            if connection_ok:
-                status_text = "✅ 数据库连接正常，所有数据库工具可用。"
-            else:
-                status_text = "⚠️ 数据库标记为可用，但连接测试失败。尝试重连可能有帮助。"
-        else:
-            error_msg = db_manager.get_connection_error() or "未知错误"
-            status_text = f"❌ 数据库不可用: {error_msg}\n💡 提示：使用 database_reconnect 工具尝试重新连接"
-
-        return [TextContent(type="text", text=status_text)]
+        described = await db_executor.run(manager.describe_tables, tables, schema_name)
+
+        if not described:
+            return [TextContent(type="text", text="No matching tables found.")]
+
+        # One line per column/key/index keeps hundreds of tables readable
+        out = io.StringIO()
+        out.write(f"{len(described)} tables:\n")
+        for table in described:
+            out.write(f"\n{table['schema_name']}.{table['table_name']} (~{table['row_estimate']:,} rows)\n")
+            for col in table['columns']:
+                out.write(f"  {col['name']} {col['type']} {'NULL' if col['nullable'] else 'NOT NULL'}")
+                if col['primary_key']:
+                    out.write(" PK")
+                if col['identity']:
+                    out.write(" IDENTITY")
+                if col['default']:
+                    out.write(f" DEFAULT {col['default']}")
+                out.write("\n")
+            for fk in table['foreign_keys']:
+                out.write(f"  FK {fk['name']} ({', '.join(fk['columns'])}) -> "
+                          f"{fk['references']} ({', '.join(fk['referenced_columns'])})\n")
+            for index in table['indexes']:
+                out.write(f"  IX {index['name']} {index['type']}{' UNIQUE' if index['unique'] else ''} "
+                          f"({', '.join(index['columns'])})")
+                if index['include']:
+                    out.write(f" INCLUDE ({', '.join(index['include'])})")
+                out.write("\n")
+
+        return [TextContent(type="text", text=out.getvalue())]
 
     except Exception as e:
-        error_msg = f"检查数据库状态时发生错误: {str(e)}"
+        error_msg = f"Failed to describe tables: {str(e)}"
         logger.error(error_msg)
         return [TextContent(type="text", text=error_msg)]
 
 
 async def handle_database_reconnect(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle database reconnection attempt."""
+    manager = db_registry.get(arguments.get("connection"))
     try:
         logger.info("Attempting to reconnect to database...")
-        success = db_manager.reconnect()
+        success = await db_executor.run(manager.reconnect)
 
         if success:
             return [TextContent(type="text", text="✅ 数据库重连成功！数据库工具现在可用。")]
         else:
-            error_msg = db_manager.get_connection_error() or "未知错误"
+            error_msg = manager.get_connection_error() or "未知错误"
             return [TextContent(type="text", text=f"❌ 数据库重连失败: {error_msg}")]
 
     except Exception as e:
@@ -550,20 +1059,97 @@ async def handle_database_reconnect(arguments: Dict[str, Any]) -> List[TextConte
 
 async def handle_database_status(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle database status check."""
+    manager = db_registry.get(arguments.get("connection"))
     try:
-        is_available = db_manager.is_available()
+        is_available = manager.is_available()
 
-        if is_available:
+        if manager.is_initializing():
+            status_text = "⏳ 数据库正在后台连接中，数据库工具将在连接完成后可用。"
+        elif manager is not db_manager and not manager.is_engine_open():
+            status_text = f"💤 连接 '{manager.name}' 当前未打开 (首次使用时连接, 或因空闲已关闭), 下次调用时自动连接。"
+        elif is_available:
             # Test actual connection
-            connection_ok = db_manager.test_connection()
+            connection_ok = await db_executor.run(manager.test_connection)
             if connection_ok:
                 status_text = "✅ 数据库连接正常，所有数据库工具可用。"
             else:
                 status_text = "⚠️ 数据库标记为可用，但连接测试失败。尝试重连可能有帮助。"
         else:
-            error_msg = db_manager.get_connection_error() or "未知错误"
+            error_msg = manager.get_connection_error() or "未知错误"
             status_text = f"❌ 数据库不可用: {error_msg}\n💡 提示：使用 database_reconnect 工具尝试重新连接"
 
+        if db_registry.has_profiles():
+            registry_stats = db_registry.get_stats()
+            status_text += f"\n🔀 连接配置 (当前: {manager.name}, 空闲关闭 {registry_stats['evictions']} 次):"
+            for profile_name, profile in registry_stats['profiles'].items():
+                state = "已打开" if profile['open'] else "未打开"
+                status_text += f"\n   - {profile_name}: {profile['server']}/{profile['database']} ({state})"
+
+        health_stats = manager.get_health_stats()
+        circuit = health_stats['circuit']
+        if circuit['state'] != 'closed':
+            status_text += (
+                f"\n🛑 熔断器: {'已打开' if circuit['state'] == 'open' else '试探中'}, "
+                f"连续连接失败 {circuit['consecutive_failures']} 次, 约 {health_stats['retry_in']:.0f} 秒后重试"
+            )
+        health_check = health_stats.get('health_check')
+        if health_check is not None:
+            status_text += (
+                f"\n🩺 健康检查: 每 {health_check['interval']:.0f} 秒, 已检查 {health_check['checks']} 次 "
+                f"(失败 {health_check['failures']} 次), 熔断 {circuit['trips']} 次, 连接池替换 {health_stats['engine_swaps']} 次"
+            )
+
+        pool_stats = manager.get_pool_stats()
+        status_text += (
+            f"\n🔌 连接池: 使用中 {pool_stats['checked_out']} / 上限 {pool_stats['pool_size'] + pool_stats['max_overflow']} "
+            f"(峰值 {pool_stats['peak_checked_out']}, 已打开 {pool_stats['open_connections']}), "
+            f"取出 {pool_stats['checkouts']} 次 (平均 {pool_stats['avg_checkout_ms']:.1f} ms, 最长 {pool_stats['max_checkout_ms']:.1f} ms), "
+            f"溢出 {pool_stats['overflow_checkouts']} 次, 等待超时 {pool_stats['pool_timeouts']} 次, "
+            f"失效 {pool_stats['invalidations']} 次"
+            f"\n   存活检测 {pool_stats['pings']} 次 (平均 {pool_stats['avg_ping_ms']:.1f} ms), "
+            f"跳过 {pool_stats['pings_skipped']} 次, 失败 {pool_stats['ping_failures']} 次"
+        )
+        if pool_stats['adaptive']:
+            status_text += f", 自适应空闲连接上限 {pool_stats['idle_limit']} (调整 {pool_stats['resizes']} 次, 关闭多余连接 {pool_stats['trimmed']} 个)"
+
+        replica_stats = manager.get_replica_stats()
+        if replica_stats is not None:
+            strategy = "轮询" if replica_stats['strategy'] == 'round_robin' else "最低延迟"
+            status_text += f"\n📖 只读副本 ({strategy}, 回退到主库 {replica_stats['fallbacks']} 次):"
+            for replica in replica_stats['replicas']:
+                latency = f"{replica['recent_ping_ms']:.1f} ms" if replica['recent_ping_ms'] is not None else "-"
+                status_text += (
+                    f"\n   - {replica['server']}: {'可用' if replica['available'] else '不可用'}, "
+                    f"查询 {replica['queries']} 次, 失败 {replica['failures']} 次, 延迟 {latency}"
+                )
+
+        cache_stats = manager.get_cache_stats()
+        if cache_stats is not None:
+            status_text += (
+                f"\n📦 查询结果缓存: 命中 {cache_stats['hits']} 次, 未命中 {cache_stats['misses']} 次, "
+                f"{cache_stats['entries']} 条缓存 ({cache_stats['bytes'] / 1024:.1f} KB), "
+                f"淘汰 {cache_stats['evictions']} 条, 失效 {cache_stats['invalidations']} 条"
+            )
+
+        statement_stats = manager.get_statement_cache_stats()
+        if statement_stats is not None:
+            status_text += (
+                f"\n♻️ 语句缓存: {statement_stats['entries']} 种语句结构, 复用 {statement_stats['hits']} 次 / "
+                f"编译 {statement_stats['misses']} 次 (复用率 {statement_stats['reuse_ratio']:.0%})"
+            )
+            if manager.db_config.auto_parameterize:
+                status_text += (
+                    f", 自动参数化 {statement_stats['parameterized']} 条查询 "
+                    f"({statement_stats['lifted_literals']} 个字面量), 回退 {statement_stats['fallbacks']} 次"
+                )
+
+        catalog_stats = manager.get_catalog_stats()
+        if catalog_stats is not None:
+            status_text += (
+                f"\n🗂️ 表结构缓存: {catalog_stats['tables']} 张表, "
+                f"全量加载 {catalog_stats['full_loads']} 次, 增量刷新 {catalog_stats['incremental_refreshes']} 次"
+            )
+
         return [TextContent(type="text", text=status_text)]
 
     except Exception as e:
@@ -576,16 +1162,25 @@ async def handle_read_file(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle file reading."""
     file_path = arguments.get("file_path", "")
     encoding = arguments.get("encoding", "utf-8")
+    offset = int(arguments.get("offset", 0))
+    length = min(int(arguments.get("length", DEFAULT_READ_LENGTH)), READ_FILE_MAX_LENGTH)
+    start_line = arguments.get("start_line")
+    end_line = arguments.get("end_line")
 
     try:
-        content = fs_manager.read_file(file_path, encoding)
+        # Only the requested chunk is read and decoded, however large the file is
+        chunk = await fs_executor.run(fs_manager.read_file_range, file_path, offset, length,
+                                      start_line, end_line, encoding)
 
-        # Limit content display for very large files
-        if len(content) > 10000:
-            preview_content = content[:10000] + f"\n\n... (file truncated, showing first 10000 characters of {len(content)} total)"
-            response_text = f"File content from '{file_path}':\n\n{preview_content}"
-        else:
-            response_text = f"File content from '{file_path}':\n\n{content}"
+        location = f"bytes {chunk['offset']}-{chunk['end_offset']} of {chunk['file_size']}"
+        if chunk.get('end_line') is not None:
+            location = f"lines {chunk['start_line']}-{chunk['end_line']}, {location}"
+        response_text = f"File content from '{file_path}' ({location}):\n\n{chunk['content']}"
+
+        if chunk.get('next_line') is not None:
+            response_text += f"\n\n... more content available, continue with start_line={chunk['next_line']}"
+        elif chunk['next_offset'] is not None:
+            response_text += f"\n\n... more content available, continue with offset={chunk['next_offset']}"
 
         return [TextContent(type="text", text=response_text)]
 
@@ -595,6 +1190,40 @@ async def handle_read_file(arguments: Dict[str, Any]) -> List[TextContent]:
         return [TextContent(type="text", text=error_msg)]
 
 
+async def handle_tail_file(arguments: Dict[str, Any]) -> List[TextContent]:
+    """Handle reading the end of a file or following it with a cursor."""
+    file_path = arguments.get("file_path", "")
+    lines = int(arguments.get("lines", DEFAULT_TAIL_LINES))
+    cursor = arguments.get("cursor")
+    encoding = arguments.get("encoding", "utf-8")
+
+    try:
+        tail = await fs_executor.run(fs_manager.tail_file, file_path, lines, cursor, encoding, READ_FILE_MAX_LENGTH)
+
+        if tail['rotated']:
+            response_text = f"File '{file_path}' was replaced since the cursor, reading the new file from the start:\n\n"
+        elif tail['truncated']:
+            response_text = f"File '{file_path}' was truncated since the cursor, reading from the start:\n\n"
+        elif cursor and not tail['content']:
+            response_text = f"No new content in '{file_path}'.\n\n"
+        elif cursor:
+            response_text = f"New content in '{file_path}' (bytes {tail['offset']}-{tail['end_offset']}):\n\n"
+        else:
+            response_text = f"Last lines of '{file_path}' (bytes {tail['offset']}-{tail['end_offset']} of {tail['file_size']}):\n\n"
+        if tail['content']:
+            response_text += tail['content'] + "\n\n"
+        if tail['more']:
+            response_text += "... more content available, call again with the cursor\n"
+        response_text += f"cursor: {tail['cursor']}"
+
+        return [TextContent(type="text", text=response_text)]
+
+    except Exception as e:
+        error_msg = f"Failed to tail file: {str(e)}"
+        logger.error(error_msg)
+        return [TextContent(type="text", text=error_msg)]
+
+
 async def handle_write_file(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle file writing."""
     file_path = arguments.get("file_path", "")
@@ -614,7 +1243,7 @@ async def handle_write_file(arguments: Dict[str, Any]) -> List[TextContent]:
                 text=f"File '{file_path}' already exists. Please add 'confirm': true to overwrite."
             )]
 
-        fs_manager.write_file(file_path, content, encoding, create_dirs)
+        await fs_executor.run(fs_manager.write_file, file_path, content, encoding, create_dirs)
 
         response_text = f"File written successfully: '{file_path}' ({len(content)} characters)"
 
@@ -630,24 +1259,43 @@ async def handle_list_directory(arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle directory listing."""
     dir_path = arguments.get("dir_path", "")
     recursive = arguments.get("recursive", False)
+    max_depth = arguments.get("max_depth") if recursive else 1
+    max_entries = max(1, int(arguments.get("max_entries", LIST_DIRECTORY_PAGE_SIZE)))
+    include = arguments.get("include")
+    exclude = arguments.get("exclude")
+    cursor = arguments.get("cursor")
+
+    def render() -> Tuple[int, Optional[str], str]:
+        # Runs on a worker thread: entries are formatted as the walk produces them
+        out = io.StringIO()
+        count, last = 0, None
+        entries = fs_manager.iter_directory(dir_path, max_depth, include, exclude, cursor)
+        for item in entries:
+            if count == max_entries:
+                return count, last, out.getvalue()
+            item_type = {"directory": "DIR", "file": "FILE"}.get(item.get("type"), "?")
+            size = "" if item.get("type") == "directory" else item.get("size", "")
+            out.write(f"{item_type} | {item['relative_path']} | {size} | {item.get('modified', '')}\n")
+            count += 1
+            last = item['relative_path']
+        return count, None, out.getvalue()
 
     try:
-        items = fs_manager.list_directory(dir_path, recursive)
+        count, next_cursor, listing = await fs_executor.run(render)
 
-        if not items:
-            response_text = f"Directory '{dir_path}' is empty or no accessible items found."
+        if not count:
+            if cursor:
+                response_text = f"No more entries in '{dir_path}'."
+            else:
+                response_text = f"Directory '{dir_path}' is empty or no accessible items found."
         else:
-            response_text = f"Directory listing for '{dir_path}' ({len(items)} items):\n\n"
+            continued = ", continued" if cursor else ""
+            response_text = f"Directory listing for '{dir_path}' ({count} items{continued}):\n\n"
             response_text += "Type | Name | Size | Modified\n"
             response_text += "-" * 50 + "\n"
-
-            for item in items:
-                item_type = "DIR" if item.get("is_directory") else "FILE"
-                name = item.get("name", "")
-                size = item.get("size", 0) if not item.get("is_directory") else ""
-                modified = item.get("modified", "")
-
-                response_text += f"{item_type} | {name} | {size} | {modified}\n"
+            response_text += listing
+            if next_cursor is not None:
+                response_text += f"\n... more entries available, continue with cursor: {next_cursor}"
 
         return [TextContent(type="text", text=response_text)]
 
@@ -661,29 +1309,30 @@ async def main():
     """Main entry point for the MCP server."""
     logger.info("Starting MCP SQL Server Filesystem server...")
 
-    # Test database connection on startup (non-blocking)
-    try:
-        if db_manager.test_connection():
-            logger.info("Database connection test successful")
-        else:
-            logger.warning("Database connection test failed - database tools will be unavailable")
-    except Exception as e:
-        logger.warning(f"Database connection test error: {e} - database tools will be unavailable")
+    # Connect to the database in the background so the MCP handshake is
+    # answered immediately; database tools wait for it on first use.
+    db_manager.start_background_init()
 
     # Run the server
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="mcp-sqlserver-filesystem",
-                server_version=__version__,
-                capabilities=ServerCapabilities(
-                    tools=ToolsCapability(list_changed=True),
-                    experimental={}
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="mcp-sqlserver-filesystem",
+                    server_version=__version__,
+                    capabilities=ServerCapabilities(
+                        tools=ToolsCapability(list_changed=True),
+                        experimental={}
+                    )
                 )
             )
-        )
+    finally:
+        await db_registry.close_async()
+        db_registry.close_all()
+        db_executor.shutdown()
+        fs_executor.shutdown()
 
 
 if __name__ == "__main__":
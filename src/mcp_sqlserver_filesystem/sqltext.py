@@ -0,0 +1,381 @@
+"""T-SQL lexing and statement rewriting helpers for MCP server."""
+
+import re
+from decimal import Decimal
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    |(?P<line_comment>--[^\n]*)
+    |(?P<block_comment>/\*)
+    |(?P<string>[Nn]?'(?:[^']|'')*'?)
+    |(?P<quoted>\[(?:[^\]]|\]\])*\]?|"(?:[^"]|"")*"?)
+    |(?P<number>0[xX][0-9A-Fa-f]*|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<variable>@@?[\w#$@]*)
+    |(?P<word>[^\W\d][\w#$@]*|\#[\w#$@]*)
+    |(?P<op><>|!=|>=|<=|!<|!>|[-+*/%=<>&|^~])
+    |(?P<punct>[(),;.])
+    |(?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+_BLOCK_COMMENT_EDGE = re.compile(r"/\*|\*/")
+
+
+class Token(NamedTuple):
+    """A lexical token: ``kind`` is one of word, string, quoted, number,
+    variable, comment, op, punct or other."""
+
+    kind: str
+    value: str
+    start: int
+    end: int
+
+    @property
+    def upper(self) -> str:
+        return self.value.upper()
+
+
+def block_comment_end(sql: str, start: int) -> int:
+    """End offset of a (possibly nested) block comment opened at ``start``."""
+    depth = 0
+    for m in _BLOCK_COMMENT_EDGE.finditer(sql, start):
+        depth += 1 if m.group() == '/*' else -1
+        if depth == 0:
+            return m.end()
+    return len(sql)
+
+
+def tokenize(sql: str, comments: bool = False) -> List[Token]:
+    """Split T-SQL into tokens in one pass.
+
+    String literals, bracketed/quoted identifiers and (nested) comments are
+    single tokens, so keywords inside them are never mistaken for code.
+    Whitespace is dropped, and comments too unless ``comments`` is set.
+    """
+    tokens: List[Token] = []
+    pos = 0
+    length = len(sql)
+    match = _TOKEN_PATTERN.match
+    while pos < length:
+        m = match(sql, pos)
+        kind = m.lastgroup
+        end = m.end()
+        if kind == 'ws':
+            pos = end
+            continue
+        if kind == 'block_comment':
+            end = block_comment_end(sql, pos)
+            kind = 'comment'
+        elif kind == 'line_comment':
+            kind = 'comment'
+        if kind != 'comment' or comments:
+            tokens.append(Token(kind, sql[pos:end], pos, end))
+        pos = end
+    return tokens
+
+
+def split_qualified_name(name: str) -> List[str]:
+    """Split a possibly qualified object name into its parts, unquoted.
+
+    ``[dbo].[order.items]`` gives ``['dbo', 'order.items']``: only dots
+    outside ``[...]``/``"..."`` separate parts. Text between the tokens of
+    a part (spaces, ``*``/``?`` wildcards) is kept as written.
+    """
+    parts: List[str] = []
+    current: List[str] = []
+    previous_end: Optional[int] = None
+    for token in tokenize(name):
+        if token.kind == 'punct' and token.value == '.':
+            parts.append(''.join(current).strip())
+            current, previous_end = [], None
+            continue
+        if previous_end is not None:
+            current.append(name[previous_end:token.start])
+        if token.kind == 'quoted':
+            close = ']' if token.value[0] == '[' else '"'
+            inner = token.value[1:-1] if len(token.value) > 1 and token.value.endswith(close) else token.value[1:]
+            current.append(inner.replace(close * 2, close))
+        else:
+            current.append(token.value)
+        previous_end = token.end
+    parts.append(''.join(current).strip())
+    return parts
+
+
+def paren_depths(tokens: List[Token]) -> List[int]:
+    """Parenthesis nesting depth of every token (an opening paren has the outer depth)."""
+    depths = []
+    depth = 0
+    for token in tokens:
+        if token.value == ')':
+            depth = max(0, depth - 1)
+        depths.append(depth)
+        if token.value == '(':
+            depth += 1
+    return depths
+
+
+def _find_top_level(tokens: List[Token], depths: List[int], words: Tuple[str, ...], start: int) -> Optional[int]:
+    for i in range(start, len(tokens)):
+        if depths[i] == 0 and tokens[i].kind == 'word' and tokens[i].upper in words:
+            return i
+    return None
+
+
+# OUTPUT column lists per DML operation; UPDATE returns the old row followed by the new one
+OUTPUT_COLUMNS = {
+    'INSERT': "inserted.*",
+    'UPDATE': "deleted.*, inserted.*",
+    'DELETE': "deleted.*",
+}
+
+
+def add_output_clause(statement: str) -> Optional[Tuple[str, str]]:
+    """Rewrite a single INSERT/UPDATE/DELETE so it returns the affected rows.
+
+    Returns ``(rewritten_sql, operation)`` with an ``OUTPUT`` clause added at
+    the position T-SQL requires, or None when the statement cannot be
+    rewritten safely (multiple statements, existing OUTPUT, INSERT ... EXEC,
+    anything that is not a plain DML statement).
+    """
+    tokens = tokenize(statement)
+    while tokens and tokens[-1].value == ';':
+        tokens.pop()
+    if not tokens:
+        return None
+    depths = paren_depths(tokens)
+
+    if any(t.value == ';' and d == 0 for t, d in zip(tokens, depths)):
+        return None
+    if _find_top_level(tokens, depths, ('OUTPUT',), 0) is not None:
+        return None
+
+    main = 0
+    if tokens[0].upper == 'WITH':
+        # Skip common table expressions to the statement they belong to
+        main = _find_top_level(tokens, depths, ('INSERT', 'UPDATE', 'DELETE', 'SELECT', 'MERGE'), 1)
+        if main is None:
+            return None
+    operation = tokens[main].upper
+    if tokens[main].kind != 'word' or operation not in OUTPUT_COLUMNS:
+        return None
+
+    if operation == 'INSERT':
+        # INSERT [INTO] target [(columns)] OUTPUT ... VALUES | SELECT | DEFAULT VALUES
+        at = _find_top_level(tokens, depths, ('VALUES', 'SELECT', 'DEFAULT', 'EXEC', 'EXECUTE'), main + 1)
+        if at is None or tokens[at].upper in ('EXEC', 'EXECUTE'):
+            return None
+    else:
+        if operation == 'UPDATE':
+            # UPDATE target SET ... OUTPUT ... [FROM ...] [WHERE ...] [OPTION (...)]
+            set_at = _find_top_level(tokens, depths, ('SET',), main + 1)
+            if set_at is None:
+                return None
+            search_from = set_at + 1
+        else:
+            # DELETE [TOP (n) [PERCENT]] [FROM] target OUTPUT ... [FROM ...] [WHERE ...]
+            i = main + 1
+            if i < len(tokens) and tokens[i].upper == 'TOP':
+                i += 1
+                if i < len(tokens) and tokens[i].value == '(':
+                    # Skip to the matching closing parenthesis
+                    i += 1
+                    while i < len(tokens) and depths[i] > 0:
+                        i += 1
+                i += 1
+                if i < len(tokens) and tokens[i].upper == 'PERCENT':
+                    i += 1
+            if i < len(tokens) and tokens[i].upper == 'FROM':
+                i += 1
+            search_from = i + 1
+        at = _find_top_level(tokens, depths, ('FROM', 'WHERE', 'OPTION'), search_from)
+
+    clause = f"OUTPUT {OUTPUT_COLUMNS[operation]}"
+    if at is None:
+        position = tokens[-1].end
+        rewritten = f"{statement[:position]} {clause}{statement[position:]}"
+    else:
+        position = tokens[at].start
+        rewritten = f"{statement[:position]}{clause} {statement[position:]}"
+    return rewritten, operation
+
+
+_COMPARISON_OPERATORS = frozenset(('=', '<>', '!=', '<', '>', '<=', '>=', '!<', '!>'))
+# Longest varchar literal that can be bound as CAST(? AS VARCHAR(8000))
+_MAX_VARCHAR_LITERAL = 8000
+_BIGINT_MIN, _BIGINT_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _literal_at(tokens: List[Token], i: int) -> Optional[Tuple[int, Any, bool]]:
+    """Parse a literal (with optional sign) starting at ``tokens[i]``.
+
+    Returns ``(next_index, value, is_varchar)`` or None when the token is not
+    a literal that can be bound without changing the query's meaning.
+    """
+    sign = 1
+    if i < len(tokens) and tokens[i].value in ('-', '+') and i + 1 < len(tokens) and tokens[i + 1].kind == 'number':
+        sign = -1 if tokens[i].value == '-' else 1
+        i += 1
+    if i >= len(tokens):
+        return None
+    token = tokens[i]
+    if token.kind == 'number':
+        text = token.value
+        if text[:2].lower() == '0x':
+            return None
+        if 'e' in text or 'E' in text:
+            return i + 1, sign * float(text), False
+        if '.' in text:
+            return i + 1, sign * Decimal(text), False
+        value = sign * int(text)
+        if not _BIGINT_MIN <= value <= _BIGINT_MAX:
+            return None
+        return i + 1, value, False
+    if token.kind == 'string' and sign == 1:
+        text = token.value
+        national = text[0] in 'Nn'
+        body = text[1:] if national else text
+        if len(body) < 2 or not body.endswith("'"):
+            return None
+        value = body[1:-1].replace("''", "'")
+        if not national and len(value) > _MAX_VARCHAR_LITERAL:
+            return None
+        return i + 1, value, not national
+    return None
+
+
+def parameterize_literals(sql: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Lift literals in predicates of a read query into bound parameters.
+
+    Literals compared with ``=``/``<>``/``<``..., matched with ``LIKE``,
+    listed in ``IN (...)`` or bounding ``BETWEEN`` become ``:p0``, ``:p1``...
+    so that queries differing only in those values share one statement
+    shape (and one server plan). Plain string literals are bound as
+    ``CAST(:pN AS VARCHAR(8000))`` to keep varchar comparison semantics
+    and index seeks. Returns ``(shape_sql, parameters)``, or None when the
+    query is not a single SELECT or has nothing to lift.
+    """
+    tokens = tokenize(sql)
+    if not tokens or tokens[0].upper not in ('SELECT', 'WITH'):
+        return None
+    while tokens and tokens[-1].value == ';':
+        tokens.pop()
+    if any(t.value == ';' for t in tokens):
+        return None
+
+    lifted: List[Tuple[int, int, Any, bool]] = []
+
+    def lift(i: int) -> Optional[int]:
+        literal = _literal_at(tokens, i)
+        if literal is None:
+            return None
+        end, value, is_varchar = literal
+        lifted.append((tokens[i].start, tokens[end - 1].end, value, is_varchar))
+        return end
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        upper = token.upper
+        if (token.kind == 'op' and token.value in _COMPARISON_OPERATORS) or (token.kind == 'word' and upper == 'LIKE'):
+            i = lift(i + 1) or i + 1
+        elif token.kind == 'word' and upper == 'BETWEEN':
+            end = lift(i + 1)
+            if end is not None and end < len(tokens) and tokens[end].upper == 'AND':
+                i = lift(end + 1) or end + 1
+            else:
+                i = end or i + 1
+        elif token.kind == 'word' and upper == 'IN' and i + 1 < len(tokens) and tokens[i + 1].value == '(':
+            # Only lists made entirely of literals: IN (1, 2, 3)
+            items = []
+            j = i + 2
+            while j < len(tokens):
+                literal = _literal_at(tokens, j)
+                if literal is None:
+                    break
+                items.append((j, literal))
+                j = literal[0]
+                if j < len(tokens) and tokens[j].value == ',':
+                    j += 1
+                    continue
+                break
+            if items and j < len(tokens) and tokens[j].value == ')':
+                for start, (end, value, is_varchar) in items:
+                    lifted.append((tokens[start].start, tokens[end - 1].end, value, is_varchar))
+                i = j + 1
+            else:
+                i += 1
+        else:
+            i += 1
+
+    if not lifted:
+        return None
+
+    parts = []
+    parameters: Dict[str, Any] = {}
+    position = 0
+    for n, (start, end, value, is_varchar) in enumerate(lifted):
+        name = f"p{n}"
+        parameters[name] = value
+        placeholder = f"CAST(:{name} AS VARCHAR(8000))" if is_varchar else f":{name}"
+        # A bind name directly after a word character would not be recognized
+        if start > 0 and (sql[start - 1].isalnum() or sql[start - 1] in '_:'):
+            placeholder = " " + placeholder
+        parts.append(sql[position:start])
+        parts.append(placeholder)
+        position = end
+    parts.append(sql[position:])
+    return "".join(parts), parameters
+
+
+def is_read_only_select(sql: str) -> bool:
+    """Whether ``sql`` is a single SELECT that a read-only replica can run.
+
+    Uses ``single_query_tokens``, so ``SELECT ... INTO`` and batches, with
+    or without semicolons (``SELECT 1 UPDATE t SET x = 1``), stay on the
+    primary instead of failing on a secondary.
+    """
+    return single_query_tokens(sql) is not None
+
+
+# Keywords that start another statement (T-SQL batches need no semicolon between
+# statements) or make a SELECT write; none of them can appear inside a plain query.
+# FETCH is left out (OFFSET ... FETCH NEXT), END too (CASE ... END).
+_NON_QUERY_KEYWORDS = frozenset((
+    'INTO', 'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'TRUNCATE', 'EXEC', 'EXECUTE',
+    'CREATE', 'ALTER', 'DROP', 'GRANT', 'REVOKE', 'DENY', 'DECLARE', 'SET', 'USE',
+    'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVE', 'WAITFOR', 'IF', 'WHILE', 'GOTO', 'BREAK',
+    'CONTINUE', 'RETURN', 'PRINT', 'RAISERROR', 'THROW', 'KILL', 'BACKUP', 'RESTORE',
+    'DBCC', 'CHECKPOINT', 'RECONFIGURE', 'SHUTDOWN', 'OPEN', 'CLOSE', 'DEALLOCATE',
+    'BULK', 'READTEXT', 'WRITETEXT', 'UPDATETEXT', 'SETUSER', 'REVERT', 'ENABLE', 'DISABLE',
+))
+
+_SET_OPERATORS = frozenset(('UNION', 'ALL', 'EXCEPT', 'INTERSECT'))
+
+
+def single_query_tokens(sql: str) -> Optional[List[Token]]:
+    """Tokens of ``sql`` (trailing semicolons dropped) if it is exactly one
+    SELECT statement, optionally preceded by common table expressions.
+
+    Returns None for anything else: batches with or without ``;`` between
+    the statements (``SELECT 1 DROP TABLE t``), ``SELECT ... INTO`` and CTEs
+    feeding DML. Keywords in strings, comments and quoted names are ignored.
+    """
+    tokens = tokenize(sql)
+    while tokens and tokens[-1].value == ';':
+        tokens.pop()
+    if not tokens or tokens[0].upper not in ('SELECT', 'WITH'):
+        return None
+    selects = 0
+    for i, (token, depth) in enumerate(zip(tokens, paren_depths(tokens))):
+        if token.value == ';' or (token.kind == 'word' and token.upper in _NON_QUERY_KEYWORDS):
+            return None
+        # A second top-level SELECT not joined by a set operator is a second statement
+        if (depth == 0 and token.kind == 'word' and token.upper == 'SELECT'
+                and (i == 0 or tokens[i - 1].upper not in _SET_OPERATORS)):
+            selects += 1
+            if selects > 1:
+                return None
+    return tokens
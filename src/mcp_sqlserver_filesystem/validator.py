@@ -0,0 +1,153 @@
+"""Precompiled SQL security validator for MCP server."""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from .sqltext import block_comment_end
+
+# Query texts up to this length are memoized verbatim, longer ones by digest
+_MAX_VERBATIM_KEY_LENGTH = 1024
+
+# Stacked write statement after a semicolon, and string-vs-string comparisons
+_STACKED_STATEMENT = r"\s*+(?:DROP|DELETE|UPDATE|INSERT|CREATE|ALTER|EXEC|EXECUTE)\b"
+_TAUTOLOGY_TAIL = r"\s*+(?:OR|AND|=)\s*+N?'"
+_STRING_BODY = r"'[^']*+(?:''[^']*+)*+"
+_INJECTION_DESCRIPTIONS = {
+    'stacked': "stacked statement after ';'",
+    'union': "UNION SELECT",
+    'tautology': "string comparison tautology",
+    'empty_comment': "trailing '--' comment",
+    'inline_comment': "inline /* */ comment",
+}
+
+
+class SQLValidator:
+    """Single-pass SQL security check compiled once from SecurityConfig.
+
+    Blocked keywords and the injection patterns are combined into one regular
+    expression that walks the query once. String literals, quoted
+    identifiers, variables and comments are consumed as whole units, so
+    keywords inside them are skipped instead of reported. Verdicts are
+    memoized per query text.
+    """
+
+    def __init__(self, blocked_keywords: Iterable[str] = (), max_query_length: int = 100000,
+                 cache_size: int = 1024):
+        self.max_query_length = max_query_length
+        self.cache_size = cache_size
+        self.blocked_keywords = sorted({k.strip().upper() for k in blocked_keywords if k.strip()})
+        self._pattern = self._compile(self.blocked_keywords)
+        self._verdicts: "OrderedDict[Hashable, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, security) -> "SQLValidator":
+        return cls(security.blocked_sql_keywords, security.max_query_length)
+
+    @staticmethod
+    def _compile(keywords) -> Optional["re.Pattern[str]"]:
+        """Build one anchored pattern that skips harmless text and stops at the first finding.
+
+        The possessive prefix consumes whitespace, ordinary words, operators,
+        string literals, quoted identifiers, variables and non-empty line
+        comments without backtracking; each of its alternatives is the exact
+        complement of one finding, so a match ends at a finding or at the end
+        of the text.
+        """
+        # Without blocked keywords only the length limit applies (full access mode)
+        if not keywords:
+            return None
+        # Longest first so that e.g. EXECUTE wins over EXEC
+        keyword_pattern = "|".join(
+            r"\s+".join(re.escape(word) for word in keyword.split())
+            for keyword in sorted(keywords, key=len, reverse=True)
+        )
+        # Words that cannot start a keyword skip the keyword lookahead entirely
+        initials = re.escape("".join(sorted({k[0] for k in keywords} | {'U'})))
+        skip = "|".join([
+            r"\s++",
+            rf"[^\W{initials}][\w$#@]*+",
+            r"[^\w\s'\"\[@#\-/;]++",
+            rf"(?!(?:{keyword_pattern})(?![\w$])|UNION\s+SELECT\b)\w[\w$#@]*+",
+            rf"{_STRING_BODY}(?:'(?!{_TAUTOLOGY_TAIL})|\Z)",
+            r"\[[^\]]*+(?:\]\][^\]]*+)*+(?:\]|\Z)",
+            r'"[^"]*+(?:""[^"]*+)*+(?:"|\Z)',
+            r"[@#][\w#$@]*+",
+            r"--[^\S\n]*+\S[^\n]*+",
+            r"-(?!-)",
+            r"/(?!\*)",
+            rf";(?!{_STACKED_STATEMENT})",
+        ])
+        return re.compile(
+            rf"(?:{skip})*+"
+            rf"(?:(?P<tautology>{_STRING_BODY}')"
+            r"|(?P<empty_comment>--[^\S\n]*+(?=\n|\Z))"
+            r"|(?P<block_comment>/\*)"
+            rf"|(?P<stacked>;{_STACKED_STATEMENT})"
+            r"|(?P<union>UNION\s+SELECT\b)"
+            rf"|(?P<keyword>{keyword_pattern})"
+            r"|\Z)",
+            re.IGNORECASE,
+        )
+
+    def _memo_key(self, query: str) -> Hashable:
+        if len(query) <= _MAX_VERBATIM_KEY_LENGTH:
+            return query
+        return hashlib.blake2b(query.encode('utf-8', 'surrogatepass'), digest_size=20).digest()
+
+    def check(self, query: str) -> Optional[str]:
+        """Return a description of the first violation, or None if the query is allowed."""
+        if len(query) > self.max_query_length:
+            return f"Query exceeds maximum length of {self.max_query_length}"
+        if self._pattern is None:
+            return None
+
+        key = self._memo_key(query)
+        with self._lock:
+            if key in self._verdicts:
+                self._verdicts.move_to_end(key)
+                self.hits += 1
+                return self._verdicts[key]
+            self.misses += 1
+
+        verdict = self._scan(query)
+
+        with self._lock:
+            self._verdicts[key] = verdict
+            if len(self._verdicts) > self.cache_size:
+                self._verdicts.popitem(last=False)
+        return verdict
+
+    def _scan(self, query: str) -> Optional[str]:
+        match = self._pattern.match
+        pos = 0
+        while True:
+            m = match(query, pos)
+            kind = m.lastgroup
+            if kind is None:
+                return None
+            if kind == 'keyword':
+                keyword = " ".join(m.group(kind).upper().split())
+                return f"Blocked SQL keyword detected: {keyword}"
+            if kind == 'block_comment':
+                # Comments spanning lines are allowed; nesting is resolved here
+                start = m.start(kind)
+                end = block_comment_end(query, start)
+                if '\n' not in query[start:end] and query.endswith('*/', 0, end):
+                    return f"Potential SQL injection detected: {_INJECTION_DESCRIPTIONS['inline_comment']}"
+                pos = end
+                continue
+            return f"Potential SQL injection detected: {_INJECTION_DESCRIPTIONS[kind]}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._verdicts),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
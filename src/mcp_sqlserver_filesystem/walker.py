@@ -0,0 +1,203 @@
+"""Directory tree walker with parallel directory listing for MCP server."""
+
+import fnmatch
+import logging
+import os
+import stat
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Directories listed ahead of the walk per worker thread
+_PREFETCH_PER_WORKER = 4
+
+
+def matches_any(name: str, relative: str, patterns: List[str]) -> bool:
+    """Whether a directory entry matches one of the glob patterns.
+
+    Patterns containing ``/`` match the relative path, others the name.
+    """
+    return any(fnmatch.fnmatch(relative if '/' in pattern else name, pattern) for pattern in patterns)
+
+
+def is_junction(entry: os.DirEntry) -> bool:
+    """Whether an entry is an NTFS junction (mount point), which is not a symlink."""
+    if hasattr(entry, 'is_junction'):
+        return entry.is_junction()
+    if os.name != 'nt':
+        return False
+    try:
+        return entry.stat(follow_symlinks=False).st_reparse_tag == stat.IO_REPARSE_TAG_MOUNT_POINT
+    except OSError:
+        return False
+
+
+def is_reparse_point(entry: os.DirEntry) -> bool:
+    """Whether an entry is a symlink or another kind of Windows reparse point."""
+    if entry.is_symlink():
+        return True
+    if os.name != 'nt':
+        return False
+    try:
+        return bool(entry.stat(follow_symlinks=False).st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+    except OSError:
+        return False
+
+
+def _list_directory(path: str, stat_entries: bool = False) -> List[os.DirEntry]:
+    """Entries of one directory sorted by name ([] if it cannot be read).
+
+    With ``stat_entries`` each entry's lstat is fetched here, where it is
+    cached on the DirEntry, so the caller's later stat costs nothing.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError as e:
+        logger.warning(f"Skipping unreadable directory {path}: {e}")
+        return []
+    if stat_entries:
+        for entry in entries:
+            try:
+                entry.stat(follow_symlinks=False)
+            except OSError:
+                pass
+    return entries
+
+
+class _Frame:
+    """One open directory of the walk."""
+
+    __slots__ = ('entries', 'index', 'prefix', 'depth', 'on_cursor', 'scheduled')
+
+    def __init__(self, entries: List[os.DirEntry], prefix: str, depth: int, on_cursor: bool):
+        self.entries = entries
+        self.index = 0
+        self.prefix = prefix
+        self.depth = depth
+        self.on_cursor = on_cursor
+        # Entries before this index have been considered for prefetching
+        self.scheduled = 0
+
+
+class DirectoryWalker:
+    """Walks a tree depth-first in name order with ``os.scandir``.
+
+    On network shares listing a directory is dominated by round-trip
+    latency, so with ``workers`` > 1 the directories the walk is about to
+    enter are listed (and their entries stat'ed) ahead of time on a bounded
+    thread pool, at most ``workers * 4`` at once. Results are consumed in
+    walk order, so the output is the same as a sequential walk.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ThreadPoolExecutor]:
+        if self.workers <= 1:
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fs-walk")
+            return self._pool
+
+    def walk(self, root: str, max_depth: Optional[int] = None, include: Optional[List[str]] = None,
+             exclude: Optional[List[str]] = None, cursor: Optional[List[str]] = None,
+             skip: Optional[Callable[[os.DirEntry], bool]] = None) -> Iterator[Tuple[os.DirEntry, str]]:
+        """Yield ``(entry, relative_path)`` for the entries under ``root``.
+
+        ``max_depth``: levels to walk (1 = direct children, None = all).
+        ``include`` globs select the entries yielded; ``exclude`` globs and
+        ``skip`` drop entries along with everything below them. ``cursor``
+        is the split relative path of the last entry already seen; the walk
+        resumes right after it. Symbolic links and junctions to directories
+        are not followed.
+        """
+        include = include or []
+        exclude = exclude or []
+        cursor = cursor or []
+        pool = self._get_pool()
+        prefetched: Dict[str, "Future[List[os.DirEntry]]"] = {}
+        limit = self.workers * _PREFETCH_PER_WORKER
+
+        def descend(entry: os.DirEntry, depth: int) -> bool:
+            return (entry.is_dir(follow_symlinks=False) and (max_depth is None or depth < max_depth)
+                    and not is_junction(entry))
+
+        def schedule(frame: _Frame) -> None:
+            # Start listing the next subdirectories of this frame, in walk order
+            entries = frame.entries
+            while frame.scheduled < len(entries) and len(prefetched) < limit:
+                entry = entries[frame.scheduled]
+                frame.scheduled += 1
+                if frame.on_cursor and entry.name < cursor[frame.depth - 1]:
+                    continue
+                if (descend(entry, frame.depth) and entry.path not in prefetched
+                        and not (exclude and matches_any(entry.name, frame.prefix + entry.name, exclude))):
+                    prefetched[entry.path] = pool.submit(_list_directory, entry.path, True)
+
+        def children_of(entry: os.DirEntry) -> List[os.DirEntry]:
+            future = prefetched.pop(entry.path, None)
+            if future is not None:
+                return future.result()
+            return _list_directory(entry.path, pool is not None)
+
+        stack = [_Frame(_list_directory(root, pool is not None), '', 1, bool(cursor))]
+        try:
+            while stack:
+                frame = stack[-1]
+                if frame.index >= len(frame.entries):
+                    stack.pop()
+                    continue
+                entry = frame.entries[frame.index]
+                frame.index += 1
+                depth = frame.depth
+                relative = frame.prefix + entry.name
+
+                resumed = False
+                if frame.on_cursor:
+                    target = cursor[depth - 1]
+                    if entry.name < target:
+                        continue
+                    if entry.name == target:
+                        # Yielded before the cursor; its children come after it only if it is the cursor
+                        resumed = True
+                    else:
+                        # Past the cursor at this level: the rest of this directory is new
+                        frame.on_cursor = False
+
+                if exclude and matches_any(entry.name, relative, exclude):
+                    continue
+                if skip is not None and skip(entry):
+                    continue
+
+                if not resumed and (not include or matches_any(entry.name, relative, include)):
+                    yield entry, relative
+
+                if descend(entry, depth):
+                    children = children_of(entry)
+                    if children:
+                        child = _Frame(children, relative + '/', depth + 1, resumed and len(cursor) > depth)
+                        stack.append(child)
+                        if pool is not None:
+                            schedule(child)
+                if pool is not None:
+                    # Keep the pool busy with the directories coming up next
+                    for open_frame in reversed(stack):
+                        if len(prefetched) >= limit:
+                            break
+                        schedule(open_frame)
+        finally:
+            # The caller may stop early (page full): drop listings nobody will read
+            for future in prefetched.values():
+                future.cancel()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None